@@ -1,7 +1,45 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from app.core.metrics import metrics
+from app.services.prompt_cache import prefix_monitor
 
 router = APIRouter()
 
 @router.get("/")
 async def root():
     return {"message": "Welcome to the API ✅"}
+
+@router.get("/ready")
+async def ready(request: Request):
+    """Readiness probe: 503 until the models are loaded in Ollama."""
+    warmer = getattr(request.app.state, "warmer", None)
+    status = warmer.status() if warmer else {"ready": False}
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@router.get("/metrics")
+async def get_metrics(request: Request):
+    snapshot = metrics.snapshot()
+    snapshot["prompt_cache"] = prefix_monitor.stats()
+    response_cache = getattr(request.app.state, "response_cache", None)
+    if response_cache is not None:
+        snapshot["response_cache"] = response_cache.stats()
+    tool_cache = getattr(request.app.state, "tool_cache", None)
+    if tool_cache is not None:
+        snapshot["tool_cache"] = tool_cache.stats()
+    model = getattr(request.app.state, "model", None)
+    if hasattr(model, "stats"):
+        snapshot["llm_backends"] = model.stats()
+    return snapshot
+
+@router.post("/intents/reload")
+async def reload_intents(request: Request):
+    """Re-embed the intent exemplar file without restarting the app."""
+    classifier = request.app.state.intent_classifier
+    await classifier.load()
+    return {"status": "OK", "exemplars": len(classifier.labels)}
+
+@router.post("/tools/cache/invalidate")
+async def invalidate_tool_cache(request: Request, tool: str | None = None):
+    """Drop cached tool results (all of them, or one tool's with ?tool=name)."""
+    dropped = request.app.state.tool_cache.invalidate([tool] if tool else None)
+    return {"status": "OK", "dropped": dropped}
@@ -61,16 +61,9 @@ async def webhook_process(request: Request, background_tasks: BackgroundTasks):
                                 f"(id: {message_id[-10:]}...): {incoming_text[:50]}..."
                             )
 
-                            agent = request.app.state.agent
-                            whatsapp_client = request.app.state.whatsapp_client
-                            chat_histories = request.app.state.chat_histories
-                            system_instruction = request.app.state.system_instruction
-
                             background_tasks.add_task(
                                 process_message_background,
-                                agent, whatsapp_client, chat_histories,
-                                system_instruction, sender_id, incoming_text,
-                                processing_ids, message_id
+                                request.app.state, sender_id, incoming_text, message_id
                             )
 
         return {"status": "OK"}
@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
 class Settings:
     # Meta 
     ACCESS_TOKEN: str = os.getenv('ACCESS_TOKEN')
@@ -16,6 +18,33 @@ class Settings:
     OLLAMA_MODEL: str = os.getenv('OLLAMA_MODEL')
     OLLAMA_URL: str = os.getenv('OLLAMA_URL')
     OLLAMA_EMBEDDING: str = os.getenv('OLLAMA_EMBEDDING')
+    OLLAMA_KEEP_ALIVE: str = os.getenv('OLLAMA_KEEP_ALIVE', '30m')
+    # Fixed context size: a different num_ctx per request makes Ollama reload the model and drop its prompt cache
+    OLLAMA_NUM_CTX: int | None = int(os.getenv('OLLAMA_NUM_CTX')) if os.getenv('OLLAMA_NUM_CTX') else None
+    MODEL_PING_INTERVAL: int = int(os.getenv('MODEL_PING_INTERVAL', 240))
+    # Concurrent generations sent to Ollama (match OLLAMA_NUM_PARALLEL on the server); the rest queue by priority
+    OLLAMA_MAX_IN_FLIGHT: int = int(os.getenv('OLLAMA_MAX_IN_FLIGHT', 2))
+    EMBEDDING_BATCH_WINDOW_MS: float = float(os.getenv('EMBEDDING_BATCH_WINDOW_MS', 5))
+    # Per-intent num_predict/temperature/stop/thinking; set OLLAMA_THINKING_CONTROL=false for models without a think switch
+    GENERATION_PROFILES_PATH: str = os.getenv('GENERATION_PROFILES_PATH', os.path.join(PROJECT_ROOT, 'data', 'json', 'generation_profiles.json'))
+    OLLAMA_THINKING_CONTROL: bool = os.getenv('OLLAMA_THINKING_CONTROL', 'true').lower() == 'true'
+
+    # LLM provider: ollama | openrouter | gemini | groq | router (failover/hedging over LLM_BACKENDS)
+    LLM_PROVIDER: str = os.getenv('LLM_PROVIDER', 'ollama')
+    LLM_BACKENDS: str = os.getenv('LLM_BACKENDS', 'ollama,groq')
+    LLM_TIMEOUT: float = float(os.getenv('LLM_TIMEOUT', 60))
+    LLM_HEDGE: bool = os.getenv('LLM_HEDGE', 'false').lower() == 'true'
+    LLM_HEDGE_MIN_DELAY: float = float(os.getenv('LLM_HEDGE_MIN_DELAY', 1.0))
+
+    # Small/large cascade: the small model picks tools and writes short replies (disabled when unset)
+    OLLAMA_SMALL_MODEL: str = os.getenv('OLLAMA_SMALL_MODEL')
+    CASCADE_MAX_SMALL_CHARS: int = int(os.getenv('CASCADE_MAX_SMALL_CHARS', 600))
+    CASCADE_COMPOSE_MIN_CHARS: int = int(os.getenv('CASCADE_COMPOSE_MIN_CHARS', 800))
+
+    # Vector store
+    VECTOR_BACKEND: str = os.getenv('VECTOR_BACKEND', 'chroma')
+    VECTOR_INDEX_DIR: str = os.getenv('VECTOR_INDEX_DIR', os.path.join(PROJECT_ROOT, 'vector_index'))
+    VECTOR_INDEX_DTYPE: str = os.getenv('VECTOR_INDEX_DTYPE', 'float16')
     
     # API key
     OPENROUTER_API_KEY: bool = os.getenv('OPENROUTER_API_KEY')
@@ -24,7 +53,51 @@ class Settings:
 
     # Database
     DATABASE_URL: bool = os.getenv('DATABASE_URL')
+    TABULAR_DATABASE_URL: str = os.getenv(
+        'TABULAR_DATABASE_URL', f"sqlite:///{os.path.join(PROJECT_ROOT, 'data', 'tabular.db')}"
+    )
     DEBUG_LOGGING: bool = os.getenv('DEBUG_LOGGING')
+
+    # Routing
+    INTENT_RULES_PATH: str = os.getenv('INTENT_RULES_PATH', os.path.join(PROJECT_ROOT, 'data', 'json', 'intent_rules.json'))
+    INTENT_EXEMPLARS_PATH: str = os.getenv('INTENT_EXEMPLARS_PATH', os.path.join(PROJECT_ROOT, 'data', 'json', 'intent_exemplars.json'))
+    # Extra words per spreadsheet table for the listing fast path (table names from the catalog always match)
+    LISTING_ALIASES_PATH: str = os.getenv('LISTING_ALIASES_PATH', os.path.join(PROJECT_ROOT, 'data', 'json', 'listing_aliases.json'))
+    INTENT_CONFIDENCE_THRESHOLD: float = float(os.getenv('INTENT_CONFIDENCE_THRESHOLD', 0.75))
+    INTENT_CONFIDENCE_MARGIN: float = float(os.getenv('INTENT_CONFIDENCE_MARGIN', 0.03))
+
+    # Response cache
+    RESPONSE_CACHE_ENABLED: bool = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_TTL: int = int(os.getenv('RESPONSE_CACHE_TTL', 3600))
+    RESPONSE_CACHE_MAX_SIZE: int = int(os.getenv('RESPONSE_CACHE_MAX_SIZE', 500))
+    RESPONSE_CACHE_SIMILARITY: float = float(os.getenv('RESPONSE_CACHE_SIMILARITY', 0.95))
+    KB_PATH: str = os.getenv('KB_PATH', os.path.join(PROJECT_ROOT, 'data', 'json', 'data.json'))
+    LEXICAL_INDEX_PATH: str = os.getenv('LEXICAL_INDEX_PATH', os.path.join(PROJECT_ROOT, 'chroma_db', 'lexical_index.json'))
+
+    # Answer pipeline per classified intent: agent | direct | retrieval_first
+    ANSWER_PIPELINE_MODES: str = os.getenv('ANSWER_PIPELINE_MODES', 'qa_policy:direct,semantic:retrieval_first')
+
+    # Tools: default timeout and per-tool overrides ("tool:seconds,...")
+    TOOL_TIMEOUT: float = float(os.getenv('TOOL_TIMEOUT', 20))
+    TOOL_TIMEOUTS: str = os.getenv('TOOL_TIMEOUTS', 'create_calendar_event:30,send_email:30')
+    # get_qa_data matches below this score also run semantic search in the same tool call
+    QA_CONFIDENT_SCORE: float = float(os.getenv('QA_CONFIDENT_SCORE', 0.75))
+    TOOL_CACHE_ENABLED: bool = os.getenv('TOOL_CACHE_ENABLED', 'true').lower() == 'true'
+    TOOL_CACHE_MAX_SIZE: int = int(os.getenv('TOOL_CACHE_MAX_SIZE', 1000))
+
+    # End-to-end deadline per message and per-stage caps ("stage:seconds,...")
+    MESSAGE_DEADLINE: float = float(os.getenv('MESSAGE_DEADLINE', 90))
+    STAGE_TIMEOUTS: str = os.getenv('STAGE_TIMEOUTS', 'warmup:60,fast_path:30,classify:5,pipeline:45,degraded:3')
+
+    # Agent conversation threads: none | memory | sqlite | postgres (CHECKPOINT_URL is the DSN or SQLite path)
+    CHECKPOINTER: str = os.getenv('CHECKPOINTER', 'sqlite')
+    CHECKPOINT_MAX_THREADS: int = int(os.getenv('CHECKPOINT_MAX_THREADS', 1000))
+    CHECKPOINT_URL: str = os.getenv('CHECKPOINT_URL', os.path.join(PROJECT_ROOT, 'data', 'checkpoints.sqlite'))
+    AGENT_HISTORY_MAX_TOKENS: int = int(os.getenv('AGENT_HISTORY_MAX_TOKENS', 6000))
+
+    # stdio: every MCP server is a subprocess; inprocess: MCP_INPROCESS_SERVERS are imported and called directly
+    MCP_TRANSPORT: str = os.getenv('MCP_TRANSPORT', 'stdio')
+    MCP_INPROCESS_SERVERS: str = os.getenv('MCP_INPROCESS_SERVERS', 'qa,vectordb,scheduler,tabular')
     PORT: int = int(os.getenv('PORT', 5000))
 
 settings = Settings()
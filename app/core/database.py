@@ -6,3 +6,9 @@ DATABASE_URL = settings.DATABASE_URL
 
 engine = create_engine(DATABASE_URL, echo=True, future=True)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def warm_pool():
+    """Open (and return to the pool) one connection so the first request does not pay for the connect."""
+    with engine.connect():
+        pass
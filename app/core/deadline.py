@@ -0,0 +1,39 @@
+import time
+import asyncio
+import inspect
+from app.core.metrics import metrics
+
+
+class StageTimeout(Exception):
+    def __init__(self, stage: str):
+        super().__init__(f"Stage '{stage}' ran out of time")
+        self.stage = stage
+
+
+class Deadline:
+    """
+    End-to-end time budget for one message. Each stage runs with the remaining budget (or its own
+    smaller limit); on expiry the stage's task is cancelled, which cancels its in-flight LLM and tool
+    calls, and the timeout is counted under `timeouts.<stage>`.
+    """
+
+    def __init__(self, seconds: float, stage_limits: dict[str, float] | None = None):
+        self.expires = time.monotonic() + seconds
+        self.stage_limits = stage_limits or {}
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    async def run(self, stage: str, awaitable, limit: float | None = None):
+        limit = limit or self.stage_limits.get(stage)
+        timeout = min(self.remaining(), limit) if limit else self.remaining()
+        if timeout <= 0:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            metrics.incr(f"timeouts.{stage}")
+            raise StageTimeout(stage)
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError:
+            metrics.incr(f"timeouts.{stage}")
+            raise StageTimeout(stage) from None
@@ -0,0 +1,102 @@
+import os
+import re
+import json
+import logging
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Higher priority wins when a message matches several intents ("daftar gambar" is also "gambar")
+DEFAULT_INTENT_RULES = {
+    "list_images": {"priority": 40, "keywords": ["daftar gambar", "list gambar", "gambar tersedia", "lihat gambar"]},
+    "image": {"priority": 30, "keywords": ["gambar", "image", "foto"]},
+    "list_documents": {"priority": 20, "keywords": ["daftar dokumen", "list dokumen", "dokumen tersedia"]},
+    "document": {"priority": 10, "keywords": ["pdf", "dokumen", "file", "unduh", "download"]},
+}
+# Indonesian clitics attached to a keyword still match it ("gambarnya", "filenya", "jadwalku")
+CLITIC_SUFFIXES = ("nya", "ku", "mu", "lah")
+
+
+class IntentRouter:
+    """
+    Keyword intent matcher. All keywords are compiled into one case-insensitive, word-boundary
+    regex so a message is scanned once, and "profile" no longer matches "file". A keyword may carry
+    a clitic suffix; equal priorities are settled by rule order (earlier rules win).
+    """
+
+    def __init__(self):
+        self._rules: dict[str, dict] = {}
+        self._keyword_intents: dict[str, str] = {}
+        self._pattern: re.Pattern | None = None
+
+    def register(self, intent: str, keywords: list[str], priority: int = 0):
+        self._rules[intent] = {"priority": priority, "keywords": list(keywords)}
+        self._pattern = None
+
+    def register_many(self, rules: dict[str, dict]):
+        for intent, rule in rules.items():
+            self.register(intent, rule.get("keywords", []), rule.get("priority", 0))
+
+    def compile(self):
+        self._keyword_intents = {}
+        for intent, rule in self._rules.items():
+            for keyword in rule["keywords"]:
+                key = " ".join(keyword.lower().split())
+                if key in self._keyword_intents and self._keyword_intents[key] != intent:
+                    logger.warning(f"⚠️ Keyword '{key}' moved from intent '{self._keyword_intents[key]}' to '{intent}'")
+                self._keyword_intents[key] = intent
+
+        # Longest keywords first so multi-word phrases win over their single words
+        alternatives = sorted(self._keyword_intents, key=len, reverse=True)
+        if alternatives:
+            body = "|".join(re.escape(k).replace(r"\ ", r"\s+") for k in alternatives)
+            suffixes = "|".join(CLITIC_SUFFIXES)
+            self._pattern = re.compile(rf"\b(?P<keyword>{body})(?:{suffixes})?\b", re.IGNORECASE)
+        else:
+            self._pattern = re.compile(r"(?!)")
+
+    def match_all(self, text: str) -> set[str]:
+        if self._pattern is None:
+            self.compile()
+        return {
+            self._keyword_intents[" ".join(m.group("keyword").lower().split())]
+            for m in self._pattern.finditer(text)
+        }
+
+    def route(self, text: str) -> str | None:
+        """Return the highest-priority intent whose keywords appear in the text, or None."""
+        matched = self.match_all(text)
+        candidates = [i for i in self._rules if i in matched]
+        # max() keeps the first of equal priorities, i.e. the rule registered first
+        intent = max(candidates, key=lambda i: self._rules[i]["priority"]) if candidates else None
+        metrics.incr(f"intent_router.{intent or 'none'}")
+        return intent
+
+
+def build_intent_router(rules_path: str | None = None) -> IntentRouter:
+    """
+    Default rules, overridden/extended by the JSON file at INTENT_RULES_PATH when present. A file
+    that cannot be read or parsed is logged and ignored, leaving the default rules.
+    """
+    rules_path = rules_path or settings.INTENT_RULES_PATH
+    if rules_path and os.path.exists(rules_path):
+        try:
+            with open(rules_path, "r", encoding="utf-8") as f:
+                custom_rules = json.load(f)
+            router = IntentRouter()
+            router.register_many(DEFAULT_INTENT_RULES)
+            router.register_many(custom_rules)
+            router.compile()
+            logger.info(f"Loaded intent rules from {rules_path}")
+            return router
+        except (OSError, ValueError, TypeError, AttributeError, KeyError) as e:
+            logger.error(f"❌ Invalid intent rules in {rules_path}, using the built-in rules: {e}")
+
+    router = IntentRouter()
+    router.register_many(DEFAULT_INTENT_RULES)
+    router.compile()
+    return router
+
+
+intent_router = build_intent_router()
@@ -1,3 +1,5 @@
+import re
+
 GREETING_TEMPLATE = """
 [Indonesian]
 Halo! Saya Aiwa, asisten AI dari Warna Warni Media, siap membantu Anda ☺️
@@ -14,6 +16,14 @@ Maaf, saya tidak memiliki informasi mengenai hal tersebut.
 Sorry, I do not have information about that.
 """
 
+BUSY_TEMPLATE = """
+[Indonesian]
+Maaf, sistem sedang sibuk sehingga jawaban belum bisa diberikan. Silakan coba lagi beberapa saat lagi 🙏
+------
+[English]
+Sorry, the system is busy and could not answer in time. Please try again in a moment 🙏
+"""
+
 CREATE_MEETING_TEMPLATE = """
 [Indonesian]
 Berikut detail yang kami butuhkan untuk menjadwalkan meeting:
@@ -80,6 +90,14 @@ Silakan konfirmasi jika ada perubahan atau tambahan. Selamat meeting!
 Please confirm if there are any changes or additions. Have a great meeting!
 """
 
+MISSING_MEETING_FIELDS_TEMPLATE = """
+[Indonesian]
+⚠️ Data meeting belum lengkap atau tidak valid: {{fields_id}}
+------
+[English]
+⚠️ Some meeting details are missing or invalid: {{fields_en}}
+"""
+
 DELETE_REQUEST_ID_TEMPLATE = """
 [Indonesian]
 Untuk menghapus meeting, kami membutuhkan Meeting ID. 
@@ -111,3 +129,24 @@ Jika Anda membutuhkan bantuan lebih lanjut, jangan ragu untuk memberi tahu saya.
 
 If you need any further assistance, feel free to let me know.
 """
+
+# Names the model uses in <<NAME>> directives; the app expands them with render_template
+TEMPLATES = {
+    "GREETING": GREETING_TEMPLATE,
+    "FACTUAL_FALLBACK": FACTUAL_FALLBACK_TEMPLATE,
+    "BUSY": BUSY_TEMPLATE,
+    "CREATE_MEETING": CREATE_MEETING_TEMPLATE,
+    "CONFIRM_MEETING": CONFIRM_MEETING_TEMPLATE,
+    "POST_CREATION": POST_CREATION_TEMPLATE,
+    "DELETE_REQUEST_ID": DELETE_REQUEST_ID_TEMPLATE,
+    "POST_DELETION": POST_DELETION_TEMPLATE,
+}
+
+
+def render_template(template: str, **values) -> str:
+    """Fill `{{placeholder}}` fields of a message template; missing values render as '-'."""
+    def replace(match):
+        value = values.get(match.group(1))
+        return str(value) if value not in (None, "", []) else "-"
+
+    return re.sub(r"\{\{(\w+)\}\}", replace, template).strip()
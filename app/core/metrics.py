@@ -0,0 +1,48 @@
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+
+class Metrics:
+    """In-process counters and latency samples, exposed on GET /metrics."""
+
+    def __init__(self, max_samples: int = 1000):
+        self.counters: Counter = Counter()
+        self.timings: dict[str, deque] = {}
+        self.max_samples = max_samples
+
+    def incr(self, name: str, value: float = 1):
+        self.counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        self.timings.setdefault(name, deque(maxlen=self.max_samples)).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def percentile(self, name: str, q: float) -> float | None:
+        samples = sorted(self.timings.get(name, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> dict:
+        timings = {}
+        for name, samples in self.timings.items():
+            if not samples:
+                continue
+            timings[name] = {
+                "count": len(samples),
+                "avg_ms": round(sum(samples) / len(samples) * 1000, 1),
+                "p50_ms": round(self.percentile(name, 0.5) * 1000, 1),
+                "p95_ms": round(self.percentile(name, 0.95) * 1000, 1),
+            }
+        return {"counters": dict(self.counters), "timings": timings}
+
+
+metrics = Metrics()
@@ -1,44 +1,219 @@
+import os
+import time
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, AsyncExitStack
 from fastapi import FastAPI
+from langchain_core.messages import SystemMessage
 from pathlib import Path
-from app.services.llm_service import get_model
+from sqlalchemy.engine import make_url
+from app.services.llm_service import get_model, get_embeddings, get_cascade_model
+from app.services.embedding_service import CachedEmbeddings
+from app.services.intent_classifier import IntentClassifier
+from app.services.response_cache import ResponseCache
+from app.services.warmup_service import ModelWarmer
+from app.services.llm_scheduler import EmbeddingBatcher
 from app.services.mcp_service import init_mcp_client
 from app.services.agent_service import init_agent
+from app.services.checkpoint_service import open_checkpointer
+from app.services.tool_runtime import apply_timeouts, parse_timeouts
+from app.services.tool_policies import apply_retrieval_fallback
+from app.services.tool_cache import ToolResultCache, VERSION_TOOLS
 from app.services.whatsapp_service import WhatsAppClient
+from app.handlers.fast_path_handler import load_listing_tables
 from app.core.prompt import build_system_instruction
-from app.core.config import settings
+from app.core.config import settings, PROJECT_ROOT
+from app.core.database import warm_pool
+from app.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+def data_version_paths() -> dict[str, list[str]]:
+    """Data files behind each server's `*_data_version` tool, read by the app without calling the server."""
+    paths = {
+        "qa_data_version": [settings.KB_PATH],
+        "vectordb_data_version": [
+            settings.LEXICAL_INDEX_PATH,
+            os.path.join(PROJECT_ROOT, "chroma_db", "chroma.sqlite3"),
+            os.path.join(settings.VECTOR_INDEX_DIR, "CURRENT"),
+        ],
+    }
+    tabular_url = make_url(settings.TABULAR_DATABASE_URL)
+    if tabular_url.get_backend_name() == "sqlite" and tabular_url.database:
+        paths["tabular_data_version"] = [tabular_url.database]
+    return paths
+
+
+async def timed(phase: str, awaitable):
+    """Await one startup step, recording its duration as `startup.<phase>`."""
+    with metrics.timer(f"startup.{phase}"):
+        return await awaitable
+
+
+def build_model():
+    model = get_model(settings.LLM_PROVIDER)
+    if settings.OLLAMA_SMALL_MODEL:
+        model = get_cascade_model(model)
+    return model
+
+
+async def load_intent_classifier(embedder: CachedEmbeddings) -> IntentClassifier:
+    intent_classifier = IntentClassifier(
+        embedder,
+        settings.INTENT_EXEMPLARS_PATH,
+        threshold=settings.INTENT_CONFIDENCE_THRESHOLD,
+        margin=settings.INTENT_CONFIDENCE_MARGIN,
+    )
+    try:
+        await intent_classifier.load()
+    except Exception as e:
+        logger.error(f"❌ Intent classifier unavailable, using keyword routing only: {e}")
+    return intent_classifier
+
+
+async def gather_or_cancel(*awaitables):
+    """Like `asyncio.gather`, but a failure cancels and awaits the other steps before raising."""
+    tasks = [asyncio.ensure_future(a) for a in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def load_embeddings():
+    """Build the embeddings (and import their provider) off the event loop, then the intent classifier on top."""
+    embeddings = await timed("embeddings", asyncio.to_thread(get_embeddings))
+    embedder = CachedEmbeddings(
+        EmbeddingBatcher(embeddings, window=settings.EMBEDDING_BATCH_WINDOW_MS / 1000)
+    )
+    intent_classifier = await timed("intent_classifier", load_intent_classifier(embedder))
+    return embeddings, embedder, intent_classifier
+
+
+async def open_mcp_client(resources: AsyncExitStack, base_dir: Path):
+    client, tools = await init_mcp_client(base_dir)
+
+    async def close_client():
+        logger.info("🛑 Shutting down MCP client...")
+        await client.close()
+
+    resources.push_async_callback(close_client)
+    return client, tools
+
+
+async def warm_db_pool():
+    try:
+        await asyncio.to_thread(warm_pool)
+    except Exception as e:
+        logger.error(f"❌ Database pool warm-up failed, connecting on first use: {e}")
+
+
+def log_startup_timings():
+    phases = {
+        name.removeprefix("startup."): samples[-1]
+        for name, samples in metrics.timings.items()
+        if name.startswith("startup.") and samples
+    }
+    summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in phases.items())
+    logger.info(f"⏱ Startup timings: {summary}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting up application...")
+    startup_start = time.perf_counter()
 
     BASE_DIR = Path(__file__).resolve().parent.parent
 
-    client, tool_names = await init_mcp_client(BASE_DIR)
-    logger.info(f"Tools loaded: {tool_names}")
+    # Everything opened during startup is registered here, so a failed step still closes the rest
+    async with AsyncExitStack() as resources:
+        # Independent steps run together: MCP server spawn, provider imports, checkpointer, DB pool and
+        # the embeddings + intent exemplars (which also load the embedding model in Ollama)
+        (client, mcp_tools), model, checkpointer, (embeddings, embedder, intent_classifier), _ = await gather_or_cancel(
+            timed("mcp", open_mcp_client(resources, BASE_DIR)),
+            timed("model", asyncio.to_thread(build_model)),
+            timed("checkpointer", resources.enter_async_context(
+                open_checkpointer(settings.CHECKPOINTER, settings.CHECKPOINT_URL, settings.CHECKPOINT_MAX_THREADS)
+            )),
+            load_embeddings(),
+            timed("db_pool", warm_db_pool()),
+        )
+        logger.info(f"Tools loaded: {', '.join(t.name for t in mcp_tools)}")
 
-    model = get_model("ollama")
+        # Sorted so the tool schemas (part of the prompt prefix) are identical across restarts
+        tools = sorted(mcp_tools, key=lambda t: t.name)
+        tools = apply_timeouts(tools, settings.TOOL_TIMEOUT, parse_timeouts(settings.TOOL_TIMEOUTS))
+        tool_cache = ToolResultCache(max_size=settings.TOOL_CACHE_MAX_SIZE, version_paths=data_version_paths())
+        if settings.TOOL_CACHE_ENABLED:
+            tools = tool_cache.apply(tools)
+            tool_cache.start()
+            resources.push_async_callback(tool_cache.stop)
+        else:
+            tools = [t for t in tools if t.name not in VERSION_TOOLS]
+        tools = apply_retrieval_fallback(tools, settings.QA_CONFIDENT_SCORE)
+        tool_names = ", ".join(t.name for t in tools)
+        listing_tables = await timed("listing_tables", load_listing_tables(
+            {t.name: t for t in tools}, settings.LISTING_ALIASES_PATH
+        ))
+        system_instruction = build_system_instruction(tool_names)
 
-    agent = init_agent(model, await client.get_tools())
+        agent = init_agent(
+            model,
+            tools,
+            checkpointer=checkpointer,
+            system_instruction=system_instruction,
+            max_history_tokens=settings.AGENT_HISTORY_MAX_TOKENS,
+        )
 
-    whatsapp_client = WhatsAppClient(
-        access_token=settings.ACCESS_TOKEN,
-        phone_number_id=settings.PHONE_NUMBER_ID,
-        meta_api_version=settings.META_API_VERSION,
-        debug_logging=settings.DEBUG_LOGGING,
-    )
+        # Load the models in Ollama while the rest starts; messages wait for `warmer.ready`
+        warmer = ModelWarmer(
+            model,
+            embeddings,
+            ping_interval=settings.MODEL_PING_INTERVAL,
+            prefix_messages=[SystemMessage(content=system_instruction)],
+            tools=tools,
+        )
+        warmer.start()
+        resources.push_async_callback(warmer.stop)
+
+        response_cache = None
+        if settings.RESPONSE_CACHE_ENABLED:
+            response_cache = ResponseCache(
+                embedder,
+                ttl=settings.RESPONSE_CACHE_TTL,
+                max_size=settings.RESPONSE_CACHE_MAX_SIZE,
+                similarity=settings.RESPONSE_CACHE_SIMILARITY,
+                # The same data files the tool cache versions: KB, document indexes and the tabular DB
+                watch_paths=[path for paths in data_version_paths().values() for path in paths],
+            )
+
+        whatsapp_client = WhatsAppClient(
+            access_token=settings.ACCESS_TOKEN,
+            phone_number_id=settings.PHONE_NUMBER_ID,
+            meta_api_version=settings.META_API_VERSION,
+            debug_logging=settings.DEBUG_LOGGING,
+        )
 
-    app.state.client = client
-    app.state.agent = agent
-    app.state.whatsapp_client = whatsapp_client
-    app.state.chat_histories = {}
-    app.state.system_instruction = build_system_instruction(tool_names)
-    app.state.processing_message_ids = set()
+        app.state.client = client
+        app.state.agent = agent
+        app.state.model = model
+        app.state.warmer = warmer
+        app.state.tools = {t.name: t for t in tools}
+        app.state.listing_tables = listing_tables
+        app.state.embedder = embedder
+        app.state.intent_classifier = intent_classifier
+        app.state.response_cache = response_cache
+        app.state.tool_cache = tool_cache
+        app.state.whatsapp_client = whatsapp_client
+        app.state.chat_histories = {}
+        app.state.pending_meetings = {}
+        app.state.system_instruction = system_instruction
+        app.state.processing_message_ids = set()
 
-    yield
+        metrics.observe("startup.total", time.perf_counter() - startup_start)
+        log_startup_timings()
 
-    logger.info("🛑 Shutting down MCP client...")
-    await client.close()
+        yield
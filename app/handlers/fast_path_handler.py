@@ -0,0 +1,168 @@
+import os
+import re
+import json
+import logging
+from langchain_core.tools import BaseTool
+from app.core.message import GREETING_TEMPLATE, DELETE_REQUEST_ID_TEMPLATE
+from app.handlers.scheduling_handler import render_deleted, CONFIRM_PATTERN
+from app.services.mcp_service import call_tool
+from app.services.whatsapp_service import WhatsAppClient
+
+logger = logging.getLogger(__name__)
+
+GREETING_WORDS = {
+    "hi", "hai", "halo", "hallo", "hello", "helo", "hey", "hei", "pagi", "siang", "sore", "malam",
+    "selamat", "good", "morning", "afternoon", "evening", "assalamualaikum", "permisi", "aiwa",
+    "kak", "min", "bot", "there", "p",
+}
+DELETE_COMMAND_PATTERN = re.compile(r"^\s*delete\s*:\s*(\S+)\s*$", re.IGNORECASE)
+DELETE_REQUEST_PATTERN = re.compile(
+    r"\b(hapus|delete|batalkan|batal|cancel)\b.*\b(meeting|rapat|jadwal|acara|event)\b"
+    r"|\b(meeting|rapat|jadwal|acara|event)\b.*\b(hapus|delete|batalkan|batal|cancel)\b",
+    re.IGNORECASE,
+)
+
+LISTING_WORDS = {"daftar", "list", "tampilkan", "lihat", "semua", "seluruh", "show", "all", "yang", "ada", "tersedia", "dong", "please", "kak"}
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def is_greeting(text: str) -> bool:
+    """True only when the whole message is a greeting, e.g. "halo aiwa!" but not "halo, cuti berapa hari?"."""
+    words = _words(text)
+    return bool(words) and len(words) <= 5 and all(w in GREETING_WORDS for w in words)
+
+
+def parse_delete_command(text: str) -> str | None:
+    match = DELETE_COMMAND_PATTERN.match(text)
+    return match.group(1) if match else None
+
+
+def is_calendar_write(pending_meetings: dict, recipient_id: str, text: str) -> bool:
+    """True when the fast path will write to the calendar (a DELETE command or a meeting confirmation)."""
+    return bool(parse_delete_command(text)) or (recipient_id in pending_meetings and bool(CONFIRM_PATTERN.match(text)))
+
+
+def build_listing_tables(catalog_tables: list[dict], aliases: dict[str, list[str]] | None = None) -> dict[str, tuple[str, ...]]:
+    """
+    Words that name each table in a listing request: the table name ("billboard", "harga sewa"), its
+    spreadsheet's file name when only one table comes from it, and any aliases configured for it.
+    """
+    names = [t["name"] for t in catalog_tables]
+    stems = {}
+    for t in catalog_tables:
+        stem = " ".join(_words(os.path.splitext(t.get("source") or "")[0]))
+        stems.setdefault(stem, []).append(t["name"])
+
+    tables = {}
+    for t in catalog_tables:
+        words = {" ".join(_words(t["name"].replace("_", " ")))}
+        words.update(stem for stem, owners in stems.items() if stem and owners == [t["name"]])
+        words.update(" ".join(_words(a)) for a in (aliases or {}).get(t["name"], []))
+        # Longest first so "titik reklame" is removed before "reklame"
+        tables[t["name"]] = tuple(sorted(filter(None, words), key=lambda w: (-len(w), w)))
+    for table in set(aliases or {}) - set(names):
+        logger.warning(f"⚠️ Listing aliases for unknown table '{table}' ignored")
+    return tables
+
+
+def load_listing_aliases(path: str | None) -> dict[str, list[str]]:
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {table: list(words) for table, words in json.load(f).items()}
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        logger.error(f"❌ Invalid listing aliases in {path}, using table names only: {e}")
+        return {}
+
+
+async def load_listing_tables(tools: dict[str, BaseTool], aliases_path: str | None = None) -> dict[str, tuple[str, ...]]:
+    """Listing words per table, from the tabular server's catalog; empty (no listing fast path) when unavailable."""
+    if "list_tables" not in tools:
+        return {}
+    try:
+        catalog = await call_tool(tools, "list_tables")
+        tables = build_listing_tables(catalog["tables"], load_listing_aliases(aliases_path))
+    except Exception as e:
+        logger.error(f"❌ Could not load the table catalog, listing fast path disabled: {e}")
+        return {}
+    logger.info(f"📋 Listing fast path tables: {', '.join(tables) or 'none'}")
+    return tables
+
+
+def match_listing(text: str, listing_tables: dict[str, tuple[str, ...]]) -> str | None:
+    """Return the table for a plain listing request such as "tampilkan daftar titik reklame"."""
+    lowered = " ".join(_words(text))
+    if not any(w in LISTING_WORDS for w in lowered.split()):
+        return None
+    for table, aliases in listing_tables.items():
+        for alias in aliases:
+            if re.search(rf"\b{alias}\b", lowered):
+                rest = re.sub(rf"\b{alias}\b", " ", lowered).split()
+                # Anything left (a city, a size...) is a filter the agent has to interpret
+                if all(w in LISTING_WORDS for w in rest):
+                    return table
+    return None
+
+
+def render_markdown_table(columns: list[str], rows: list[list]) -> str:
+    # Drop columns that are empty for every row
+    keep = [i for i in range(len(columns)) if any(row[i] not in (None, "") for row in rows)]
+    header = ["No"] + [columns[i].replace("_", " ").title() for i in keep]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for n, row in enumerate(rows, 1):
+        cells = [str(n)] + ["" if row[i] is None else str(row[i]) for i in keep]
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+async def handle_delete_command(client: WhatsAppClient, tools: dict[str, BaseTool], recipient_id: str, event_id: str) -> str:
+    result = await call_tool(tools, "delete_calendar_event", {"event_id": event_id})
+    if isinstance(result, dict) and result.get("success"):
+        reply = render_deleted(result, event_id)
+    else:
+        error = result.get("error") if isinstance(result, dict) else result
+        logger.error(f"❌ Failed to delete event {event_id}: {error}")
+        reply = f"⚠️ Gagal menghapus meeting dengan ID {event_id}. Pastikan Meeting ID sudah benar."
+    await client.send_message(recipient_id, reply)
+    return reply
+
+
+async def handle_listing(client: WhatsAppClient, tools: dict[str, BaseTool], recipient_id: str, table: str) -> str | None:
+    result = await call_tool(tools, "query_table", {"table": table, "limit": 200})
+    if not isinstance(result, dict) or not result.get("rows"):
+        logger.warning(f"⚠️ Listing for table '{table}' returned no rows: {result}")
+        return None
+    reply = render_markdown_table(result["columns"], result["rows"])
+    await client.send_message(recipient_id, reply)
+    return reply
+
+
+async def handle_fast_path(client: WhatsAppClient, tools: dict[str, BaseTool], recipient_id: str, text: str,
+                           listing_tables: dict[str, tuple[str, ...]] | None = None) -> str | None:
+    """
+    Answer messages whose reply the code already knows without calling the LLM.
+    Returns the reply that was sent, or None when the message must go to the agent.
+    """
+    if is_greeting(text):
+        reply = GREETING_TEMPLATE.strip()
+        await client.send_message(recipient_id, reply)
+        return reply
+
+    event_id = parse_delete_command(text)
+    if event_id:
+        return await handle_delete_command(client, tools, recipient_id, event_id)
+
+    if DELETE_REQUEST_PATTERN.search(text):
+        reply = DELETE_REQUEST_ID_TEMPLATE.strip()
+        await client.send_message(recipient_id, reply)
+        return reply
+
+    table = match_listing(text, listing_tables or {})
+    if table and "query_table" in tools:
+        return await handle_listing(client, tools, recipient_id, table)
+
+    return None
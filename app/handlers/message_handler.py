@@ -2,15 +2,74 @@ import logging
 import traceback
 import time
 from typing import Set
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from langchain_core.messages import HumanMessage, AIMessage
+from app.core.prompt import build_conversation
 # from app.utils.ingest_image import search_image
 from app.handlers.file_handler import handle_user_pdf_request, handle_list_documents
 from app.core.config import settings
 from app.handlers.image_handler import handle_user_image_request, handle_list_images
+from app.handlers.fast_path_handler import handle_fast_path, is_calendar_write
+from app.handlers.scheduling_handler import render_agent_reply, render_directive, handle_meeting_form
+from app.core.intent_router import intent_router
+from app.core.message import GREETING_TEMPLATE
+from app.services.answer_service import answer_with_pipeline, parse_pipeline_modes
+from app.services.response_cache import is_cacheable
+from app.services.llm_scheduler import llm_priority, message_priority
+from app.services.generation_profiles import generation_profile, profile_for
+from app.services.tool_runtime import start_tool_trace, summarize_tool_trace, parse_timeouts
+from app.services.agent_service import thread_config, record_turn, conversation_history, trim_history
+from app.core.deadline import Deadline, StageTimeout
+from app.core.message import BUSY_TEMPLATE
+from app.core.metrics import metrics
 from app.core.database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Confidently classified factual intents can skip the ReAct tool-selection turn
+PIPELINE_MODES = parse_pipeline_modes(settings.ANSWER_PIPELINE_MODES)
+STAGE_TIMEOUTS = parse_timeouts(settings.STAGE_TIMEOUTS)
+
+
+async def degraded_answer(state, incoming_text: str, intent: str | None) -> str:
+    """Reply when answering ran out of time: a cached answer if there is one, otherwise the busy template."""
+    if state.response_cache is not None and is_cacheable(incoming_text, intent):
+        # The message budget is already spent, so the cache lookup gets its own short one
+        try:
+            cached = await Deadline(STAGE_TIMEOUTS.get("degraded", 3)).run("degraded", state.response_cache.get(incoming_text))
+        except Exception:
+            cached = None
+        if cached:
+            metrics.incr("degraded.cached")
+            return cached
+    metrics.incr("degraded.busy")
+    return BUSY_TEMPLATE.strip()
+
+
+async def wait_for_models(state, deadline: Deadline, message_id: str):
+    """Hold a message that is about to use the models until startup warm-up is done."""
+    if not state.warmer.ready.is_set():
+        logger.info(f"[{message_id}] ⏳ Waiting for model warm-up...")
+        try:
+            await deadline.run("warmup", state.warmer.ready.wait())
+        except StageTimeout:
+            logger.warning(f"[{message_id}] ⚠️ Warm-up still running, continuing with cold models")
+    state.warmer.touch()
+
+
+async def handle_fast_paths(state, sender_id: str, incoming_text: str) -> str | None:
+    return (
+        await handle_meeting_form(state.whatsapp_client, state.tools, state.pending_meetings, sender_id, incoming_text)
+        or await handle_fast_path(state.whatsapp_client, state.tools, sender_id, incoming_text, state.listing_tables)
+    )
+
+
+async def pipeline_history(agent, chat_histories: dict, sender_id: str) -> list:
+    """Bounded earlier turns for pipeline answers: from the checkpointed thread, or the in-memory history."""
+    if agent.checkpointer is not None:
+        return await conversation_history(agent, sender_id, settings.AGENT_HISTORY_MAX_TOKENS)
+    return trim_history(chat_histories.get(sender_id, []), settings.AGENT_HISTORY_MAX_TOKENS, end_on="ai")
+
+
 def extract_clean_response(result: dict) -> str | None:
     """Extract AI response, removing <think> blocks and unnecessary text."""
     if not isinstance(result, dict) or "messages" not in result:
@@ -36,18 +95,16 @@ def extract_clean_response(result: dict) -> str | None:
     return clean_content if clean_content else None
 
 
-async def process_message_background(
-    agent,
-    whatsapp_client,
-    chat_histories,
-    system_instruction,
-    sender_id,
-    incoming_text,
-    processing_ids: Set[str],
-    message_id: str
-):
-    """Process incoming WhatsApp messages in the background."""
+async def process_message_background(state, sender_id: str, incoming_text: str, message_id: str):
+    """Process incoming WhatsApp messages in the background. `state` is the FastAPI app state."""
     start_time = time.perf_counter()
+    # Every stage below shares this budget; running out cancels the stage's in-flight LLM/tool calls
+    deadline = Deadline(settings.MESSAGE_DEADLINE, STAGE_TIMEOUTS)
+    agent = state.agent
+    whatsapp_client = state.whatsapp_client
+    chat_histories = state.chat_histories
+    system_instruction = state.system_instruction
+    processing_ids: Set[str] = state.processing_message_ids
     try:
         logger.info(f"[{message_id}] 🚀 Background task started for sender ...{sender_id[-4:]}")
 
@@ -62,14 +119,48 @@ async def process_message_background(
         #         await whatsapp_client.send_message(sender_id, "Sorry, no image found.")
         #         return
 
+        llm_priority.set(message_priority(incoming_text))
+
+        # Deterministic replies (meeting forms, greetings, DELETE commands, plain listings) skip the LLM
+        fast_path = handle_fast_paths(state, sender_id, incoming_text)
+        if is_calendar_write(state.pending_meetings, sender_id, incoming_text):
+            # Calendar writes run to completion (bounded by their tool timeout) so the user gets the real outcome
+            fast_reply = await fast_path
+        else:
+            try:
+                fast_reply = await deadline.run("fast_path", fast_path)
+            except StageTimeout:
+                logger.warning(f"[{message_id}] ⏰ Fast path timed out, sending degraded reply")
+                await whatsapp_client.send_message(sender_id, await degraded_answer(state, incoming_text, None))
+                return
+        if fast_reply:
+            if agent.checkpointer is None:
+                chat_histories.setdefault(sender_id, []).extend([
+                    HumanMessage(content=incoming_text),
+                    AIMessage(content=fast_reply)
+                ])
+            await record_turn(agent, sender_id, incoming_text, fast_reply)
+            logger.info(f"[{message_id}] ⚡ Answered via fast path")
+            return
+
+        intent = intent_router.route(incoming_text)
+        if intent is None and state.intent_classifier is not None:
+            # Fast paths and keyword routes never touch the models; only wait for warm-up from here on
+            await wait_for_models(state, deadline, message_id)
+            try:
+                intent, confidence = await deadline.run("classify", state.intent_classifier.classify(incoming_text))
+                logger.info(f"[{message_id}] 🧭 Classified intent: {intent} ({confidence:.2f})")
+            except StageTimeout:
+                logger.warning(f"[{message_id}] ⚠️ Intent classification timed out, using the agent")
+
         # Handle listing images
-        if any(kw in incoming_text.lower() for kw in ["daftar gambar", "list gambar", "gambar tersedia", "lihat gambar"]):
+        if intent == "list_images":
             await handle_list_images(whatsapp_client, sender_id)
             logger.info(f"[{message_id}] 🖼 Sent image list")
             return
 
         # Handle image search from SQL DB
-        if any(kw in incoming_text.lower() for kw in ["gambar", "image", "foto"]):
+        if intent == "image":
             db = SessionLocal()
             try:
                 await handle_user_image_request(whatsapp_client, sender_id, incoming_text, db)
@@ -83,35 +174,87 @@ async def process_message_background(
             return
         
         # Handle listing documents
-        if any(kw in incoming_text.lower() for kw in ["daftar dokumen", "list dokumen", "dokumen tersedia"]):
+        if intent == "list_documents":
             await handle_list_documents(whatsapp_client, sender_id)
             logger.info(f"[{message_id}] 📋 Sent document list")
             return
         
         # Handle sending PDF/documents
-        if any(kw in incoming_text.lower() for kw in ["pdf", "dokumen", "file", "unduh", "download"]):
+        if intent == "document":
             await handle_user_pdf_request(whatsapp_client, sender_id, incoming_text)
             logger.info(f"[{message_id}] 📄 Sent PDF for query: {incoming_text}")
             return
 
+        # Short factual intents run without thinking and with a small budget
+        generation_profile.set(profile_for(intent, incoming_text))
+
+        # With a checkpointer the thread is the only history; chat_histories is for CHECKPOINTER=none
+        user_history = chat_histories.get(sender_id, []) if agent.checkpointer is None else []
+        ai_response = None
+        answered_by_agent = False
+        response_cache = state.response_cache if is_cacheable(incoming_text, intent) else None
+        if intent != "greeting":
+            await wait_for_models(state, deadline, message_id)
+        answer_start = time.perf_counter()
+
+        if intent == "greeting":
+            ai_response = GREETING_TEMPLATE.strip()
+        elif response_cache is not None and (cached := await response_cache.get(incoming_text)):
+            ai_response = cached
+            response_cache = None
+        elif PIPELINE_MODES.get(intent, "agent") != "agent":
+            mode = PIPELINE_MODES[intent]
+            try:
+                history = await pipeline_history(agent, chat_histories, sender_id)
+                answer = await deadline.run("pipeline", answer_with_pipeline(
+                    mode, intent, agent.llm, state.tools, system_instruction, history, incoming_text
+                ))
+            except StageTimeout:
+                logger.warning(f"[{message_id}] ⚠️ {mode} pipeline timed out, trying the agent")
+                answer = None
+            if answer is not None:
+                raw_response = extract_clean_response({"messages": [answer]})
+                ai_response = render_directive(raw_response) or raw_response
+                logger.info(f"[{message_id}] 🎯 Answered '{intent}' via {mode} pipeline")
+
         # Forward query to AI agent
-        user_history = chat_histories.get(sender_id, [])
-        full_conversation = [SystemMessage(content=system_instruction)]
-        full_conversation.extend(user_history)
-        full_conversation.append(HumanMessage(content=incoming_text))
+        if not ai_response:
+            if agent.checkpointer is not None:
+                # The sender's thread (earlier tool calls and results included) is restored by the checkpointer
+                input_data = {"messages": [HumanMessage(content=incoming_text)]}
+            else:
+                input_data = {"messages": build_conversation(system_instruction, user_history, incoming_text)}
+            trace = start_tool_trace()
+            try:
+                result = await deadline.run("agent", agent.ainvoke(input_data, config=thread_config(sender_id)))
+            except StageTimeout:
+                logger.warning(f"[{message_id}] ⏰ Agent exceeded the {settings.MESSAGE_DEADLINE:g}s deadline, sending degraded reply")
+                await whatsapp_client.send_message(sender_id, await degraded_answer(state, incoming_text, intent))
+                return
+            finally:
+                if summary := summarize_tool_trace(trace):
+                    logger.info(f"[{message_id}] 🧰 Tools: {summary}")
 
-        input_data = {"messages": full_conversation}
-        result = await agent.ainvoke(input_data)
+            raw_response = extract_clean_response(result)
+            # Scheduling replies are rendered from templates in code, not copied out by the model
+            ai_response = render_agent_reply(result["messages"], raw_response) or raw_response
+            ai_response = ai_response if ai_response else "Sorry, the system could not process your request."
+            if not raw_response:
+                response_cache = None
+            answered_by_agent = True
 
-        raw_response = extract_clean_response(result)
-        ai_response = raw_response if raw_response else "Sorry, the system could not process your request."
+        if response_cache is not None:
+            await response_cache.put(incoming_text, ai_response, time.perf_counter() - answer_start)
 
         # Update chat history
-        user_history.extend([
-            HumanMessage(content=incoming_text),
-            AIMessage(content=ai_response)
-        ])
-        chat_histories[sender_id] = user_history
+        if agent.checkpointer is None:
+            user_history.extend([
+                HumanMessage(content=incoming_text),
+                AIMessage(content=ai_response)
+            ])
+            chat_histories[sender_id] = user_history
+        if not answered_by_agent:
+            await record_turn(agent, sender_id, incoming_text, ai_response)
 
         # Limit long messages
         if len(ai_response) > 4000:
@@ -0,0 +1,281 @@
+import re
+import json
+import time
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.tools import BaseTool
+from app.core.message import (
+    TEMPLATES,
+    CREATE_MEETING_TEMPLATE,
+    CONFIRM_MEETING_TEMPLATE,
+    MISSING_MEETING_FIELDS_TEMPLATE,
+    POST_CREATION_TEMPLATE,
+    POST_DELETION_TEMPLATE,
+    render_template,
+)
+from app.services.mcp_service import call_tool
+from app.services.whatsapp_service import WhatsAppClient
+
+logger = logging.getLogger(__name__)
+
+# The model answers with <<TEMPLATE_NAME>> or <<TEMPLATE_NAME {"field": "value"}>>; the app renders the text
+TEMPLATE_DIRECTIVE_PATTERN = re.compile(r"<<\s*([A-Z_]+)\s*(\{.*?\})?\s*>>", re.DOTALL)
+
+
+def format_event_time(value: str | None) -> tuple[str, str]:
+    """Split an ISO datetime into ("YYYY-MM-DD", "HH:MM"); all-day dates have no time."""
+    if not value:
+        return "", ""
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value, ""
+    return dt.strftime("%Y-%m-%d"), dt.strftime("%H:%M") if "T" in value else ""
+
+
+def render_created(result: dict) -> str:
+    date, start_time = format_event_time(result.get("start"))
+    _, end_time = format_event_time(result.get("end"))
+    return render_template(
+        POST_CREATION_TEMPLATE,
+        summary=result.get("summary"),
+        event_id=result.get("event_id"),
+        date=date,
+        start_time=start_time,
+        end_time=end_time,
+        email=", ".join(result.get("attendees") or []),
+        meet_link=result.get("meeting_link"),
+        calendar_link=result.get("event_link"),
+    )
+
+
+def render_deleted(result: dict, event_id: str | None = None) -> str:
+    date, start_time = format_event_time(result.get("start"))
+    _, end_time = format_event_time(result.get("end"))
+    return render_template(
+        POST_DELETION_TEMPLATE,
+        summary=result.get("summary"),
+        event_id=result.get("deleted_event_id", event_id),
+        date=date,
+        start_time=start_time,
+        end_time=end_time,
+        attendees=", ".join(result.get("attendees") or []),
+    )
+
+
+TOOL_RENDERERS = {
+    "create_calendar_event": render_created,
+    "delete_calendar_event": render_deleted,
+}
+
+
+def _tool_result(message: ToolMessage) -> dict | None:
+    content = message.content
+    if isinstance(content, list):
+        content = "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    try:
+        result = json.loads(content)
+    except (TypeError, json.JSONDecodeError):
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def render_directive(text: str) -> str | None:
+    """Render a <<TEMPLATE>> directive from the model's reply, or None when the reply has none."""
+    match = TEMPLATE_DIRECTIVE_PATTERN.search(text or "")
+    if not match or match.group(1) not in TEMPLATES:
+        return None
+    values = {}
+    if match.group(2):
+        try:
+            values = json.loads(match.group(2))
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Invalid template values from model: {match.group(2)}")
+    return render_template(TEMPLATES[match.group(1)], **values)
+
+
+def render_agent_reply(messages: list, final_text: str | None) -> str | None:
+    """
+    Build the user-facing reply in code when the agent's turn was a scheduling step: successful
+    calendar tool results are rendered from their structured output, and template directives
+    in the final answer are expanded. Returns None when the agent's own text should be sent.
+    """
+    # Only look at the current turn (after the last user message)
+    turn = []
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        turn.append(message)
+
+    for message in turn:
+        renderer = TOOL_RENDERERS.get(getattr(message, "name", None)) if isinstance(message, ToolMessage) else None
+        if renderer is None:
+            continue
+        result = _tool_result(message)
+        if result and result.get("success"):
+            return renderer(result)
+
+    return render_directive(final_text)
+
+
+# ---------------------------
+# Meeting form (reply to CREATE_MEETING_TEMPLATE)
+# ---------------------------
+MEETING_TIMEZONE = ZoneInfo("Asia/Jakarta")
+PENDING_MEETING_TTL = 30 * 60
+
+FORM_FIELD_LABELS = {
+    "summary": r"judul(?:\s+meeting)?|(?:meeting\s+)?title|topik|agenda",
+    "datetime": r"tanggal\s*(?:&|dan|and)\s*waktu|date\s*(?:&|and)\s*time|jadwal",
+    "date": r"tanggal|date|hari",
+    "time": r"waktu|jam|time",
+    "email": r"email\s+peserta|participant\s+emails?|(?:email\s+)?peserta|attendees?(?:\(s\))?|emails?",
+}
+FORM_LINE_PATTERN = re.compile(
+    r"^[^\w]*(?P<label>" + "|".join(f"(?P<{name}>{rx})" for name, rx in FORM_FIELD_LABELS.items()) + r")"
+    r"\s*(?:\([^)]*\))?\s*:\s*(?P<value>.*)$",
+    re.IGNORECASE,
+)
+FIELD_NAMES = {
+    "summary": ("Judul Meeting", "Meeting Title"),
+    "date": ("Tanggal", "Date"),
+    "time": ("Waktu (mulai – selesai)", "Time (start – end)"),
+    "email": ("Email Peserta", "Participant Email"),
+}
+EMPTY_VALUES = {"", "-", "--", "tidak ada", "kosong", "none", "no", "n/a", "tidak"}
+CONFIRM_PATTERN = re.compile(r"^\s*(ya|iya|yes|y|ok|oke|okay|benar|betul|setuju|confirm|lanjut)\b[\s.!]*$", re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+TIME_PATTERN = re.compile(r"\b([01]?\d|2[0-3])[:.]([0-5]\d)\b")
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "mei": 5, "may": 5, "jun": 6, "jul": 7,
+    "agu": 8, "agt": 8, "aug": 8, "sep": 9, "okt": 10, "oct": 10, "nov": 11, "des": 12, "dec": 12,
+}
+DATE_PATTERNS = (
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), ("y", "m", "d")),
+    (re.compile(r"\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b"), ("d", "m", "y")),
+    (re.compile(r"\b(\d{1,2})\s+([a-z]{3})[a-z]*\.?\s+(\d{4})\b", re.IGNORECASE), ("d", "mon", "y")),
+)
+
+
+def _parse_date(text: str):
+    for pattern, order in DATE_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        parts = dict(zip(order, match.groups()))
+        month = MONTHS.get(parts["mon"].lower()) if "mon" in parts else int(parts["m"])
+        try:
+            return datetime(int(parts["y"]), month, int(parts["d"])).date() if month else None
+        except ValueError:
+            return None
+    return None
+
+
+def parse_meeting_form(text: str) -> dict | None:
+    """
+    Parse a filled-in CREATE_MEETING form (Indonesian or English labels). Returns None when the text
+    is not a form, otherwise {"summary", "start", "end", "attendees", "missing"} with ISO datetimes
+    in Asia/Jakarta and the names of the fields that are missing or invalid.
+    """
+    fields = {}
+    for line in text.splitlines():
+        match = FORM_LINE_PATTERN.match(line.strip())
+        if match:
+            name = next(n for n in FORM_FIELD_LABELS if match.group(n))
+            value = match.group("value").strip()
+            # The form is bilingual: an unfilled line in one half must not erase the other half's value
+            if name not in fields or value.lower() not in EMPTY_VALUES:
+                fields[name] = value
+    if len(fields) < 2:
+        return None
+
+    summary = fields.get("summary", "")
+    when = " ".join(filter(None, (fields.get("datetime"), fields.get("date"), fields.get("time"))))
+    date = _parse_date(when)
+    times = TIME_PATTERN.findall(when)
+    email_text = fields.get("email", "")
+    attendees = EMAIL_PATTERN.findall(email_text)
+
+    missing = []
+    if summary.lower() in EMPTY_VALUES:
+        missing.append("summary")
+    if date is None:
+        missing.append("date")
+
+    start = end = None
+    if len(times) >= 2 and date is not None:
+        start = datetime(date.year, date.month, date.day, int(times[0][0]), int(times[0][1]), tzinfo=MEETING_TIMEZONE)
+        end = datetime(date.year, date.month, date.day, int(times[1][0]), int(times[1][1]), tzinfo=MEETING_TIMEZONE)
+    if start is None or end <= start:
+        missing.append("time")
+    if not attendees and email_text.lower() not in EMPTY_VALUES:
+        missing.append("email")
+
+    return {
+        "summary": summary,
+        "start": start.isoformat() if start and "time" not in missing else None,
+        "end": end.isoformat() if end and "time" not in missing else None,
+        "attendees": attendees,
+        "missing": missing,
+    }
+
+
+def render_confirmation(form: dict) -> str:
+    date, start_time = format_event_time(form["start"])
+    _, end_time = format_event_time(form["end"])
+    return render_template(
+        CONFIRM_MEETING_TEMPLATE,
+        summary=form["summary"],
+        date=date,
+        start_time=start_time,
+        end_time=end_time,
+        email=", ".join(form["attendees"]),
+    )
+
+
+def render_missing_fields(missing: list[str]) -> str:
+    notice = render_template(
+        MISSING_MEETING_FIELDS_TEMPLATE,
+        fields_id=", ".join(FIELD_NAMES[f][0] for f in missing),
+        fields_en=", ".join(FIELD_NAMES[f][1] for f in missing),
+    )
+    return f"{notice}\n\n{CREATE_MEETING_TEMPLATE.strip()}"
+
+
+async def handle_meeting_form(client: WhatsAppClient, tools: dict[str, BaseTool], pending_meetings: dict,
+                              recipient_id: str, text: str) -> str | None:
+    """
+    Create meetings from the filled-in form without the LLM: a complete form is answered with the
+    confirmation, a "Ya"/"Yes" afterwards creates the event. Returns the reply sent, or None.
+    """
+    pending = pending_meetings.pop(recipient_id, None)
+    if pending and time.monotonic() - pending["at"] < PENDING_MEETING_TTL and CONFIRM_PATTERN.match(text):
+        form = pending["form"]
+        result = await call_tool(tools, "create_calendar_event", {
+            "title": form["summary"],
+            "start_time": form["start"],
+            "end_time": form["end"],
+            "attendees": form["attendees"],
+        })
+        if isinstance(result, dict) and result.get("success"):
+            reply = render_created(result)
+        else:
+            error = result.get("error") if isinstance(result, dict) else result
+            logger.error(f"❌ Failed to create meeting from form: {error}")
+            reply = "⚠️ Gagal membuat meeting. Silakan coba lagi beberapa saat lagi."
+        await client.send_message(recipient_id, reply)
+        return reply
+
+    form = parse_meeting_form(text)
+    if form is None:
+        return None
+
+    if form["missing"]:
+        reply = render_missing_fields(form["missing"])
+    else:
+        pending_meetings[recipient_id] = {"form": form, "at": time.monotonic()}
+        reply = render_confirmation(form)
+    await client.send_message(recipient_id, reply)
+    return reply
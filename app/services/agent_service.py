@@ -1,6 +1,101 @@
+import logging
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately, trim_messages
 from langgraph.prebuilt import create_react_agent
+from app.services.llm_cascade import CascadeChatModel
 
-def init_agent(model, tools):
-    agent = create_react_agent(model, tools)
-    agent.llm = model
+logger = logging.getLogger(__name__)
+
+
+def thread_config(sender_id: str) -> dict:
+    return {"configurable": {"thread_id": sender_id}}
+
+
+def drop_dangling_tool_calls(messages: list) -> list:
+    """
+    Remove tool-call turns left without all their results by a cancelled run, together with the results
+    that did arrive for them; providers reject both calls without results and results without a call.
+    """
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    dropped_calls = set()
+    for m in messages:
+        if isinstance(m, AIMessage) and any(tc["id"] not in answered for tc in m.tool_calls):
+            dropped_calls.update(tc["id"] for tc in m.tool_calls)
+    return [
+        m for m in messages
+        if not (isinstance(m, AIMessage) and any(tc["id"] in dropped_calls for tc in m.tool_calls))
+        and not (isinstance(m, ToolMessage) and m.tool_call_id in dropped_calls)
+    ]
+
+
+def trim_history(messages: list, max_tokens: int, end_on=("human", "tool")) -> list:
+    """The most recent whole turns of `messages` that fit in `max_tokens`."""
+    return trim_messages(
+        messages,
+        max_tokens=max_tokens,
+        token_counter=count_tokens_approximately,
+        strategy="last",
+        start_on="human",
+        end_on=end_on,
+    )
+
+
+async def conversation_history(agent, sender_id: str, max_tokens: int) -> list:
+    """
+    The user/assistant turns of the sender's checkpointed thread (tool calls and results left out),
+    trimmed to `max_tokens`, for answers generated outside the agent.
+    """
+    state = await agent.aget_state(thread_config(sender_id))
+    turns = [
+        m for m in state.values.get("messages", [])
+        if isinstance(m, HumanMessage) or (isinstance(m, AIMessage) and m.content and not m.tool_calls)
+    ]
+    return trim_history(turns, max_tokens, end_on="ai")
+
+
+def build_history_hook(system_instruction: str, max_tokens: int):
+    """
+    pre_model_hook for checkpointed threads: the stored thread is left untouched, the model sees the
+    system prompt plus the most recent messages (tool results included) that fit in `max_tokens`.
+    """
+    def history_hook(state):
+        thread = drop_dangling_tool_calls(state["messages"])
+        messages = trim_history(thread, max_tokens)
+        if not messages:
+            # The current turn alone is over budget; send it anyway rather than nothing
+            last_human = max(i for i, m in enumerate(thread) if isinstance(m, HumanMessage))
+            messages = thread[last_human:]
+        return {"llm_input_messages": [SystemMessage(content=system_instruction), *messages]}
+
+    return history_hook
+
+
+def init_agent(model, tools, checkpointer=None, system_instruction: str | None = None, max_history_tokens: int = 6000):
+    # v1: all tool calls of one model turn run concurrently in a single ToolNode step, results in call order
+    if checkpointer is not None:
+        # Threads live in the checkpointer, so each turn only sends the new message
+        agent = create_react_agent(
+            model, tools, version="v1", checkpointer=checkpointer,
+            pre_model_hook=build_history_hook(system_instruction, max_history_tokens),
+        )
+    else:
+        agent = create_react_agent(model, tools, version="v1")
+    # Direct (non-agent) answers compose from retrieved context, which is the large model's job. They carry
+    # the agent's tool schemas (calls disabled) so their prompt prefix matches the agent's and the warm-up's
+    llm = model.large if isinstance(model, CascadeChatModel) else model
+    agent.llm = llm.bind_tools(tools, tool_choice="none") if tools else llm
     return agent
+
+
+async def record_turn(agent, sender_id: str, user_text: str, reply: str):
+    """Append a turn answered outside the agent (fast path, pipeline, cache) to the sender's thread."""
+    if agent.checkpointer is None:
+        return
+    try:
+        await agent.aupdate_state(
+            thread_config(sender_id),
+            {"messages": [HumanMessage(content=user_text), AIMessage(content=reply)]},
+            as_node="agent",
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record turn in thread {sender_id}: {e}")
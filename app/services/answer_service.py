@@ -0,0 +1,116 @@
+import json
+import asyncio
+import logging
+from langchain_core.messages import AIMessage
+from app.core.prompt import build_conversation
+from app.core.metrics import metrics
+from app.services.mcp_service import call_tool
+from app.services.tool_policies import semantic_fallback_enabled
+
+logger = logging.getLogger(__name__)
+
+# "agent": ReAct loop picks tools; "direct": the intent's own tool; "retrieval_first": QA + vector search in parallel
+PIPELINE_MODES = ("agent", "direct", "retrieval_first")
+INTENT_TOOLS = {
+    "qa_policy": "get_qa_data",
+    "semantic": "vectordb_query",
+}
+RETRIEVAL_SOURCES = {
+    "get_qa_data": "QA knowledge base",
+    "vectordb_query": "company documents",
+}
+
+# Tool outputs that mean "nothing useful found"
+NO_CONTEXT_MARKERS = (
+    "Maaf, saya tidak memiliki informasi",
+    "No relevant documents",
+    "Error",
+    "An error occurred",
+)
+
+CONTEXT_INSTRUCTION = (
+    "Answer my message above using only the CONTEXT. Do not call tools. "
+    "If the CONTEXT does not contain the answer, reply exactly: "
+    "\"Maaf, saya tidak memiliki informasi mengenai hal tersebut.\""
+)
+
+
+def has_context(text: str | None) -> bool:
+    return bool(text and text.strip()) and not text.strip().startswith(NO_CONTEXT_MARKERS)
+
+
+async def fetch_context(tools: dict, tool_name: str, question: str) -> str | None:
+    result = await call_tool(tools, tool_name, {"query": question})
+    if not isinstance(result, str):
+        result = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+    return result if has_context(result) else None
+
+
+async def answer_with_context(model, system_instruction: str, history: list, question: str,
+                              context: str, source: str) -> AIMessage:
+    """Single generation: the retrieved context rides at the end of the user turn, after the stable prefix."""
+    messages = build_conversation(
+        system_instruction, history, f"{question}\n\n---\nCONTEXT ({source}):\n{context}\n---\n{CONTEXT_INSTRUCTION}"
+    )
+    with metrics.timer("answer.generation"):
+        return await model.ainvoke(messages)
+
+
+async def answer_from_tool(model, tools: dict, system_instruction: str, history: list,
+                           question: str, tool_name: str) -> AIMessage | None:
+    """Call one retrieval tool directly and answer from its output; None when it found nothing."""
+    with metrics.timer(f"answer.tool.{tool_name}"):
+        context = await fetch_context(tools, tool_name, question)
+    if context is None:
+        logger.info(f"🔎 {tool_name} returned no context, falling back to the agent")
+        metrics.incr(f"answer.no_context.{tool_name}")
+        return None
+    return await answer_with_context(model, system_instruction, history, question, context, tool_name)
+
+
+async def answer_retrieval_first(model, tools: dict, system_instruction: str, history: list,
+                                 question: str) -> AIMessage | None:
+    """Query every retrieval tool at once and answer from the merged context; None when none found anything."""
+    names = [name for name in RETRIEVAL_SOURCES if name in tools]
+    # Both sources run anyway, so get_qa_data must not trigger its own semantic fallback
+    token = semantic_fallback_enabled.set(False)
+    try:
+        with metrics.timer("answer.retrieval_first.retrieve"):
+            results = await asyncio.gather(
+                *(fetch_context(tools, name, question) for name in names), return_exceptions=True
+            )
+    finally:
+        semantic_fallback_enabled.reset(token)
+
+    sections = []
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.error(f"❌ {name} failed during retrieval-first: {result}")
+        elif result:
+            sections.append(f"[{RETRIEVAL_SOURCES[name]}]\n{result}")
+    if not sections:
+        metrics.incr("answer.no_context.retrieval_first")
+        return None
+    return await answer_with_context(model, system_instruction, history, question, "\n\n".join(sections), "retrieval")
+
+
+def parse_pipeline_modes(spec: str) -> dict[str, str]:
+    """Parse "intent:mode,intent:mode" (e.g. "qa_policy:direct,semantic:retrieval_first")."""
+    modes = {}
+    for pair in filter(None, (p.strip() for p in (spec or "").split(","))):
+        intent, _, mode = pair.partition(":")
+        if mode.strip() not in PIPELINE_MODES:
+            logger.warning(f"⚠️ Unknown pipeline mode '{mode}' for intent '{intent}', using the agent")
+            continue
+        modes[intent.strip()] = mode.strip()
+    return modes
+
+
+async def answer_with_pipeline(mode: str, intent: str | None, model, tools: dict, system_instruction: str,
+                               history: list, question: str) -> AIMessage | None:
+    """Run the non-agent pipeline configured for an intent; None means "let the agent answer"."""
+    if mode == "direct" and intent in INTENT_TOOLS:
+        return await answer_from_tool(model, tools, system_instruction, history, question, INTENT_TOOLS[intent])
+    if mode == "retrieval_first":
+        return await answer_retrieval_first(model, tools, system_instruction, history, question)
+    return None
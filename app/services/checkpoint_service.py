@@ -0,0 +1,87 @@
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from langgraph.checkpoint.memory import InMemorySaver
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINTERS = ("none", "memory", "sqlite", "postgres")
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """
+    In-memory checkpointer that keeps only the latest `keep_checkpoints` checkpoints of each thread
+    (earlier ones are never read back by the agent) and at most `max_threads` threads, dropping
+    the least recently used sender first.
+    """
+
+    def __init__(self, max_threads: int = 1000, keep_checkpoints: int = 2):
+        super().__init__()
+        self.max_threads = max_threads
+        self.keep_checkpoints = keep_checkpoints
+        self._recent: OrderedDict[str, None] = OrderedDict()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = config["configurable"]["thread_id"]
+        self._prune(thread_id, config["configurable"]["checkpoint_ns"])
+
+        self._recent[thread_id] = None
+        self._recent.move_to_end(thread_id)
+        while len(self._recent) > self.max_threads:
+            evicted, _ = self._recent.popitem(last=False)
+            self.delete_thread(evicted)
+            metrics.incr("checkpoints.evicted_threads")
+        return saved
+
+    def _prune(self, thread_id: str, checkpoint_ns: str):
+        checkpoints = self.storage[thread_id][checkpoint_ns]
+        if len(checkpoints) <= self.keep_checkpoints:
+            return
+        # Checkpoint ids are time-ordered, so the largest ids are the latest
+        for checkpoint_id in sorted(checkpoints)[:-self.keep_checkpoints]:
+            del checkpoints[checkpoint_id]
+            self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        referenced = {
+            (channel, version)
+            for saved, _, _ in checkpoints.values()
+            for channel, version in self.serde.loads_typed(saved)["channel_versions"].items()
+        }
+        for key in [k for k in self.blobs if k[:2] == (thread_id, checkpoint_ns) and k[2:] not in referenced]:
+            del self.blobs[key]
+
+
+@asynccontextmanager
+async def open_checkpointer(backend: str, url: str | None = None, max_threads: int = 1000):
+    """
+    Yield the LangGraph checkpointer that stores each sender's agent thread, or None when disabled.
+    Memory (bounded to `max_threads` senders) needs no extra package; SQLite (`langgraph-checkpoint-sqlite`)
+    suits a single box, Postgres (`langgraph-checkpoint-postgres`) production. When the backend's package
+    is missing the threads are kept in memory instead.
+    """
+    if backend not in CHECKPOINTERS:
+        raise ValueError(f"Unknown checkpointer: {backend}. Use one of: {', '.join(CHECKPOINTERS)}")
+
+    if backend == "none":
+        yield None
+        return
+
+    try:
+        if backend == "sqlite":
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver as Saver
+        elif backend == "postgres":
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver as Saver
+    except ImportError as e:
+        logger.error(f"❌ {backend} checkpointer unavailable ({e}), keeping agent threads in memory")
+        backend = "memory"
+
+    if backend == "memory":
+        yield BoundedMemorySaver(max_threads=max_threads)
+        return
+
+    async with Saver.from_conn_string(url) as saver:
+        await saver.setup()
+        logger.info(f"💾 Agent threads persisted with the {backend} checkpointer")
+        yield saver
@@ -0,0 +1,51 @@
+import logging
+from collections import OrderedDict
+import numpy as np
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class CachedEmbeddings:
+    """Async wrapper around a LangChain embeddings model with an LRU cache of L2-normalized vectors."""
+
+    def __init__(self, embeddings, max_size: int = 2048):
+        self.embeddings = embeddings
+        self.max_size = max_size
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def _remember(self, key: str, vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        vec /= max(float(np.linalg.norm(vec)), 1e-12)
+        self._cache[key] = vec
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return vec
+
+    async def embed(self, text: str) -> np.ndarray:
+        key = normalize_text(text)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            metrics.incr("embeddings.cache_hit")
+            return self._cache[key]
+        metrics.incr("embeddings.cache_miss")
+        with metrics.timer("embeddings.embed"):
+            vector = await self.embeddings.aembed_query(key)
+        return self._remember(key, vector)
+
+    async def embed_many(self, texts: list[str]) -> np.ndarray:
+        """Embed in one request, only sending texts that are not cached yet."""
+        keys = [normalize_text(t) for t in texts]
+        found = {k: self._cache[k] for k in keys if k in self._cache}
+        missing = list(dict.fromkeys(k for k in keys if k not in found))
+        if missing:
+            with metrics.timer("embeddings.embed_batch"):
+                vectors = await self.embeddings.aembed_documents(missing)
+            for key, vector in zip(missing, vectors):
+                found[key] = self._remember(key, vector)
+        return np.stack([found[k] for k in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
@@ -0,0 +1,115 @@
+import os
+import re
+import sys
+import json
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+from langchain_core.runnables import RunnableBinding
+from app.core.config import settings
+from app.core.metrics import metrics
+
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+
+logger = logging.getLogger(__name__)
+
+
+def is_ollama(obj, class_name: str = "ChatOllama") -> bool:
+    """
+    isinstance check against a langchain_ollama class without importing the SDK: until get_model or
+    get_embeddings has imported it, no Ollama object can exist.
+    """
+    cls = getattr(sys.modules.get("langchain_ollama"), class_name, None)
+    return cls is not None and isinstance(obj, cls)
+
+
+@dataclass(frozen=True)
+class GenerationProfile:
+    name: str
+    max_tokens: int = 500
+    think: bool | None = None  # None leaves the model's default
+    temperature: float = 0.0
+    stop: tuple[str, ...] = ()
+
+
+DEFAULT_PROFILES = {
+    "short": GenerationProfile("short", max_tokens=150, think=False),
+    "factual": GenerationProfile("factual", max_tokens=350, think=False),
+    "tabular": GenerationProfile("tabular", max_tokens=1200, think=False),
+    "complex": GenerationProfile("complex", max_tokens=800, think=True, temperature=0.2),
+    "default": GenerationProfile("default", max_tokens=500),
+}
+INTENT_PROFILES = {
+    "greeting": "short",
+    "scheduling": "short",
+    "document": "short",
+    "image": "short",
+    "qa_policy": "factual",
+    "semantic": "factual",
+    "other": "complex",
+}
+TABULAR_PATTERN = re.compile(r"\b(tabel|table|daftar|list|rekap|bandingkan|compare|jumlah|total|berapa banyak)\b", re.IGNORECASE)
+
+# Profile for the LLM calls made while handling the current message
+generation_profile: ContextVar[GenerationProfile | None] = ContextVar("generation_profile", default=None)
+
+
+def load_profiles(path: str | None = None) -> dict[str, GenerationProfile]:
+    """Default profiles, overridden field by field from the JSON file at GENERATION_PROFILES_PATH when present."""
+    profiles = dict(DEFAULT_PROFILES)
+    path = path or settings.GENERATION_PROFILES_PATH
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for name, fields in json.load(f).items():
+                if "stop" in fields:
+                    fields["stop"] = tuple(fields["stop"])
+                profiles[name] = replace(profiles.get(name, GenerationProfile(name)), name=name, **fields)
+        logger.info(f"Loaded generation profiles from {path}")
+    return profiles
+
+
+PROFILES = load_profiles()
+
+
+def profile_for(intent: str | None, text: str) -> GenerationProfile:
+    """Pick the profile for a routed message; unrouted table-like requests get the tabular budget."""
+    name = INTENT_PROFILES.get(intent)
+    if name is None:
+        name = "tabular" if TABULAR_PATTERN.search(text) else "default"
+    metrics.incr(f"generation_profile.{name}")
+    return PROFILES[name]
+
+
+def ollama_options(model: "ChatOllama", profile: GenerationProfile, stop: list[str] | None) -> dict:
+    """The model's own Ollama options with the profile's budget, temperature and stop sequences."""
+    return {
+        "mirostat": model.mirostat,
+        "mirostat_eta": model.mirostat_eta,
+        "mirostat_tau": model.mirostat_tau,
+        "num_ctx": model.num_ctx,
+        "num_gpu": model.num_gpu,
+        "num_thread": model.num_thread,
+        "num_predict": profile.max_tokens,
+        "repeat_last_n": model.repeat_last_n,
+        "repeat_penalty": model.repeat_penalty,
+        "temperature": profile.temperature,
+        "seed": model.seed,
+        "stop": list(stop or model.stop or []) + list(profile.stop) or None,
+        "tfs_z": model.tfs_z,
+        "top_k": model.top_k,
+        "top_p": model.top_p,
+    }
+
+
+def profile_kwargs(inner, stop: list[str] | None, kwargs: dict) -> dict:
+    """Per-call kwargs applying the current profile to an Ollama chat model (other providers are left as is)."""
+    profile = generation_profile.get()
+    model = inner.bound if isinstance(inner, RunnableBinding) else inner
+    if profile is None or not is_ollama(model) or "options" in kwargs:
+        return kwargs
+    overrides = {"options": ollama_options(model, profile, stop)}
+    if profile.think is not None and settings.OLLAMA_THINKING_CONTROL:
+        overrides["reasoning"] = profile.think
+    return {**overrides, **kwargs}
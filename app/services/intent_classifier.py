@@ -0,0 +1,77 @@
+import os
+import json
+import logging
+import numpy as np
+from app.core.metrics import metrics
+from app.services.embedding_service import CachedEmbeddings
+
+logger = logging.getLogger(__name__)
+
+INTENTS = ("greeting", "qa_policy", "semantic", "document", "image", "scheduling", "other")
+
+
+class IntentClassifier:
+    """
+    Nearest-exemplar intent classifier. Labeled exemplar messages are embedded once into a
+    normalized NumPy matrix; a message is scored against every exemplar with one matrix-vector
+    product and takes the intent of its best match. The exemplar file is re-read when it changes.
+    """
+
+    def __init__(self, embedder: CachedEmbeddings, exemplars_path: str, threshold: float = 0.75, margin: float = 0.03):
+        self.embedder = embedder
+        self.exemplars_path = exemplars_path
+        self.threshold = threshold
+        self.margin = margin
+        self.matrix: np.ndarray | None = None
+        self.labels: np.ndarray | None = None
+        self._mtime: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.matrix is not None
+
+    async def load(self):
+        with open(self.exemplars_path, "r", encoding="utf-8") as f:
+            exemplars = json.load(f)
+        texts, labels = [], []
+        for intent, examples in exemplars.items():
+            if intent not in INTENTS:
+                logger.warning(f"⚠️ Unknown intent '{intent}' in exemplar file, loading it anyway")
+            texts.extend(examples)
+            labels.extend([intent] * len(examples))
+
+        self.matrix = await self.embedder.embed_many(texts)
+        self.labels = np.asarray(labels)
+        self._mtime = os.path.getmtime(self.exemplars_path)
+        logger.info(f"🧭 Intent classifier loaded {len(texts)} exemplars for {len(exemplars)} intents")
+
+    async def reload_if_changed(self):
+        if os.path.getmtime(self.exemplars_path) != self._mtime:
+            logger.info("🔄 Intent exemplars changed, reloading...")
+            await self.load()
+
+    async def classify(self, text: str) -> tuple[str | None, float]:
+        """Return (intent, confidence); intent is None when the best match is weak or ambiguous."""
+        try:
+            await self.reload_if_changed()
+        except Exception as e:
+            logger.error(f"❌ Failed to reload intent exemplars, keeping the previous set: {e}")
+        if not self.ready:
+            return None, 0.0
+
+        with metrics.timer("intent_classifier.classify"):
+            scores = self.matrix @ await self.embedder.embed(text)
+            best_per_intent = {}
+            for intent in np.unique(self.labels):
+                best_per_intent[intent] = float(scores[self.labels == intent].max())
+            ranked = sorted(best_per_intent.items(), key=lambda item: item[1], reverse=True)
+
+        intent, confidence = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if confidence < self.threshold or confidence - runner_up < self.margin:
+            metrics.incr("intent_classifier.low_confidence")
+            logger.info(f"🧭 Low-confidence intent '{intent}' ({confidence:.2f}, runner-up {runner_up:.2f})")
+            return None, confidence
+
+        metrics.incr(f"intent_classifier.{intent}")
+        return intent, confidence
@@ -0,0 +1,101 @@
+import re
+import time
+import logging
+from typing import Any
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+UNCERTAIN_PATTERN = re.compile(
+    r"tidak yakin|kurang yakin|saya tidak tahu|tidak memiliki informasi|not sure|i don'?t know|i do not know|unable to",
+    re.IGNORECASE,
+)
+TABULAR_PATTERN = re.compile(r'"rows"\s*:|\|\s*-{3,}')
+
+
+class CascadeChatModel(BaseChatModel):
+    """
+    Small/large model cascade for the ReAct loop. The small model takes every turn first (tool
+    choice, short replies); its answer is kept when it is a valid tool call or a short, confident
+    reply. Turns that compose a final answer from large or tabular tool results go straight to
+    the large model, and low-confidence small answers are escalated to it.
+    """
+
+    small: Any
+    large: Any
+    tool_names: list[str] = []
+    max_small_chars: int = 600
+    compose_min_chars: int = 800
+
+    @property
+    def _llm_type(self) -> str:
+        return "cascade"
+
+    @property
+    def backends(self) -> dict:
+        return {"small": self.small, "large": self.large}
+
+    def bind_tools(self, tools, **kwargs) -> "CascadeChatModel":
+        return self.model_copy(update={
+            "small": self.small.bind_tools(tools, **kwargs),
+            "large": self.large.bind_tools(tools, **kwargs),
+            "tool_names": [getattr(t, "name", None) or t.get("name") for t in tools],
+        })
+
+    def needs_composition(self, messages: list) -> bool:
+        """True when the turn answers from tool results that are long or tabular."""
+        results = []
+        for message in reversed(messages):
+            if not isinstance(message, ToolMessage):
+                break
+            results.append(str(message.content))
+        text = "".join(results)
+        return bool(text) and (len(text) >= self.compose_min_chars or bool(TABULAR_PATTERN.search(text)))
+
+    def is_confident(self, message: AIMessage) -> bool:
+        if message.tool_calls:
+            return all(
+                call["name"] in self.tool_names and isinstance(call.get("args"), dict)
+                for call in message.tool_calls
+            ) and not message.invalid_tool_calls
+        text = message.content if isinstance(message.content, str) else ""
+        text = text.split("</think>", 1)[-1].strip()
+        return bool(text) and len(text) <= self.max_small_chars and not UNCERTAIN_PATTERN.search(text)
+
+    def _result(self, message: AIMessage, path: str, started: float) -> ChatResult:
+        metrics.incr(f"cascade.{path}")
+        metrics.observe(f"cascade.{path}", time.perf_counter() - started)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _acall(self, which: str, messages, stop, kwargs) -> AIMessage:
+        with metrics.timer(f"cascade.model.{which}"):
+            return await getattr(self, which).ainvoke(messages, stop=stop, **kwargs)
+
+    def _call(self, which: str, messages, stop, kwargs) -> AIMessage:
+        with metrics.timer(f"cascade.model.{which}"):
+            return getattr(self, which).invoke(messages, stop=stop, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        started = time.perf_counter()
+        if self.needs_composition(messages):
+            return self._result(await self._acall("large", messages, stop, kwargs), "large_compose", started)
+
+        draft = await self._acall("small", messages, stop, kwargs)
+        if self.is_confident(draft):
+            return self._result(draft, "small", started)
+
+        logger.info("⬆️ Small model not confident, escalating to the large model")
+        return self._result(await self._acall("large", messages, stop, kwargs), "escalated", started)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        started = time.perf_counter()
+        if self.needs_composition(messages):
+            return self._result(self._call("large", messages, stop, kwargs), "large_compose", started)
+
+        draft = self._call("small", messages, stop, kwargs)
+        if self.is_confident(draft):
+            return self._result(draft, "small", started)
+        return self._result(self._call("large", messages, stop, kwargs), "escalated", started)
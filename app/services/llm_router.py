@@ -0,0 +1,176 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Any
+from pydantic import PrivateAttr
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class BackendStats:
+    """Rolling latency and error window for one backend, plus a short cooldown after repeated failures."""
+
+    def __init__(self, window: int = 50, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.latencies: deque = deque(maxlen=window)
+        self.errors: deque = deque(maxlen=window)
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record(self, seconds: float | None, ok: bool):
+        self.errors.append(not ok)
+        if ok:
+            self.latencies.append(seconds)
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.cooldown
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.open_until
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors) / len(self.errors) if self.errors else 0.0
+
+    def percentile(self, q: float) -> float | None:
+        samples = sorted(self.latencies)
+        return samples[min(len(samples) - 1, int(q * len(samples)))] if samples else None
+
+    def score(self) -> float | None:
+        """Lower is better: median latency, inflated by the error rate. None until the backend has been called."""
+        if not self.errors:
+            return None
+        p50 = self.percentile(0.5) or 0.0
+        return p50 * (1 + 4 * self.error_rate) + 10 * self.error_rate
+
+    def snapshot(self) -> dict:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "available": self.available,
+            "error_rate": round(self.error_rate, 3),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class RouterChatModel(BaseChatModel):
+    """
+    Chat model that spreads calls over several backends (ChatOllama, ChatOpenAI, ... or any fake
+    chat model). Backends are tried fastest/healthiest first; a timeout or error fails over to the
+    next one. With `hedge=True` a second backend is started when the first has not answered within
+    its own p95 latency, and whichever finishes first wins.
+    """
+
+    backends: dict[str, Any]
+    timeout: float = 60.0
+    hedge: bool = False
+    hedge_min_delay: float = 1.0
+    _stats: dict[str, BackendStats] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        for name in self.backends:
+            self._stats.setdefault(name, BackendStats())
+
+    @property
+    def _llm_type(self) -> str:
+        return "router"
+
+    def bind_tools(self, tools, **kwargs) -> "RouterChatModel":
+        bound = self.model_copy(update={"backends": {
+            name: backend.bind_tools(tools, **kwargs) for name, backend in self.backends.items()
+        }})
+        bound._stats = self._stats  # share health data with the unbound router
+        return bound
+
+    def ranked_backends(self) -> list[str]:
+        names = list(self.backends)
+        available = [n for n in names if self._stats[n].available] or names
+        # Measured backends first, untried ones after them in configured order (they still serve failover
+        # and hedging); the stable sort keeps the configured order between equally scored backends
+        scores = {n: self._stats[n].score() for n in available}
+        return sorted(available, key=lambda n: (scores[n] is None, scores[n] or 0.0))
+
+    def stats(self) -> dict:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def _hedge_delay(self, name: str) -> float:
+        p95 = self._stats[name].percentile(0.95)
+        return max(self.hedge_min_delay, p95 if p95 is not None else self.timeout / 2)
+
+    async def _call(self, name: str, messages: list[BaseMessage], stop, kwargs) -> AIMessage:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.backends[name].ainvoke(messages, stop=stop, **kwargs), self.timeout)
+        except Exception as e:
+            self._stats[name].record(None, ok=False)
+            metrics.incr(f"llm.{name}.error")
+            kind = "timed out" if isinstance(e, asyncio.TimeoutError) else f"failed: {e}"
+            logger.warning(f"⚠️ LLM backend '{name}' {kind}")
+            raise
+        elapsed = time.perf_counter() - start
+        self._stats[name].record(elapsed, ok=True)
+        metrics.observe(f"llm.{name}", elapsed)
+        return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        order = self.ranked_backends()
+        pending: dict[asyncio.Task, str] = {}
+        last_error: Exception | None = None
+        try:
+            while order or pending:
+                if not pending:
+                    name = order.pop(0)
+                    pending[asyncio.create_task(self._call(name, messages, stop, kwargs))] = name
+                    if last_error is not None:
+                        logger.info(f"🔀 Failing over to LLM backend '{name}'")
+                        metrics.incr("llm.failover")
+
+                # Wait for a result, or until it is time to hedge with the next backend
+                can_hedge = self.hedge and order and len(pending) == 1
+                delay = self._hedge_delay(next(iter(pending.values()))) if can_hedge else None
+                done, _ = await asyncio.wait(pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    name = order.pop(0)
+                    logger.info(f"🪁 Hedging LLM request to '{name}'")
+                    metrics.incr("llm.hedged")
+                    pending[asyncio.create_task(self._call(name, messages, stop, kwargs))] = name
+                    continue
+
+                for task in done:
+                    name = pending.pop(task)
+                    if task.exception() is None:
+                        if pending:
+                            metrics.incr(f"llm.hedge_winner.{name}")
+                        return ChatResult(generations=[ChatGeneration(message=task.result())])
+                    last_error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise RuntimeError(f"All LLM backends failed: {last_error}") from last_error
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        """Synchronous path: plain failover in ranked order, no hedging."""
+        last_error: Exception | None = None
+        for name in self.ranked_backends():
+            start = time.perf_counter()
+            try:
+                result = self.backends[name].invoke(messages, stop=stop, **kwargs)
+            except Exception as e:
+                self._stats[name].record(None, ok=False)
+                metrics.incr(f"llm.{name}.error")
+                last_error = e
+                continue
+            self._stats[name].record(time.perf_counter() - start, ok=True)
+            return ChatResult(generations=[ChatGeneration(message=result)])
+        raise RuntimeError(f"All LLM backends failed: {last_error}") from last_error
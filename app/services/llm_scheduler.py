@@ -0,0 +1,155 @@
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.generation_profiles import profile_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Priority of LLM calls made while handling the current message; lower runs first
+llm_priority: ContextVar[int] = ContextVar("llm_priority", default=1)
+
+
+def message_priority(text: str) -> int:
+    """Short, interactive messages first; long requests (summaries, tables) after them."""
+    if len(text) <= 80:
+        return 0
+    return 2 if len(text) > 300 else 1
+
+
+class LLMScheduler:
+    """Caps concurrent generations at the backend's parallelism and admits waiting calls by priority, then FIFO."""
+
+    def __init__(self, max_in_flight: int = 2):
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def _release(self):
+        # Hand the slot straight to the best waiter, otherwise free it
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 1):
+        start = time.perf_counter()
+        if self.in_flight < self.max_in_flight and not self.queued:
+            self.in_flight += 1
+        else:
+            metrics.incr("llm_queue.queued")
+            fut = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut.done() and not fut.cancelled():
+                    self._release()
+                raise
+        metrics.observe("llm_queue.wait", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+class ScheduledChatModel(BaseChatModel):
+    """Runs a chat model's async generations through an LLMScheduler; queue wait and generation are timed separately."""
+
+    inner: Any
+    scheduler: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "scheduled"
+
+    @property
+    def backends(self) -> dict:
+        return {"inner": self.inner}
+
+    def bind_tools(self, tools, **kwargs) -> "ScheduledChatModel":
+        return self.model_copy(update={"inner": self.inner.bind_tools(tools, **kwargs)})
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        async with self.scheduler.slot(llm_priority.get()):
+            with metrics.timer("llm_queue.generation"):
+                message = await self.inner.ainvoke(messages, stop=stop, **profile_kwargs(self.inner, stop, kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        # Sync callers (scripts) are not queued, but still get the current generation profile
+        message = self.inner.invoke(messages, stop=stop, **profile_kwargs(self.inner, stop, kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent `aembed_query` calls made within `window` seconds into one
+    `aembed_documents` request (Ollama embeds a list of inputs in a single call).
+    """
+
+    def __init__(self, embeddings, max_batch: int = 32, window: float = 0.005):
+        self.embeddings = embeddings
+        self.max_batch = max_batch
+        self.window = window
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        # The loop only keeps weak references to tasks; in-flight batches are held here until done
+        self._tasks: set[asyncio.Task] = set()
+
+    async def aembed_query(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((text, fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await fut
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]):
+        metrics.incr("embeddings.batches")
+        metrics.incr("embeddings.batched_queries", len(batch))
+        try:
+            vectors = await self.embeddings.aembed_documents([text for text, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), vector in zip(batch, vectors):
+            if not fut.done():
+                fut.set_result(vector)
+
+
+# One Ollama server: every local model shares its parallel slots
+ollama_scheduler = LLMScheduler(settings.OLLAMA_MAX_IN_FLIGHT)
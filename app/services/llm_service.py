@@ -1,20 +1,31 @@
-from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.services.llm_router import RouterChatModel
+from app.services.llm_cascade import CascadeChatModel
+from app.services.prompt_cache import prefix_monitor
+from app.services.llm_scheduler import ScheduledChatModel, ollama_scheduler
 
-def get_model(model_type="openrouter"):
+
+# Provider SDKs are imported on first use: each costs ~1s of startup and only one or two are configured
+def get_model(model_type="openrouter", model_name: str | None = None):
     if model_type == "ollama":
-        return ChatOllama(
-            model=settings.OLLAMA_MODEL,
+        with metrics.timer("startup.import.ollama"):
+            from langchain_ollama import ChatOllama
+        model = ChatOllama(
+            model=model_name or settings.OLLAMA_MODEL,
             base_url=settings.OLLAMA_URL,
+            keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            num_ctx=settings.OLLAMA_NUM_CTX,
+            callbacks=[prefix_monitor],
             temperature=0,
             num_predict=500,
             top_p=0.9,
             repeat_penalty=1.1
         )
+        return ScheduledChatModel(inner=model, scheduler=ollama_scheduler)
     elif model_type == "openrouter":
+        with metrics.timer("startup.import.openrouter"):
+            from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             model="deepseek/deepseek-chat-v3.1:free",
             base_url="https://openrouter.ai/api/v1",
@@ -23,6 +34,8 @@ def get_model(model_type="openrouter"):
             max_tokens=500,
         )
     elif model_type == "gemini":
+        with metrics.timer("startup.import.gemini"):
+            from langchain_google_genai import ChatGoogleGenerativeAI
         return ChatGoogleGenerativeAI(
             model="gemini-2.5-flash",
             google_api_key=settings.GEMINI_API_KEY,
@@ -30,11 +43,55 @@ def get_model(model_type="openrouter"):
             max_tokens=500,
         )
     elif model_type == "groq":
+        with metrics.timer("startup.import.groq"):
+            from langchain_groq import ChatGroq
         return ChatGroq(
             model="openai/gpt-oss-120b",
             groq_api_key=settings.GROQ_API_KEY,
             temperature=0,
             max_tokens=500,
         )
+    elif model_type == "router":
+        return get_router_model()
     else:
         raise ValueError(f"Unknown model type: {model_type}")
+
+
+def get_router_model(backends: list[str] | None = None) -> RouterChatModel:
+    """Router over the configured providers (LLM_BACKENDS), in order of preference."""
+    names = backends or [b.strip() for b in settings.LLM_BACKENDS.split(",") if b.strip()]
+    return RouterChatModel(
+        backends={name: get_model(name) for name in names},
+        timeout=settings.LLM_TIMEOUT,
+        hedge=settings.LLM_HEDGE,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+    )
+
+
+def get_cascade_model(large) -> CascadeChatModel:
+    """Put the small Ollama model (OLLAMA_SMALL_MODEL) in front of `large`."""
+    return CascadeChatModel(
+        small=get_model("ollama", settings.OLLAMA_SMALL_MODEL),
+        large=large,
+        max_small_chars=settings.CASCADE_MAX_SMALL_CHARS,
+        compose_min_chars=settings.CASCADE_COMPOSE_MIN_CHARS,
+    )
+
+def keep_alive_seconds(value: str) -> int:
+    """OllamaEmbeddings only takes seconds, so "30m" / "2h" / "90s" / "-1" are converted."""
+    units = {"s": 1, "m": 60, "h": 3600}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def get_embeddings():
+    with metrics.timer("startup.import.ollama"):
+        from langchain_ollama import OllamaEmbeddings
+
+    return OllamaEmbeddings(
+        model=settings.OLLAMA_EMBEDDING,
+        base_url=settings.OLLAMA_URL,
+        keep_alive=keep_alive_seconds(settings.OLLAMA_KEEP_ALIVE),
+    )
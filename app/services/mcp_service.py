@@ -1,31 +1,141 @@
+import sys
+import json
+import asyncio
+import logging
+import importlib.util
 from pathlib import Path
+from typing import Any
+from langchain_core.tools import BaseTool, StructuredTool, ToolException
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult, TextContent, Tool as MCPTool
+from app.core.config import settings
 
-async def init_mcp_client(base_dir: Path) -> tuple[MultiServerMCPClient, str]:
-    project_root = base_dir.parent
+logger = logging.getLogger(__name__)
 
-    QA_SERVER = str(project_root / "servers" / "qa_server.py")
-    VECTORDB_SERVER = str(project_root / "servers" / "vectordb_server.py")
-    SCHEDULER_SERVER = str(project_root / "servers" / "scheduler_server.py")
+MCP_TRANSPORTS = ("stdio", "inprocess")
+
+MCP_SERVERS = {
+    "qa": "qa_server.py",
+    "vectordb": "vectordb_server.py",
+    "scheduler": "scheduler_server.py",
+    "tabular": "tabular_server.py",
+}
+
+
+def mount_server(servers_dir: Path, name: str) -> FastMCP:
+    """Import a server module into this process and return its FastMCP instance."""
+    # Servers import their helpers as top-level packages (`from retrieval...`), like when run as scripts
+    if str(servers_dir) not in sys.path:
+        sys.path.insert(0, str(servers_dir))
+    module_name = f"mcp_inprocess_{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, servers_dir / MCP_SERVERS[name])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return module.mcp
+
+
+def tool_result(result: CallToolResult) -> tuple[str | list[str], list | None]:
+    """(content, artifact) like the stdio adapter: text blocks as content, anything else as the artifact."""
+    texts = [c.text for c in result.content if isinstance(c, TextContent)]
+    others = [c for c in result.content if not isinstance(c, TextContent)]
+    content = texts[0] if len(texts) == 1 else (texts or "")
+    if result.isError:
+        raise ToolException(content)
+    return content, others or None
+
+
+def inprocess_tool(server: FastMCP, info: MCPTool) -> BaseTool:
+    """Same name, schema and (content, artifact) output as the stdio tool, without JSON-RPC or a session."""
+
+    def call_in_thread(arguments: dict):
+        # The servers' tools are sync and would block the app's event loop, so each call gets a worker thread
+        return asyncio.run(server.call_tool(info.name, arguments))
+
+    async def call_tool(**arguments):
+        try:
+            results = await asyncio.to_thread(call_in_thread, arguments)
+        except Exception as e:
+            result = CallToolResult(content=[TextContent(type="text", text=str(e))], isError=True)
+        else:
+            # Same packing as the MCP server's call_tool handler
+            if isinstance(results, tuple):
+                content = list(results[0])
+            elif isinstance(results, dict):
+                content = [TextContent(type="text", text=json.dumps(results, indent=2))]
+            else:
+                content = list(results)
+            result = CallToolResult(content=content, isError=False)
+        return tool_result(result)
+
+    return StructuredTool(
+        name=info.name,
+        description=info.description or "",
+        args_schema=info.inputSchema,
+        coroutine=call_tool,
+        response_format="content_and_artifact",
+        metadata=info.annotations.model_dump() if info.annotations else None,
+        tags=["inprocess"],
+    )
+
+
+async def load_inprocess_tools(servers_dir: Path, name: str) -> list[BaseTool]:
+    server = await asyncio.to_thread(mount_server, servers_dir, name)
+    return [inprocess_tool(server, info) for info in await server.list_tools()]
+
+
+async def init_mcp_client(base_dir: Path, transport: str | None = None) -> tuple[MultiServerMCPClient, list[BaseTool]]:
+    """
+    Start the MCP servers and load their tools (each server is listed once, concurrently). With
+    MCP_TRANSPORT=inprocess the servers in MCP_INPROCESS_SERVERS are imported into this process and
+    called directly; the rest still run as stdio subprocesses.
+    """
+    servers_dir = base_dir.parent / "servers"
+    transport = transport or settings.MCP_TRANSPORT
+    if transport not in MCP_TRANSPORTS:
+        raise ValueError(f"Unknown MCP transport: {transport}. Use one of: {', '.join(MCP_TRANSPORTS)}")
+    inprocess = []
+    if transport == "inprocess":
+        inprocess = [n.strip() for n in settings.MCP_INPROCESS_SERVERS.split(",") if n.strip() in MCP_SERVERS]
 
     client = MultiServerMCPClient({
-        "qa": {
-            "command": "python", 
-            "args": [QA_SERVER], 
-            "transport": "stdio"
-            },
-        "vectordb": {
-            "command": "python", 
-            "args": [VECTORDB_SERVER], 
-            "transport": "stdio"},
-        "scheduler": {
-            "command": "python", 
-            "args": [SCHEDULER_SERVER], 
-            "transport": "stdio"},
+        name: {
+            "command": "python",
+            "args": [str(servers_dir / filename)],
+            "transport": "stdio",
+        }
+        for name, filename in MCP_SERVERS.items()
+        if name not in inprocess
     })
 
-    tools = await client.get_tools()
-    tool_names = ", ".join([t.name for t in tools])
+    groups = await asyncio.gather(
+        client.get_tools(),
+        *(load_inprocess_tools(servers_dir, name) for name in inprocess),
+    )
+    tools = [tool for group in groups for tool in group]
+    if inprocess:
+        logger.info(f"🔌 In-process MCP servers: {', '.join(inprocess)}")
+
+    return client, tools
+ 
+
+async def call_tool(tools: dict[str, BaseTool], name: str, args: dict | None = None) -> Any:
+    """Invoke an MCP tool directly (outside the agent) and decode JSON results."""
+    tool = tools.get(name)
+    if tool is None:
+        raise KeyError(f"Tool not available: {name}")
 
-    return client, tool_names
- 
\ No newline at end of file
+    result = await tool.ainvoke(args or {})
+    if isinstance(result, str):
+        try:
+            return json.loads(result)
+        except json.JSONDecodeError:
+            return result
+    return result
@@ -0,0 +1,60 @@
+import json
+import hashlib
+import logging
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import SystemMessage
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def prefix_fingerprint(messages: list, tools: list | None = None) -> str:
+    """Hash of what Ollama sees before the conversation: leading system messages and tool schemas."""
+    system = [m.content for m in messages if isinstance(m, SystemMessage)][:1]
+    payload = json.dumps({"system": system, "tools": tools or []}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class PrefixCacheMonitor(BaseCallbackHandler):
+    """
+    Chat-model callback that checks each request's prompt prefix against the previous request to
+    the same model (a change means Ollama must re-evaluate the whole prompt), and records Ollama's
+    prompt-eval token counts and durations.
+    """
+
+    def __init__(self):
+        self._last_prefix: dict[str, str] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "default"
+        fingerprint = prefix_fingerprint(messages[0] if messages else [], params.get("tools"))
+        previous = self._last_prefix.get(model)
+        if previous is not None:
+            metrics.incr("prompt_prefix.hit" if fingerprint == previous else "prompt_prefix.miss")
+            if fingerprint != previous:
+                logger.info(f"🧊 Prompt prefix changed for {model} ({previous} → {fingerprint})")
+        self._last_prefix[model] = fingerprint
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                info = getattr(generation.message, "response_metadata", None) or generation.generation_info or {}
+                if "prompt_eval_count" not in info:
+                    continue
+                metrics.incr("prompt_eval.tokens", info.get("prompt_eval_count") or 0)
+                metrics.incr("prompt_eval.requests")
+                if info.get("prompt_eval_duration"):
+                    metrics.observe("prompt_eval", info["prompt_eval_duration"] / 1e9)
+
+    def stats(self) -> dict:
+        counters = metrics.counters
+        checked = counters["prompt_prefix.hit"] + counters["prompt_prefix.miss"]
+        requests = counters["prompt_eval.requests"]
+        return {
+            "prefix_hit_rate": round(counters["prompt_prefix.hit"] / checked, 3) if checked else None,
+            "avg_prompt_eval_tokens": round(counters["prompt_eval.tokens"] / requests, 1) if requests else None,
+        }
+
+
+prefix_monitor = PrefixCacheMonitor()
@@ -0,0 +1,132 @@
+import os
+import re
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from app.core.metrics import metrics
+from app.services.embedding_service import CachedEmbeddings, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Answers to these depend on the calendar, the sender or the previous turns, so they are never cached
+UNCACHEABLE_INTENTS = {"scheduling", "greeting", "other"}
+UNCACHEABLE_PATTERN = re.compile(
+    r"\b(meeting|rapat|jadwal|schedule|kalender|calendar|booking|hapus|delete|batal|cancel|konfirmasi|confirm"
+    r"|itu|tersebut|tadi|sebelumnya|barusan|lanjut|lagi|yang ini|that|this|those|it|again|previous)\b"
+    r"|@|\d{1,2}[:.]\d{2}|\d{4}-\d{2}-\d{2}",
+    re.IGNORECASE,
+)
+
+
+def is_cacheable(text: str, intent: str | None = None) -> bool:
+    """Standalone questions only: no follow-ups, no scheduling, nothing shorter than two words."""
+    if intent in UNCACHEABLE_INTENTS:
+        return False
+    return len(text.split()) >= 2 and not UNCACHEABLE_PATTERN.search(text)
+
+
+@dataclass
+class CacheEntry:
+    question: str
+    answer: str
+    vector: np.ndarray | None
+    created: float
+    cost: float
+
+
+class ResponseCache:
+    """
+    Two-tier answer cache: exact match on normalized text, then nearest cached question by cosine
+    similarity. Entries expire after `ttl` seconds, the oldest are evicted beyond `max_size`, and
+    everything is dropped when any of `watch_paths` (knowledge base, indexes) changes on disk.
+    """
+
+    def __init__(self, embedder: CachedEmbeddings, ttl: float = 3600, max_size: int = 500,
+                 similarity: float = 0.95, watch_paths: list[str] | None = None):
+        self.embedder = embedder
+        self.ttl = ttl
+        self.max_size = max_size
+        self.similarity = similarity
+        self.watch_paths = watch_paths or []
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._signature = self._sources_signature()
+
+    def _sources_signature(self) -> tuple:
+        return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in self.watch_paths)
+
+    def _check_sources(self):
+        signature = self._sources_signature()
+        if signature != self._signature:
+            if self._entries:
+                logger.info(f"🔄 Knowledge sources changed, dropping {len(self._entries)} cached answers")
+                metrics.incr("response_cache.invalidated")
+            self._entries.clear()
+            self._signature = signature
+
+    def _drop_expired(self):
+        now = time.monotonic()
+        # Entries are kept in insertion/use order, but TTL runs from creation, so scan them all
+        for key in [k for k, e in self._entries.items() if now - e.created > self.ttl]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get(self, text: str) -> str | None:
+        self._check_sources()
+        self._drop_expired()
+        key = normalize_text(text)
+
+        entry = self._entries.get(key)
+        tier = "exact"
+        if entry is None and self._entries:
+            entry, tier = await self._nearest(text), "semantic"
+
+        if entry is None:
+            metrics.incr("response_cache.miss")
+            return None
+        self._entries.move_to_end(normalize_text(entry.question))
+        metrics.incr(f"response_cache.hit_{tier}")
+        metrics.observe("response_cache.saved", entry.cost)
+        metrics.incr("response_cache.saved_seconds", entry.cost)
+        logger.info(f"💾 Response cache {tier} hit for '{key}' (cached '{entry.question}')")
+        return entry.answer
+
+    async def _nearest(self, text: str) -> CacheEntry | None:
+        candidates = [e for e in self._entries.values() if e.vector is not None]
+        if not candidates:
+            return None
+        try:
+            vector = await self.embedder.embed(text)
+        except Exception as e:
+            logger.error(f"❌ Response cache embedding failed, exact tier only: {e}")
+            return None
+        scores = np.stack([e.vector for e in candidates]) @ vector
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= self.similarity else None
+
+    async def put(self, text: str, answer: str, cost: float):
+        """Store an answer together with how long it took to produce (reported as latency saved on hits)."""
+        key = normalize_text(text)
+        try:
+            vector = await self.embedder.embed(text)
+        except Exception as e:
+            logger.error(f"❌ Response cache embedding failed, storing for exact match only: {e}")
+            vector = None
+        self._entries[key] = CacheEntry(text, answer, vector, time.monotonic(), cost)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        counters = metrics.counters
+        hits = counters["response_cache.hit_exact"] + counters["response_cache.hit_semantic"]
+        lookups = hits + counters["response_cache.miss"]
+        return {
+            "size": len(self._entries),
+            "hit_ratio": round(hits / lookups, 3) if lookups else None,
+            # A counter, not the sample deque, which only keeps the latest `max_samples` hits
+            "saved_seconds_total": round(counters["response_cache.saved_seconds"], 2),
+        }
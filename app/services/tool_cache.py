@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from langchain_core.tools import BaseTool
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Read-only tools that may be cached; anything not listed here (calendar, email...) never is
+DEFAULT_TOOL_CACHE_POLICIES = {
+    "get_qa_data": {"ttl": 900, "normalize": ["query"]},
+    "vectordb_query": {"ttl": 900, "normalize": ["query"]},
+    "vectordb_query_batch": {"ttl": 900, "normalize": ["queries"]},
+    "list_tables": {"ttl": 3600},
+    "query_table": {"ttl": 600},
+    "get_current_datetime": {"ttl": 20},
+}
+NEVER_CACHE = {"create_calendar_event", "delete_calendar_event", "send_email"}
+
+# Server version tools and the cached tools whose results they cover
+VERSION_TOOLS = {
+    "qa_data_version": ["get_qa_data"],
+    "vectordb_data_version": ["vectordb_query", "vectordb_query_batch"],
+    "tabular_data_version": ["list_tables", "query_table"],
+}
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def files_version(paths: list[str]) -> str:
+    """Same format as the servers' version tools: the mtimes of their data files, "0" when missing."""
+    return "-".join(str(os.path.getmtime(p)) if os.path.exists(p) else "0" for p in paths)
+
+
+class ToolResultCache:
+    """
+    LRU + TTL cache of MCP tool results keyed by tool name and (normalized) arguments. Entries of
+    a server's tools are dropped when its data version changes; a background task (`start`) reads
+    the versions every `version_check_interval` seconds. A version is read from the data files in
+    `version_paths` when given, otherwise from the server's `*_data_version` tool if that server
+    runs in-process (a stdio tool call would spawn a server process on every poll). Servers with
+    neither rely on the TTL alone.
+    """
+
+    def __init__(self, policies: dict | None = None, max_size: int = 1000, version_check_interval: float = 30.0,
+                 version_paths: dict[str, list[str]] | None = None):
+        self.policies = {k: v for k, v in (policies or DEFAULT_TOOL_CACHE_POLICIES).items() if k not in NEVER_CACHE}
+        self.max_size = max_size
+        self.version_check_interval = version_check_interval
+        self.version_paths = version_paths or {}
+        self._entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._version_tools: dict[str, BaseTool] = {}
+        self._versions: dict[str, str] = {}
+        self._task: asyncio.Task | None = None
+
+    def key(self, name: str, kwargs: dict) -> tuple:
+        normalized = set(self.policies[name].get("normalize", []))
+        args = {k: _normalize(v) if k in normalized else v for k, v in kwargs.items()}
+        return name, json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+    def invalidate(self, tool_names: list[str] | None = None) -> int:
+        keys = [k for k in self._entries if tool_names is None or k[0] in tool_names]
+        for k in keys:
+            del self._entries[k]
+        metrics.incr("tool_cache.invalidated", len(keys))
+        return len(keys)
+
+    def version_sources(self) -> list[str]:
+        return [
+            name for name in VERSION_TOOLS
+            if name in self.version_paths
+            or (name in self._version_tools and "inprocess" in (self._version_tools[name].tags or []))
+        ]
+
+    async def _read_version(self, name: str) -> str:
+        if name in self.version_paths:
+            return files_version(self.version_paths[name])
+        return await self._version_tools[name].ainvoke({})
+
+    async def refresh_versions(self):
+        """Read every data version and drop the cached results of servers whose version changed."""
+        names = self.version_sources()
+        results = await asyncio.gather(*(self._read_version(n) for n in names), return_exceptions=True)
+        for name, version in zip(names, results):
+            if isinstance(version, Exception):
+                logger.warning(f"⚠️ Could not read {name}: {version}")
+                continue
+            previous = self._versions.get(name)
+            self._versions[name] = str(version)
+            if previous is not None and previous != str(version):
+                dropped = self.invalidate(VERSION_TOOLS[name])
+                logger.info(f"🔄 {name} changed, dropped {dropped} cached tool results")
+
+    async def _poll_versions(self):
+        while True:
+            await self.refresh_versions()
+            await asyncio.sleep(self.version_check_interval)
+
+    def start(self):
+        """Poll the data versions in the background; cached tool calls never wait for them."""
+        if self.version_sources():
+            self._task = asyncio.create_task(self._poll_versions())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def wrap(self, tool: BaseTool) -> BaseTool:
+        policy = self.policies.get(tool.name)
+        inner = tool.coroutine
+        if policy is None or inner is None or tool.name in NEVER_CACHE:
+            return tool
+        ttl = policy.get("ttl", 300)
+
+        async def cached(*args, **kwargs):
+            key = self.key(tool.name, kwargs)
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self._entries.move_to_end(key)
+                metrics.incr(f"tool_cache.{tool.name}.hit")
+                return entry[1]
+
+            metrics.incr(f"tool_cache.{tool.name}.miss")
+            result = await inner(*args, **kwargs)
+            if not _is_error(result):
+                self._entries[key] = (time.monotonic(), result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+            return result
+
+        return tool.model_copy(update={"coroutine": cached})
+
+    def apply(self, tools: list[BaseTool]) -> list[BaseTool]:
+        """Wrap cacheable tools; version tools are kept for invalidation and removed from the returned list."""
+        self._version_tools = {t.name: t for t in tools if t.name in VERSION_TOOLS}
+        return [self.wrap(t) for t in tools if t.name not in VERSION_TOOLS]
+
+    def stats(self) -> dict:
+        counters = metrics.counters
+        per_tool = {}
+        for name in self.policies:
+            hits, misses = counters[f"tool_cache.{name}.hit"], counters[f"tool_cache.{name}.miss"]
+            if hits + misses:
+                per_tool[name] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+        return {"size": len(self._entries), "versions": self._versions, "tools": per_tool}
+
+
+def _is_error(result) -> bool:
+    text = result[0] if isinstance(result, tuple) else result
+    return isinstance(text, str) and text.startswith(("Error", "An error occurred"))
@@ -0,0 +1,70 @@
+import json
+import logging
+from contextvars import ContextVar
+from langchain_core.tools import BaseTool
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+NO_INFO_MESSAGE = "Maaf, saya tidak memiliki informasi mengenai hal tersebut."
+
+# Off while a caller already runs semantic search next to the precise tool (retrieval-first pipeline)
+semantic_fallback_enabled: ContextVar[bool] = ContextVar("semantic_fallback_enabled", default=True)
+
+
+def _content(result) -> str:
+    """Text part of an MCP tool result ((content, artifact) tuples, lists of text blocks or plain strings)."""
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, list):
+        result = "\n".join(str(part) for part in result)
+    return str(result or "")
+
+
+def is_confident_match(text: str, min_score: float) -> bool:
+    """True when the precise tool returned at least one match scoring `min_score` or more."""
+    text = text.strip()
+    if not text or text.startswith((NO_INFO_MESSAGE, "Error")):
+        return False
+    try:
+        matches = json.loads(text).get("matches", [])
+    except (json.JSONDecodeError, AttributeError):
+        return True  # text output carries no scores; a non-empty answer counts as a match
+    return any(m.get("score", 0) >= min_score for m in matches)
+
+
+def with_semantic_fallback(precise: BaseTool, semantic: BaseTool, min_score: float = 0.75) -> BaseTool:
+    """
+    Copy of the precise (QA) tool that runs semantic search in the same call when it has no confident
+    match, so a miss costs one tool hop instead of another model turn. The semantic results replace the
+    low-confidence precise output (which can be the whole knowledge base), so a miss costs one result's
+    budget, not two; the precise output is kept only when semantic search finds nothing.
+    """
+    inner = precise.coroutine
+    if inner is None:
+        return precise
+
+    async def precise_then_semantic(*args, **kwargs):
+        result = await inner(*args, **kwargs)
+        text = _content(result)
+        query = kwargs.get("query", "")
+        if not query.strip() or not semantic_fallback_enabled.get() or is_confident_match(text, min_score):
+            return result
+
+        logger.info(f"↪️ {precise.name} had no confident match, falling back to {semantic.name}")
+        metrics.incr(f"tools.{precise.name}.semantic_fallback")
+        semantic_text = _content(await semantic.ainvoke({"query": query}))
+        if not semantic_text.strip() or semantic_text.startswith(("No relevant documents", "Error")):
+            return result
+        fallback = f"[{semantic.name} fallback]\n{semantic_text}"
+        return (fallback, None) if precise.response_format == "content_and_artifact" else fallback
+
+    return precise.model_copy(update={"coroutine": precise_then_semantic})
+
+
+def apply_retrieval_fallback(tools: list[BaseTool], min_score: float = 0.75) -> list[BaseTool]:
+    by_name = {t.name: t for t in tools}
+    if "get_qa_data" not in by_name or "vectordb_query" not in by_name:
+        return tools
+    wrapped = with_semantic_fallback(by_name["get_qa_data"], by_name["vectordb_query"], min_score)
+    return [wrapped if t.name == "get_qa_data" else t for t in tools]
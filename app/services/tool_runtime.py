@@ -0,0 +1,88 @@
+import time
+import asyncio
+import logging
+from contextvars import ContextVar
+from langchain_core.tools import BaseTool
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# (tool name, start, end, status) of every tool call made while handling the current message
+tool_trace: ContextVar[list | None] = ContextVar("tool_trace", default=None)
+
+# Tools with side effects: a timeout or a cancelled turn stops waiting for them but never aborts the write
+WRITE_TOOLS = frozenset({"create_calendar_event", "delete_calendar_event", "send_email"})
+
+
+def parse_timeouts(spec: str) -> dict[str, float]:
+    """Parse "tool:seconds,tool:seconds" (e.g. "create_calendar_event:30,vectordb_query:15")."""
+    timeouts = {}
+    for pair in filter(None, (p.strip() for p in (spec or "").split(","))):
+        name, _, seconds = pair.partition(":")
+        timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+def with_timeout(tool: BaseTool, timeout: float) -> BaseTool:
+    """
+    Copy of an async tool whose calls are bounded by `timeout` and recorded in the current trace.
+    A timeout becomes an error result for the model instead of an exception that ends the turn.
+    """
+    inner = tool.coroutine
+    if inner is None:
+        return tool
+
+    async def timed(*args, **kwargs):
+        trace = tool_trace.get()
+        start = time.perf_counter()
+        status = "ok"
+        call = inner(*args, **kwargs)
+        if tool.name in WRITE_TOOLS:
+            call = asyncio.shield(asyncio.ensure_future(call))
+        try:
+            return await asyncio.wait_for(call, timeout)
+        except asyncio.TimeoutError:
+            status = "timeout"
+            metrics.incr(f"tools.{tool.name}.timeout")
+            logger.warning(f"⏰ Tool {tool.name} timed out after {timeout:g}s")
+            message = f"Error: {tool.name} timed out after {timeout:g} seconds."
+            if tool.name in WRITE_TOOLS:
+                message += " It is still running and may complete; do not retry it."
+            return (message, None) if tool.response_format == "content_and_artifact" else message
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            end = time.perf_counter()
+            metrics.observe(f"tools.{tool.name}", end - start)
+            if trace is not None:
+                trace.append((tool.name, start, end, status))
+
+    return tool.model_copy(update={"coroutine": timed})
+
+
+def apply_timeouts(tools: list[BaseTool], default: float, overrides: dict[str, float] | None = None) -> list[BaseTool]:
+    overrides = overrides or {}
+    return [with_timeout(t, overrides.get(t.name, default)) for t in tools]
+
+
+def start_tool_trace() -> list:
+    trace = []
+    tool_trace.set(trace)
+    return trace
+
+
+def summarize_tool_trace(trace: list) -> str | None:
+    """One line per turn: each tool's offset window, the wall time and the time saved by overlapping."""
+    if not trace:
+        return None
+    origin = min(start for _, start, _, _ in trace)
+    parts = [
+        f"{name} {(start - origin) * 1000:.0f}-{(end - origin) * 1000:.0f}ms" + ("" if status == "ok" else f" [{status}]")
+        for name, start, end, status in sorted(trace, key=lambda t: t[1])
+    ]
+    wall = max(end for _, _, end, _ in trace) - origin
+    total = sum(end - start for _, start, end, _ in trace)
+    if len(trace) > 1:
+        metrics.observe("tools.overlap_saved", max(0.0, total - wall))
+    return f"{', '.join(parts)} | wall {wall * 1000:.0f}ms, sum {total * 1000:.0f}ms"
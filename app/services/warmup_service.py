@@ -0,0 +1,113 @@
+import time
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+from langchain_core.messages import HumanMessage
+from app.core.metrics import metrics
+from app.services.generation_profiles import is_ollama
+
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+
+logger = logging.getLogger(__name__)
+
+WARMUP_PROMPT = "ping"
+
+
+def local_chat_models(model) -> list["ChatOllama"]:
+    """Ollama models inside a (possibly nested) router/cascade model; hosted APIs need no warm-up."""
+    if is_ollama(model):
+        return [model]
+    found = []
+    for backend in getattr(model, "backends", {}).values():
+        found.extend(m for m in local_chat_models(backend) if m not in found)
+    return found
+
+
+class ModelWarmer:
+    """
+    Loads the Ollama chat and embedding models with a tiny request at startup, then re-pings them
+    whenever they have been idle for `ping_interval` seconds so Ollama does not unload them.
+    `ready` is set once every model answered (or failed) its warm-up. Pings carry the agent's
+    system prompt and tools so they also leave the shared prompt prefix in Ollama's cache.
+    """
+
+    def __init__(self, model, embeddings, ping_interval: float = 240.0,
+                 prefix_messages: list | None = None, tools: list | None = None):
+        self.chat_models = local_chat_models(model)
+        self.embeddings = embeddings if is_ollama(embeddings, "OllamaEmbeddings") else None
+        self.ping_interval = ping_interval
+        self.prefix_messages = prefix_messages or []
+        self.tools = tools
+        self.ready = asyncio.Event()
+        self.durations: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self.last_activity = time.monotonic()
+        self._task: asyncio.Task | None = None
+
+    def touch(self):
+        """Mark the models as used so the keep-alive loop skips its next ping."""
+        self.last_activity = time.monotonic()
+
+    async def _ping_chat(self, model: "ChatOllama"):
+        # Same num_ctx as real requests, otherwise Ollama reloads the model at the first message
+        options = {"num_predict": 1}
+        if model.num_ctx:
+            options["num_ctx"] = model.num_ctx
+        runnable = model.bind_tools(self.tools) if self.tools else model
+        await runnable.ainvoke([*self.prefix_messages, HumanMessage(content=WARMUP_PROMPT)], options=options)
+
+    async def _ping_embeddings(self):
+        await self.embeddings.aembed_query(WARMUP_PROMPT)
+
+    async def _timed(self, name: str, ping) -> None:
+        start = time.perf_counter()
+        try:
+            await ping
+        except Exception as e:
+            self.errors[name] = str(e)
+            logger.error(f"❌ Warm-up of {name} failed: {e}")
+            return
+        self.durations[name] = round(time.perf_counter() - start, 2)
+        self.errors.pop(name, None)
+        metrics.observe(f"warmup.{name}", self.durations[name])
+
+    def _pings(self) -> dict:
+        pings = {f"chat:{m.model}": self._ping_chat(m) for m in self.chat_models}
+        if self.embeddings is not None:
+            pings[f"embeddings:{self.embeddings.model}"] = self._ping_embeddings()
+        return pings
+
+    async def warm_up(self):
+        start = time.perf_counter()
+        await asyncio.gather(*(self._timed(name, ping) for name, ping in self._pings().items()))
+        self.durations["total"] = round(time.perf_counter() - start, 2)
+        self.ready.set()
+        logger.info(f"🔥 Models warmed up in {self.durations['total']:.2f}s: {self.durations}")
+
+    async def _keep_alive(self):
+        while True:
+            await asyncio.sleep(self.ping_interval / 4)
+            if time.monotonic() - self.last_activity < self.ping_interval:
+                continue
+            await asyncio.gather(*(self._timed(name, ping) for name, ping in self._pings().items()))
+            metrics.incr("warmup.keep_alive_ping")
+            self.touch()
+
+    async def _run(self):
+        await self.warm_up()
+        await self._keep_alive()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        return {"ready": self.ready.is_set(), "warmup_seconds": self.durations, "errors": self.errors}
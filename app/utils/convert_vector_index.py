@@ -0,0 +1,37 @@
+import sys
+import os
+import argparse
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(PROJECT_ROOT)
+from app.core.config import settings
+from servers.retrieval.backends import ChromaBackend, NumpyBackend, SUPPORTED_DTYPES
+
+CHROMA_COLLECTION_NAME = "documents"
+CHROMA_PERSIST_DIR = os.path.join(PROJECT_ROOT, "chroma_db")
+
+
+def convert_chroma_to_numpy(index_dir: str, dtype: str):
+    print(f"Reading Chroma collection '{CHROMA_COLLECTION_NAME}' from: '{CHROMA_PERSIST_DIR}'")
+    ids, vectors, documents = ChromaBackend(CHROMA_PERSIST_DIR, CHROMA_COLLECTION_NAME).export()
+    if not ids:
+        print("Error: The Chroma collection is empty. Run ingest_docs.py first.")
+        return
+
+    print(f"Writing {len(ids)} vector(s) of dim {vectors.shape[1]} as {dtype} to: '{index_dir}'")
+    build_dir = NumpyBackend.write(index_dir, ids, vectors, documents, dtype=dtype)
+
+    size_mb = os.path.getsize(os.path.join(build_dir, "vectors.npy")) / 1024 / 1024
+    print("-" * 50)
+    print("✅ Conversion Complete!")
+    print(f"Vector matrix size: {size_mb:.2f} MB")
+    print("Set VECTOR_BACKEND=numpy to serve queries from this index.")
+    print("-" * 50)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert the Chroma collection into a memory-mapped NumPy index.")
+    parser.add_argument("--index-dir", default=settings.VECTOR_INDEX_DIR)
+    parser.add_argument("--dtype", default=settings.VECTOR_INDEX_DTYPE, choices=SUPPORTED_DTYPES)
+    args = parser.parse_args()
+    convert_chroma_to_numpy(args.index_dir, args.dtype)
@@ -1,5 +1,6 @@
 import sys
 import os
+import hashlib
 import pandas as pd
 
 from langchain_community.document_loaders import DirectoryLoader, PyPDFLoader
@@ -7,17 +8,22 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import Chroma
 from langchain_ollama import OllamaEmbeddings
 from langchain.schema import Document
+from sqlalchemy import create_engine
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.append(PROJECT_ROOT)
 from app.core.config import settings
+from app.utils.ingest_tables import store_excel
+from servers.retrieval.lexical import BM25Index
+from servers.retrieval.backends import NumpyBackend
 
 CHROMA_COLLECTION_NAME = "documents"
 CHROMA_PERSIST_DIR = os.path.join(PROJECT_ROOT, "chroma_db")
+LEXICAL_INDEX_PATH = os.path.join(CHROMA_PERSIST_DIR, "lexical_index.json")
 #CHROMA_PERSIST_DIR = "/mnt/c/Users/aiai/Documents/Development/Projects/chatbot-wwm/chroma_db"
 
-def load_excel(file_path: str):
-    df = pd.read_excel(file_path)
+def load_excel(file_path: str, df: pd.DataFrame | None = None):
+    df = pd.read_excel(file_path) if df is None else df
     documents = []
 
     for idx, row in df.iterrows():
@@ -28,6 +34,16 @@ def load_excel(file_path: str):
     return documents
 
 
+def chunk_id_for(doc: Document) -> str:
+    """Stable id from a chunk's source and content, so re-ingests line up with stored vectors."""
+    key = "\x1f".join([
+        str(doc.metadata.get("source", "")),
+        str(doc.metadata.get("page", doc.metadata.get("row", ""))),
+        doc.page_content,
+    ])
+    return "chunk-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
 def ingest_documents():
     print("Starting document ingestion process...")
 
@@ -55,10 +71,15 @@ def ingest_documents():
     # Load Excels
     print(f"Loading Excel documents from: {documents_path}")
     excel_files = [f for f in os.listdir(documents_path) if f.endswith((".xlsx", ".xls"))]
+    tabular_engine = create_engine(settings.TABULAR_DATABASE_URL, future=True)
     for file in excel_files:
         file_path = os.path.join(documents_path, file)
-        excel_documents = load_excel(file_path)
-        all_documents.extend(excel_documents)
+        sheets = pd.read_excel(file_path, sheet_name=None)
+        for df in sheets.values():
+            excel_documents = load_excel(file_path, df)
+            all_documents.extend(excel_documents)
+        # Also keep the spreadsheet as typed SQL tables for exact tabular queries
+        store_excel(tabular_engine, file_path, sheets)
     print(f"Loaded {len(excel_files)} Excel file(s).")
 
     if not all_documents:
@@ -71,22 +92,56 @@ def ingest_documents():
     docs = text_splitter.split_documents(all_documents)
     print(f"Documents split into {len(docs)} text chunks.")
 
+    # Shared content-hash ids let dense and lexical results be fused per chunk
+    unique_docs = {}
+    for doc in docs:
+        unique_docs.setdefault(chunk_id_for(doc), doc)
+    ids = list(unique_docs)
+    docs = list(unique_docs.values())
+    for chunk_id, doc in zip(ids, docs):
+        doc.metadata["chunk_id"] = chunk_id
+
     embedding_function = OllamaEmbeddings(model=settings.OLLAMA_EMBEDDING)
     print("Using BGE-M3 embeddings...")
 
-    print(f"Storing data in Chroma collection: '{CHROMA_COLLECTION_NAME}'...")
-    
-    vectordb = Chroma.from_documents(
-        docs,
-        embedding=embedding_function,
-        collection_name=CHROMA_COLLECTION_NAME,
-        persist_directory=CHROMA_PERSIST_DIR
-    )
+    chunk_documents = [
+        {"id": chunk_id, "text": doc.page_content, "metadata": doc.metadata}
+        for chunk_id, doc in zip(ids, docs)
+    ]
+
+    if settings.VECTOR_BACKEND == "numpy":
+        print(f"Storing data in NumPy index ({settings.VECTOR_INDEX_DTYPE}): '{settings.VECTOR_INDEX_DIR}'...")
+        vectors = embedding_function.embed_documents([doc.page_content for doc in docs])
+        NumpyBackend.write(settings.VECTOR_INDEX_DIR, ids, vectors, chunk_documents, dtype=settings.VECTOR_INDEX_DTYPE)
+    else:
+        print(f"Storing data in Chroma collection: '{CHROMA_COLLECTION_NAME}'...")
+        vectordb = Chroma(
+            collection_name=CHROMA_COLLECTION_NAME,
+            embedding_function=embedding_function,
+            persist_directory=CHROMA_PERSIST_DIR
+        )
+        # Drop chunks that no longer exist so Chroma matches the lexical index
+        existing_ids = set(vectordb.get(include=[])["ids"])
+        stale_ids = list(existing_ids - set(ids))
+        if stale_ids:
+            vectordb.delete(ids=stale_ids)
+        print(f"Removed {len(stale_ids)} stale chunk(s) from Chroma.")
+        new_chunks = [(chunk_id, doc) for chunk_id, doc in zip(ids, docs) if chunk_id not in existing_ids]
+        if new_chunks:
+            vectordb.add_documents([doc for _, doc in new_chunks], ids=[chunk_id for chunk_id, _ in new_chunks])
+        print(f"Embedded {len(new_chunks)} new chunk(s); {len(ids) - len(new_chunks)} unchanged.")
+
+    print(f"Building lexical (BM25) index at: '{LEXICAL_INDEX_PATH}'...")
+    os.makedirs(CHROMA_PERSIST_DIR, exist_ok=True)
+    BM25Index.build(chunk_documents).save(LEXICAL_INDEX_PATH)
 
     print("-" * 50)
     print("✅ Ingestion Complete!")
-    print(f"Data stored in Chroma collection: '{CHROMA_COLLECTION_NAME}'")
-    print(f"Persist directory: '{CHROMA_PERSIST_DIR}'")
+    if settings.VECTOR_BACKEND == "numpy":
+        print(f"Data stored in NumPy index: '{settings.VECTOR_INDEX_DIR}'")
+    else:
+        print(f"Data stored in Chroma collection: '{CHROMA_COLLECTION_NAME}'")
+        print(f"Persist directory: '{CHROMA_PERSIST_DIR}'")
     print("-" * 50)
 
 
@@ -0,0 +1,145 @@
+import sys
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+
+from sqlalchemy import create_engine, inspect, text, Index, MetaData, Table, Column, String, Integer, Text
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(PROJECT_ROOT)
+from app.core.config import settings
+
+CATALOG_TABLE_NAME = "tabular_catalog"
+# Postgres truncates identifiers longer than this, which can make two index names collide
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def normalize_identifier(name: str) -> str:
+    """Turn a sheet/column label such as 'Kode Lokasi' into a SQL-safe 'kode_lokasi'."""
+    cleaned = re.sub(r"[^0-9a-zA-Z]+", "_", str(name)).strip("_").lower()
+    if not cleaned:
+        cleaned = "col"
+    if cleaned[0].isdigit():
+        cleaned = f"c_{cleaned}"
+    return cleaned
+
+
+def table_name_for(file_path: str, sheet_name: str | None = None) -> str:
+    base = normalize_identifier(os.path.splitext(os.path.basename(file_path))[0])
+    return f"{base}_{normalize_identifier(sheet_name)}" if sheet_name else base
+
+
+def index_name_for(table_name: str, column: str) -> str:
+    """`ix_<table>_<column>`, shortened with a hash suffix when it exceeds the identifier limit."""
+    name = f"ix_{table_name}_{column}"
+    if len(name) <= MAX_IDENTIFIER_LENGTH:
+        return name
+    digest = hashlib.md5(name.encode("utf-8")).hexdigest()[:8]
+    return f"{name[:MAX_IDENTIFIER_LENGTH - 9]}_{digest}"
+
+
+def get_catalog_table(metadata: MetaData) -> Table:
+    return Table(
+        CATALOG_TABLE_NAME,
+        metadata,
+        Column("table_name", String, primary_key=True),
+        Column("source", String, nullable=False),
+        Column("sheet", String, nullable=True),
+        Column("columns", Text, nullable=False),
+        Column("row_count", Integer, nullable=False),
+        Column("content_hash", String, nullable=True),
+    )
+
+
+def create_catalog(engine, catalog: Table):
+    """Create the catalog table, adding columns introduced after it was first created."""
+    catalog.create(engine, checkfirst=True)
+    existing = {c["name"] for c in inspect(engine).get_columns(CATALOG_TABLE_NAME)}
+    with engine.begin() as conn:
+        for column in catalog.columns:
+            if column.name not in existing:
+                conn.execute(text(
+                    f"ALTER TABLE {CATALOG_TABLE_NAME} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                ))
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Hash of the cell values, so re-ingesting edited data with the same shape still changes the catalog."""
+    hashed = pd.util.hash_pandas_object(df, index=False).values.tobytes()
+    return hashlib.md5(hashed + "\x1f".join(map(str, df.columns)).encode("utf-8")).hexdigest()
+
+
+def store_dataframe(engine, df: pd.DataFrame, table_name: str, source: str, sheet: str | None = None) -> int:
+    """
+    Write a spreadsheet as a typed SQL table, index its text columns and record it in the catalog.
+    Existing tables with the same name are replaced so re-ingesting stays idempotent.
+    """
+    df = df.dropna(how="all")
+    column_map = {}
+    for col in df.columns:
+        normalized = normalize_identifier(col)
+        while normalized in column_map.values():
+            normalized = f"{normalized}_"
+        column_map[col] = normalized
+    df = df.rename(columns=column_map)
+
+    df.to_sql(table_name, engine, if_exists="replace", index=False)
+
+    metadata = MetaData()
+    table = Table(table_name, metadata, autoload_with=engine)
+    for col in df.columns:
+        if df[col].dtype == object:
+            Index(index_name_for(table_name, col), table.c[col]).create(engine, checkfirst=True)
+
+    catalog = get_catalog_table(metadata)
+    create_catalog(engine, catalog)
+    with engine.begin() as conn:
+        conn.execute(catalog.delete().where(catalog.c.table_name == table_name))
+        conn.execute(
+            catalog.insert().values(
+                table_name=table_name,
+                source=os.path.basename(source),
+                sheet=sheet,
+                columns=json.dumps({v: str(k) for k, v in column_map.items()}, ensure_ascii=False),
+                row_count=len(df),
+                content_hash=content_hash(df),
+            )
+        )
+    return len(df)
+
+
+def store_excel(engine, file_path: str, sheets: dict[str, pd.DataFrame] | None = None) -> list[str]:
+    """Load every sheet of an Excel file into its own table. Returns the created table names."""
+    sheets = sheets if sheets is not None else pd.read_excel(file_path, sheet_name=None)
+    created = []
+    for sheet_name, df in sheets.items():
+        table_name = table_name_for(file_path, sheet_name if len(sheets) > 1 else None)
+        rows = store_dataframe(engine, df, table_name, file_path, sheet_name)
+        print(f"📊 Stored {rows} row(s) from '{os.path.basename(file_path)}' [{sheet_name}] into table '{table_name}'")
+        created.append(table_name)
+    return created
+
+
+def ingest_tables():
+    print("Starting tabular ingestion process...")
+
+    documents_path = os.path.join(PROJECT_ROOT, 'data', 'docs')
+    excel_files = [f for f in os.listdir(documents_path) if f.endswith((".xlsx", ".xls"))]
+    if not excel_files:
+        print(f"No Excel files found in '{documents_path}'.")
+        return
+
+    engine = create_engine(settings.TABULAR_DATABASE_URL, future=True)
+    for file in excel_files:
+        store_excel(engine, os.path.join(documents_path, file))
+
+    print("-" * 50)
+    print("✅ Tabular Ingestion Complete!")
+    print(f"Tables: {', '.join(t for t in inspect(engine).get_table_names() if t != CATALOG_TABLE_NAME)}")
+    print("-" * 50)
+
+
+if __name__ == '__main__':
+    ingest_tables()
@@ -1,7 +1,12 @@
+import time
 import uvicorn
 import logging
-from app import create_app
-from app.core.config import settings
+
+import_start = time.perf_counter()
+from app import create_app  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.metrics import metrics  # noqa: E402
+metrics.observe("startup.imports", time.perf_counter() - import_start)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,6 +17,7 @@ logging.basicConfig(
 logger = logging.getLogger("main")
 
 app = create_app()
+logger.info(f"⏱ App modules imported in {metrics.timings['startup.imports'][-1]:.2f}s")
 
 if __name__ == "__main__":
     logger.info("🚀 Starting WhatsApp Chatbot with Ollama and MCP...")
@@ -4,12 +4,70 @@ import json
 import logging
 from mcp.server.fastmcp import FastMCP
 
+from retrieval.lexical import BM25Index, tokenize
+from retrieval.formatting import DEFAULT_OUTPUT_FORMAT, DEFAULT_MAX_CHARS, compact_json, fit_items, truncate_text
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 mcp = FastMCP(name="QA_Server")
 
+KB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "json", "data.json")
+QA_MIN_MATCH = float(os.getenv("QA_MIN_MATCH", 0.5))
+NO_INFO_MESSAGE = "Maaf, saya tidak memiliki informasi mengenai hal tersebut."
+
+_kb_cache: dict = {"mtime": None, "items": None, "index": None}
+
+
+def load_kb() -> tuple[list[dict], BM25Index]:
+    """Read the knowledge base and build its BM25 index, reusing both until the file changes."""
+    mtime = os.path.getmtime(KB_PATH)
+    if _kb_cache["mtime"] != mtime:
+        logging.info(f"Attempting to read knowledge base from: {KB_PATH}")
+        with open(KB_PATH, "r", encoding="utf-8") as f:
+            kb_data = json.load(f)
+
+        if not isinstance(kb_data, list):
+            kb_data = [kb_data]
+        items = []
+        for i, item in enumerate(kb_data, 1):
+            if isinstance(item, dict):
+                items.append({"q": item.get("question", "Unknown question"), "a": item.get("answer", "Unknown answer")})
+            else:
+                items.append({"q": f"Item {i}", "a": str(item)})
+
+        _kb_cache["items"] = items
+        _kb_cache["index"] = BM25Index.build([
+            {"id": str(i), "text": f"{item['q']} {item['q']} {item['a']}", "metadata": {}}
+            for i, item in enumerate(items)
+        ])
+        _kb_cache["mtime"] = mtime
+    return _kb_cache["items"], _kb_cache["index"]
+
+
+def match_kb(query: str, top_k: int) -> list[dict]:
+    """Rank Q&A pairs for the query; `score` is the share of query terms found in the pair."""
+    items, index = load_kb()
+    query_terms = set(tokenize(query))
+    if not query_terms:
+        return []
+    matches = []
+    for doc, _bm25 in index.search(query, k=top_k):
+        item = items[int(doc["id"])]
+        coverage = len(query_terms & set(tokenize(f"{item['q']} {item['a']}"))) / len(query_terms)
+        if coverage >= QA_MIN_MATCH:
+            matches.append({**item, "score": round(coverage, 2)})
+    return matches
+
+
+def with_rest_of_kb(matches: list[dict], items: list[dict]) -> list[dict]:
+    """Matched pairs first (with scores), then every other pair of the knowledge base."""
+    matched = {m["q"] for m in matches}
+    return matches + [item for item in items if item["q"] not in matched]
+
+
 @mcp.tool()
-def get_qa_data() -> str:
+def get_qa_data(query: str = "", top_k: int = 3, output_format: str = DEFAULT_OUTPUT_FORMAT,
+                max_chars: int = DEFAULT_MAX_CHARS) -> str:
     """
     Retrieve exact answers to predefined company policy questions from a static knowledge base.
     Use this tool ONLY when the user asks about specific company policies, procedures, or rules that are likely listed in our HR handbook.
@@ -20,40 +78,48 @@ def get_qa_data() -> str:
     - "Can I work remotely?"
     - "What's the expense reporting process?"
 
-    This tool does NOT perform semantic search. It returns exact matches from a fixed list of Q&A pairs.
-    If the question matches one of the known questions, return the precise answer.
-    If no match is found, return "Maaf, saya tidak memiliki informasi mengenai hal tersebut."
+    This tool does NOT perform semantic search. It returns the best keyword matches from a fixed list of Q&A pairs.
+    When the whole knowledge base fits in max_chars it is returned with the matches first; when no pair
+    matches the query's words (e.g. an English question against Indonesian pairs) every pair is returned
+    without scores so the answer can still be picked from them.
+
+    Args:
+        query: The user's question. When empty, the whole knowledge base is returned (never truncated).
+        top_k: Maximum number of scored Q&A pairs to return (default: 3).
+        output_format: "compact" (JSON {"matches": [{"q", "a", "score"}]}) or "text" (Q/A lines).
+        max_chars: Upper bound on the size of the returned text for non-empty queries.
 
     Returns:
-        A formatted string with the answer, or an error message if file is missing or malformed.
+        The Q&A pairs, the no-information message when the knowledge base is empty, or an error message
+        if file is missing or malformed.
     """
     try:
-        kb_path = os.path.join(os.path.dirname(__file__), "..", "data", "json", "data.json")
-        logging.info(f"Attempting to read knowledge base from: {kb_path}")
-        
-        with open(kb_path, "r", encoding="utf-8") as f:
-            kb_data = json.load(f)
-
-        kb_text = "The following knowledge base was found:\n\n"
+        items, _ = load_kb()
+        if not items:
+            return NO_INFO_MESSAGE
 
-        if isinstance(kb_data, list):
-            for i, item in enumerate(kb_data, 1):
-                if isinstance(item, dict):
-                    question = item.get("question", "Unknown question")
-                    answer = item.get("answer", "Unknown answer")
-                else:
-                    question = f"Item {i}"
-                    answer = str(item)
-
-                kb_text += f"Q{i}: {question}\n"
-                kb_text += f"A{i}: {answer}\n\n"
+        if not query.strip():
+            pairs, max_chars = items, None
         else:
-            kb_text += f"Knowledge base content: {json.dumps(kb_data, indent=2, ensure_ascii=False)}\n\n"
+            matches = match_kb(query, top_k)
+            pairs = with_rest_of_kb(matches, items)
+            if not matches:
+                logging.info(f"Low keyword coverage for query: '{query}', returning the whole knowledge base")
+            elif max_chars and len(compact_json({"matches": pairs})) > max_chars:
+                pairs = matches
 
-        return kb_text
+        if output_format == "compact":
+            return compact_json({"matches": fit_items(pairs, max_chars, text_key="a") if max_chars else pairs})
+
+        kb_text = "The following knowledge base was found:\n\n"
+        for i, pair in enumerate(pairs, 1):
+            kb_text += f"Q{i}: {pair['q']}\n"
+            kb_text += f"A{i}: {pair['a']}\n\n"
+
+        return truncate_text(kb_text, max_chars) if max_chars else kb_text
         
     except FileNotFoundError:
-        logging.error(f"Knowledge base file not found at path: {kb_path}")
+        logging.error(f"Knowledge base file not found at path: {KB_PATH}")
         return "Error: The knowledge base file was not found."
     except json.JSONDecodeError:
         logging.error("Failed to decode JSON from the knowledge base file.")
@@ -62,6 +128,11 @@ def get_qa_data() -> str:
         logging.error(f"An unexpected error occurred: {e}", exc_info=True)
         return f"Error: An unexpected error occurred - {str(e)}"
 
+@mcp.tool()
+def qa_data_version() -> str:
+    """Version of the knowledge base (changes whenever data.json is modified). Used for cache invalidation."""
+    return str(os.path.getmtime(KB_PATH)) if os.path.exists(KB_PATH) else "missing"
+
 if __name__ == "__main__":
     logging.info("Starting FastMCP server with stdio transport...")
     mcp.run(transport="stdio")
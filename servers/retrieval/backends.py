@@ -0,0 +1,193 @@
+import os
+import json
+import shutil
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+
+import numpy as np
+from langchain_core.documents import Document
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+SEARCH_CHUNK_ROWS = 16384
+# File in the index directory naming the build subdirectory readers should open
+INDEX_POINTER = "CURRENT"
+KEEP_BUILDS = 2
+
+
+class VectorBackend(ABC):
+    """Minimal interface the retrieval code needs from a vector store. Vectors are passed in, never embedded here."""
+
+    name = "base"
+
+    @abstractmethod
+    def search_by_vector(self, vector: list[float], k: int) -> list[tuple[Document, float]]:
+        ...
+
+    def search_by_vectors(self, vectors: list[list[float]], k: int) -> list[list[tuple[Document, float]]]:
+        return [self.search_by_vector(vector, k) for vector in vectors]
+
+    @abstractmethod
+    def get_vectors(self, ids: list[str]) -> dict[str, np.ndarray]:
+        ...
+
+
+class ChromaBackend(VectorBackend):
+    name = "chroma"
+
+    def __init__(self, persist_dir: str, collection_name: str, embedding_function=None):
+        from langchain_community.vectorstores import Chroma
+
+        self.store = Chroma(
+            collection_name=collection_name,
+            persist_directory=persist_dir,
+            embedding_function=embedding_function,
+        )
+
+    def search_by_vector(self, vector, k):
+        return self.store.similarity_search_by_vector_with_relevance_scores(vector, k=k)
+
+    def get_vectors(self, ids):
+        stored = self.store.get(ids=ids, include=["embeddings"])
+        return {doc_id: np.asarray(vec, dtype=np.float32) for doc_id, vec in zip(stored["ids"], stored["embeddings"])}
+
+    def export(self) -> tuple[list[str], np.ndarray, list[dict]]:
+        """Dump ids, embeddings and documents for conversion to another backend."""
+        stored = self.store.get(include=["embeddings", "documents", "metadatas"])
+        documents = [
+            {"id": doc_id, "text": text, "metadata": metadata or {}}
+            for doc_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        ]
+        return stored["ids"], np.asarray(stored["embeddings"], dtype=np.float32), documents
+
+
+class NumpyBackend(VectorBackend):
+    """
+    Flat cosine index: L2-normalized vectors in a memory-mapped .npy matrix (float32/float16, or int8
+    with per-row scales), searched with chunked matrix-vector products and argpartition top-k.
+    Each build lives in its own subdirectory of `index_dir`, named by the CURRENT pointer file.
+    """
+
+    name = "numpy"
+
+    def __init__(self, index_dir: str):
+        # Resolve the pointer once, so every file below comes from the same build
+        build_dir = self.current_build(index_dir)
+        self.build_dir = build_dir
+        with open(os.path.join(build_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(build_dir, "documents.json"), "r", encoding="utf-8") as f:
+            self.documents = json.load(f)
+        self.matrix = np.load(os.path.join(build_dir, "vectors.npy"), mmap_mode="r")
+        scales_path = os.path.join(build_dir, "scales.npy")
+        self.scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        self.row_by_id = {doc["id"]: i for i, doc in enumerate(self.documents)}
+        logging.info(
+            f"Opened NumPy vector index '{build_dir}' "
+            f"({self.matrix.shape[0]} x {self.matrix.shape[1]}, {self.meta['dtype']})"
+        )
+
+    @staticmethod
+    def current_build(index_dir: str) -> str:
+        """The build directory the pointer names; `index_dir` itself for indexes written before builds existed."""
+        try:
+            with open(os.path.join(index_dir, INDEX_POINTER), "r", encoding="utf-8") as f:
+                return os.path.join(index_dir, f.read().strip())
+        except FileNotFoundError:
+            return index_dir
+
+    @staticmethod
+    def write(index_dir: str, ids: list[str], vectors, documents: list[dict], dtype: str = "float16") -> str:
+        """
+        Write the index into a new build subdirectory, then switch the CURRENT pointer to it with one
+        os.replace. Readers see either the old build or the new one, never a mix; the previous build is
+        kept for readers that resolved the pointer just before the switch. Returns the build directory.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype '{dtype}'. Use one of: {', '.join(SUPPORTED_DTYPES)}")
+        os.makedirs(index_dir, exist_ok=True)
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        scales = None
+        if dtype == "int8":
+            scales = np.maximum(np.abs(matrix).max(axis=1), 1e-12) / 127.0
+            matrix = np.round(matrix / scales[:, None]).astype(np.int8)
+        else:
+            matrix = matrix.astype(dtype)
+
+        build_dir = tempfile.mkdtemp(prefix="build-", dir=index_dir)
+        np.save(os.path.join(build_dir, "vectors.npy"), matrix)
+        if scales is not None:
+            np.save(os.path.join(build_dir, "scales.npy"), scales.astype(np.float32))
+        with open(os.path.join(build_dir, "documents.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                [{"id": doc_id, "text": d["text"], "metadata": d.get("metadata", {})} for doc_id, d in zip(ids, documents)],
+                f, ensure_ascii=False, default=str,
+            )
+        with open(os.path.join(build_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"dtype": dtype, "count": int(matrix.shape[0]), "dim": int(matrix.shape[1])}, f)
+
+        pointer_tmp = os.path.join(build_dir, INDEX_POINTER)
+        with open(pointer_tmp, "w", encoding="utf-8") as f:
+            f.write(os.path.basename(build_dir))
+        os.replace(pointer_tmp, os.path.join(index_dir, INDEX_POINTER))
+
+        builds = sorted(
+            (e for e in os.scandir(index_dir) if e.is_dir() and e.name.startswith("build-")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        for entry in builds[:-KEEP_BUILDS]:
+            if entry.path != build_dir:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        return build_dir
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine scores for (n_queries, dim) normalized queries against every row, chunked to bound RAM."""
+        scores = np.empty((queries.shape[0], self.matrix.shape[0]), dtype=np.float32)
+        for start in range(0, self.matrix.shape[0], SEARCH_CHUNK_ROWS):
+            block = np.asarray(self.matrix[start:start + SEARCH_CHUNK_ROWS], dtype=np.float32)
+            scores[:, start:start + len(block)] = queries @ block.T
+        if self.scales is not None:
+            scores *= self.scales[None, :]
+        return scores
+
+    def _to_results(self, row_scores: np.ndarray, k: int) -> list[tuple[Document, float]]:
+        k = min(k, len(row_scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-row_scores, k - 1)[:k]
+        top = top[np.argsort(-row_scores[top])]
+        return [
+            (Document(page_content=self.documents[i]["text"], metadata=self.documents[i]["metadata"]), float(row_scores[i]))
+            for i in top
+        ]
+
+    def search_by_vectors(self, vectors, k):
+        queries = np.asarray(vectors, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = self._scores(queries)
+        return [self._to_results(row, k) for row in scores]
+
+    def search_by_vector(self, vector, k):
+        return self.search_by_vectors([vector], k)[0]
+
+    def get_vectors(self, ids):
+        vectors = {}
+        for doc_id in ids:
+            row = self.row_by_id.get(doc_id)
+            if row is None:
+                continue
+            vec = np.asarray(self.matrix[row], dtype=np.float32)
+            vectors[doc_id] = vec * self.scales[row] if self.scales is not None else vec
+        return vectors
+
+
+def create_backend(name: str, *, chroma_dir: str, collection_name: str, index_dir: str,
+                   embedding_function=None) -> VectorBackend:
+    if name == "chroma":
+        return ChromaBackend(chroma_dir, collection_name, embedding_function)
+    elif name == "numpy":
+        return NumpyBackend(index_dir)
+    else:
+        raise ValueError(f"Unknown vector backend: {name}")
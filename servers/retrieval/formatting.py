@@ -0,0 +1,71 @@
+import json
+import os
+
+from .lexical import tokenize
+
+OUTPUT_FORMATS = ("compact", "text")
+DEFAULT_OUTPUT_FORMAT = os.getenv("TOOL_OUTPUT_FORMAT", "compact")
+DEFAULT_MAX_CHARS = int(os.getenv("TOOL_OUTPUT_MAX_CHARS", 2000))
+DEFAULT_SNIPPET_CHARS = int(os.getenv("TOOL_SNIPPET_CHARS", 400))
+
+
+def compact_json(payload) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def trim_snippet(text: str, query: str, max_len: int = DEFAULT_SNIPPET_CHARS) -> str:
+    """Keep the `max_len` window of `text` that contains the most query terms, marking cuts with '…'."""
+    text = " ".join(text.split())
+    if len(text) <= max_len:
+        return text
+
+    lowered = text.lower()
+    positions = sorted(
+        pos for term in set(tokenize(query)) if len(term) > 2
+        for pos in _find_all(lowered, term)
+    )
+    best_start, best_hits = 0, 0
+    for i, start in enumerate(positions):
+        hits = sum(1 for pos in positions[i:] if pos < start + max_len)
+        if hits > best_hits:
+            best_start, best_hits = start, hits
+
+    # Center the window a little before the first match so the sentence start stays visible
+    start = max(0, min(best_start - max_len // 5, len(text) - max_len))
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if 0 <= space < start + 30 else start
+    snippet = text[start:start + max_len].rstrip()
+    return ("…" if start > 0 else "") + snippet + ("…" if start + max_len < len(text) else "")
+
+
+def _find_all(text: str, term: str):
+    pos = text.find(term)
+    while pos != -1:
+        yield pos
+        pos = text.find(term, pos + 1)
+
+
+def fit_items(items: list[dict], max_chars: int, text_key: str = "text", wrapper_chars: int = 20) -> list[dict]:
+    """
+    Keep items (in rank order) until their compact JSON reaches `max_chars`; the last item that does
+    not fit entirely has its text shortened instead of being dropped when there is useful room left.
+    """
+    kept, used = [], wrapper_chars
+    for item in items:
+        size = len(compact_json(item)) + 1
+        if used + size <= max_chars:
+            kept.append(item)
+            used += size
+            continue
+        room = max_chars - used - (size - len(str(item.get(text_key, ""))))
+        if room > 80 and text_key in item:
+            kept.append({**item, text_key: str(item[text_key])[:room - 1].rstrip() + "…"})
+        break
+    return kept
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars - 20].rstrip() + "\n…[truncated]"
@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def reciprocal_rank_fusion(ranked_lists: list[list[str]], weights: list[float] | None = None,
+                           k: int = 60) -> list[tuple[str, float]]:
+    """Weighted RRF: score(d) = sum_i w_i / (k + rank_i(d)), ranks starting at 1."""
+    weights = weights or [1.0] * len(ranked_lists)
+    scores: dict[str, float] = {}
+    for ranked, weight in zip(ranked_lists, weights):
+        for rank, doc_id in enumerate(ranked, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def mmr(query_vector: np.ndarray, candidate_vectors: np.ndarray, k: int, lambda_mult: float = 0.5) -> list[int]:
+    """Maximal marginal relevance over L2-normalized vectors. Returns candidate row indices."""
+    if len(candidate_vectors) == 0:
+        return []
+    q = query_vector / (np.linalg.norm(query_vector) or 1.0)
+    c = candidate_vectors / np.maximum(np.linalg.norm(candidate_vectors, axis=1, keepdims=True), 1e-12)
+    relevance = c @ q
+    pairwise = c @ c.T
+
+    selected = [int(np.argmax(relevance))]
+    max_sim = pairwise[selected[0]].copy()
+    while len(selected) < min(k, len(c)):
+        score = lambda_mult * relevance - (1 - lambda_mult) * max_sim
+        score[selected] = -np.inf
+        nxt = int(np.argmax(score))
+        selected.append(nxt)
+        max_sim = np.maximum(max_sim, pairwise[nxt])
+    return selected
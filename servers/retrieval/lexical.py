@@ -0,0 +1,93 @@
+import json
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+# Keeps catalog codes ("A-001"), sizes ("4.5") and dotted names together as one token
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+(?:[-./][0-9a-z]+)*")
+STOPWORDS = {
+    "yang", "dan", "di", "ke", "dari", "untuk", "dengan", "ini", "itu", "atau", "pada", "adalah",
+    "apa", "apakah", "bagaimana", "berapa", "saya", "kami", "kita", "the", "a", "an", "of", "to",
+    "in", "is", "are", "and", "or", "for", "what", "how", "do", "does",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens; compound tokens also emit their parts so "a-001" matches "A 001"."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        parts = re.split(r"[-./]", token)
+        if len(parts) > 1:
+            tokens.extend(p for p in parts if p and p not in STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index, persisted as JSON next to the vector collection."""
+
+    def __init__(self, documents: list[dict], postings: dict[str, list[list[int]]], lengths: list[int],
+                 k1: float = 1.5, b: float = 0.75):
+        self.documents = documents
+        self.postings = postings
+        self.lengths = np.asarray(lengths, dtype=np.float32)
+        self.avgdl = float(self.lengths.mean()) if len(lengths) else 0.0
+        self.k1 = k1
+        self.b = b
+        n = len(documents)
+        self.idf = {
+            term: math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5))
+            for term, plist in postings.items()
+        }
+
+    @classmethod
+    def build(cls, documents: list[dict], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """`documents` are {"id", "text", "metadata"} dicts, in the same id space as the vector store."""
+        postings: dict[str, list[list[int]]] = {}
+        lengths = []
+        for idx, doc in enumerate(documents):
+            counts = Counter(tokenize(doc["text"]))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                postings.setdefault(term, []).append([idx, tf])
+        return cls(documents, postings, lengths, k1, b)
+
+    def search(self, query: str, k: int = 10) -> list[tuple[dict, float]]:
+        if not self.documents:
+            return []
+        scores = np.zeros(len(self.documents), dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * self.lengths / (self.avgdl or 1.0))
+        for term in set(tokenize(query)):
+            plist = self.postings.get(term)
+            if not plist:
+                continue
+            arr = np.asarray(plist, dtype=np.int64)
+            idx, tf = arr[:, 0], arr[:, 1].astype(np.float32)
+            scores[idx] += self.idf[term] * tf * (self.k1 + 1) / (tf + norm[idx])
+
+        k = min(k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.documents[i], float(scores[i])) for i in top]
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "documents": self.documents,
+                "postings": self.postings,
+                "lengths": self.lengths.astype(int).tolist(),
+            }, f, ensure_ascii=False, default=str)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["documents"], data["postings"], data["lengths"], data.get("k1", 1.5), data.get("b", 0.75))
@@ -119,7 +119,10 @@ def get_current_datetime() -> dict:
 
 @mcp.tool()
 def create_calendar_event(title: str, start_time: str, end_time: str, attendees: list[str] | None = None) -> dict:
-    """Create Google Calendar event and auto-send invitations."""
+    """
+    Create Google Calendar event and auto-send invitations.
+    Returns the event id, summary, start, end, attendees and Meet/calendar links.
+    """
     global _last_event
     try:
         service = get_gcal_service()
@@ -162,6 +165,9 @@ def create_calendar_event(title: str, start_time: str, end_time: str, attendees:
         return {
             "success": True,
             "event_id": created_event.get("id"),
+            "summary": created_event.get("summary", title),
+            "start": created_event.get("start", {}).get("dateTime", start_time),
+            "end": created_event.get("end", {}).get("dateTime", end_time),
             "event_link": event_link,
             "meeting_link": meeting_link,
             "attendees": attendees or [],
@@ -185,16 +191,26 @@ def delete_calendar_event(event_id: str) -> dict:
     """
     Delete a Google Calendar event.
     User must provide event_id.
+    Returns the deleted event's summary, start, end and attendees.
     """
     try:
         if not event_id:
             return {"success": False, "error": "Event ID is required for deletion."}
 
         service = get_gcal_service()
+        # Fetch details first so the caller can confirm what was deleted
+        event = service.events().get(calendarId="primary", eventId=event_id).execute()
         service.events().delete(calendarId="primary", eventId=event_id, sendUpdates="all").execute()
 
         log.info("Deleted event %s", event_id)
-        return {"success": True, "deleted_event_id": event_id}
+        return {
+            "success": True,
+            "deleted_event_id": event_id,
+            "summary": event.get("summary"),
+            "start": event.get("start", {}).get("dateTime") or event.get("start", {}).get("date"),
+            "end": event.get("end", {}).get("dateTime") or event.get("end", {}).get("date"),
+            "attendees": [a.get("email") for a in event.get("attendees", []) if a.get("email")],
+        }
 
     except Exception as e:
         log.error("delete_calendar_event error: %s", e, exc_info=True)
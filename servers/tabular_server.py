@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+from sqlalchemy import create_engine, inspect, MetaData, Table, select, func, and_
+from dotenv import load_dotenv
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROJECT_ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+load_dotenv(os.path.join(PROJECT_ROOT_PATH, '.env'))
+
+TABULAR_DATABASE_URL = os.getenv(
+    "TABULAR_DATABASE_URL", f"sqlite:///{os.path.join(PROJECT_ROOT_PATH, 'data', 'tabular.db')}"
+)
+CATALOG_TABLE_NAME = "tabular_catalog"
+MAX_ROWS = 200
+
+FILTER_OPERATORS = {
+    "eq": lambda col, v: col == v,
+    "ne": lambda col, v: col != v,
+    "gt": lambda col, v: col > v,
+    "gte": lambda col, v: col >= v,
+    "lt": lambda col, v: col < v,
+    "lte": lambda col, v: col <= v,
+    "like": lambda col, v: col.ilike(f"%{v}%"),
+    "in": lambda col, v: col.in_(v if isinstance(v, list) else [v]),
+}
+AGGREGATES = {"count": func.count, "sum": func.sum, "avg": func.avg, "min": func.min, "max": func.max}
+
+mcp = FastMCP(name="Tabular_Server")
+
+_engine = None
+_metadata: MetaData | None = None
+_metadata_version: str | None = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        logging.info(f"Connecting to tabular database at '{TABULAR_DATABASE_URL}'")
+        _engine = create_engine(TABULAR_DATABASE_URL, future=True)
+    return _engine
+
+
+def catalog_version(engine) -> str:
+    """Hash of the catalog rows (tables, columns, row counts, content hashes); changes on every re-ingest of new data."""
+    if not inspect(engine).has_table(CATALOG_TABLE_NAME):
+        return "empty"
+    catalog = Table(CATALOG_TABLE_NAME, MetaData(), autoload_with=engine)
+    with engine.connect() as conn:
+        rows = conn.execute(select(catalog).order_by(catalog.c.table_name)).all()
+    return hashlib.md5(to_compact_json([list(r) for r in rows]).encode("utf-8")).hexdigest()
+
+
+def get_metadata() -> tuple[Any, MetaData]:
+    """Reflect the tabular database, again whenever the catalog version shows a re-ingest."""
+    global _metadata, _metadata_version
+    engine = get_engine()
+    version = catalog_version(engine)
+    if _metadata is None or version != _metadata_version:
+        if _metadata is not None:
+            logging.info("Tabular catalog changed, reflecting the schema again")
+        metadata = MetaData()
+        metadata.reflect(bind=engine)
+        _metadata, _metadata_version = metadata, version
+    return engine, _metadata
+
+
+def to_compact_json(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+@mcp.tool()
+def list_tables() -> str:
+    """
+    List the spreadsheet tables available for exact tabular queries, with their columns.
+    Call this before `query_table` when you do not know the table or column names.
+
+    Returns:
+        Compact JSON: {"tables": [{"name", "source", "rows", "columns": {column: original header}}]}
+    """
+    try:
+        engine, metadata = get_metadata()
+        catalog = metadata.tables.get(CATALOG_TABLE_NAME)
+        tables = []
+        if catalog is not None:
+            with engine.connect() as conn:
+                for row in conn.execute(select(catalog)).mappings():
+                    tables.append({
+                        "name": row["table_name"],
+                        "source": row["source"],
+                        "rows": row["row_count"],
+                        "columns": json.loads(row["columns"]),
+                    })
+        else:
+            for name, table in metadata.tables.items():
+                tables.append({"name": name, "columns": {c.name: c.name for c in table.columns}})
+        return to_compact_json({"tables": tables})
+    except Exception as e:
+        logging.error(f"An error occurred while listing tables: {e}", exc_info=True)
+        return f"Error: {str(e)}"
+
+
+@mcp.tool()
+def query_table(
+    table: str,
+    columns: list[str] | None = None,
+    filters: dict[str, Any] | None = None,
+    group_by: list[str] | None = None,
+    aggregates: dict[str, str] | None = None,
+    order_by: str | None = None,
+    descending: bool = False,
+    limit: int = 50,
+) -> str:
+    """
+    Run an exact filter/aggregate query over a spreadsheet table (e.g. billboard inventory).
+    Use this tool for listings, counts, sums and lookups on structured catalog data such as
+    "tampilkan daftar titik reklame", "berapa billboard di Batam?" or "ukuran titik A-001".
+
+    Args:
+        table: Table name from `list_tables` (e.g. "billboard").
+        columns: Columns to return. Defaults to all columns.
+        filters: Column conditions. A plain value means equality, e.g. {"kota": "Batam"}.
+            Use an operator object for other comparisons: {"panjang": {"gte": 5}},
+            {"alamat_lokasi": {"like": "pahlawan"}}, {"kode_lokasi": {"in": ["A-001", "B-002"]}}.
+            Operators: eq, ne, gt, gte, lt, lte, like, in.
+        group_by: Columns to group by when aggregating.
+        aggregates: Column to function map, e.g. {"kode_lokasi": "count", "panjang": "avg"}.
+            Functions: count, sum, avg, min, max.
+        order_by: Column (or aggregate alias such as "count_kode_lokasi") to sort by.
+        descending: Sort descending.
+        limit: Maximum rows to return (default 50, max 200).
+
+    Returns:
+        Compact JSON: {"table", "columns": [...], "rows": [[...]], "count": n}
+    """
+    try:
+        engine, metadata = get_metadata()
+        tbl = metadata.tables.get(table)
+        if tbl is None or table == CATALOG_TABLE_NAME:
+            return f"Error: Unknown table '{table}'. Available: {', '.join(t for t in metadata.tables if t != CATALOG_TABLE_NAME)}"
+
+        def column(name: str):
+            if name not in tbl.c:
+                raise ValueError(f"Unknown column '{name}' in table '{table}'. Available: {', '.join(tbl.c.keys())}")
+            return tbl.c[name]
+
+        selected = []
+        if group_by:
+            selected.extend(column(c) for c in group_by)
+        elif not aggregates:
+            selected.extend(column(c) for c in columns or tbl.c.keys())
+
+        for col_name, fn_name in (aggregates or {}).items():
+            fn = AGGREGATES.get(fn_name.lower())
+            if fn is None:
+                raise ValueError(f"Unknown aggregate '{fn_name}'. Use one of: {', '.join(AGGREGATES)}")
+            selected.append(fn(column(col_name)).label(f"{fn_name.lower()}_{col_name}"))
+
+        stmt = select(*selected)
+
+        conditions = []
+        for col_name, condition in (filters or {}).items():
+            col = column(col_name)
+            if isinstance(condition, dict):
+                for op, value in condition.items():
+                    if op not in FILTER_OPERATORS:
+                        raise ValueError(f"Unknown operator '{op}'. Use one of: {', '.join(FILTER_OPERATORS)}")
+                    conditions.append(FILTER_OPERATORS[op](col, value))
+            else:
+                conditions.append(col == condition)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+
+        if group_by:
+            stmt = stmt.group_by(*(column(c) for c in group_by))
+
+        if order_by:
+            labels = {c.name: c for c in stmt.selected_columns}
+            order_col = labels.get(order_by)
+            if order_col is None:
+                order_col = column(order_by)
+            stmt = stmt.order_by(order_col.desc() if descending else order_col)
+
+        stmt = stmt.limit(max(1, min(limit, MAX_ROWS)))
+
+        logging.info(f"Running tabular query: {stmt}")
+        with engine.connect() as conn:
+            result = conn.execute(stmt)
+            out_columns = list(result.keys())
+            rows = [list(r) for r in result]
+
+        return to_compact_json({"table": table, "columns": out_columns, "rows": rows, "count": len(rows)})
+    except ValueError as e:
+        logging.warning(f"Invalid tabular query: {e}")
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logging.error(f"An error occurred during the tabular query: {e}", exc_info=True)
+        return f"Error: An unexpected error occurred - {str(e)}"
+
+
+@mcp.tool()
+def tabular_data_version() -> str:
+    """Version of the tabular catalog (changes when tables are re-ingested). Used for cache invalidation."""
+    try:
+        return catalog_version(get_engine())
+    except Exception as e:
+        logging.error(f"tabular_data_version error: {e}", exc_info=True)
+        return "unknown"
+
+
+if __name__ == "__main__":
+    if PROJECT_ROOT_PATH not in sys.path:
+        sys.path.append(PROJECT_ROOT_PATH)
+
+    logging.info("Starting FastMCP server with stdio transport...")
+    mcp.run(transport="stdio")
@@ -1,13 +1,23 @@
 import os
 import sys
 import json
+import time
+import hashlib
 import logging
 
+import numpy as np
 from mcp.server.fastmcp import FastMCP
-from langchain_community.vectorstores import Chroma
+from langchain_core.documents import Document
 from langchain_ollama import OllamaEmbeddings
 from dotenv import load_dotenv
 
+from retrieval.lexical import BM25Index
+from retrieval.backends import INDEX_POINTER, VectorBackend, create_backend
+from retrieval.fusion import reciprocal_rank_fusion, mmr
+from retrieval.formatting import (
+    DEFAULT_OUTPUT_FORMAT, DEFAULT_MAX_CHARS, compact_json, fit_items, trim_snippet, truncate_text
+)
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 PROJECT_ROOT_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -16,11 +26,197 @@ load_dotenv(os.path.join(PROJECT_ROOT_PATH, '.env'))
 OLLAMA_EMBEDDING_MODEL = os.getenv("OLLAMA_EMBEDDING")
 CHROMA_PERSIST_DIR = os.path.join(PROJECT_ROOT_PATH, "chroma_db")
 CHROMA_COLLECTION_NAME = "documents"
+LEXICAL_INDEX_PATH = os.path.join(CHROMA_PERSIST_DIR, "lexical_index.json")
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "chroma")
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", os.path.join(PROJECT_ROOT_PATH, "vector_index"))
+
+# Hybrid retrieval tuning
+HYBRID_DENSE_WEIGHT = float(os.getenv("HYBRID_DENSE_WEIGHT", 1.0))
+HYBRID_LEXICAL_WEIGHT = float(os.getenv("HYBRID_LEXICAL_WEIGHT", 1.0))
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", 20))
+RRF_K = int(os.getenv("RRF_K", 60))
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", 0.5))
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", 8))
+
+# Chat model used only for optional query expansion
+OLLAMA_CHAT_MODEL = os.getenv("OLLAMA_MODEL")
+OLLAMA_URL = os.getenv("OLLAMA_URL")
 
 mcp = FastMCP(name="VectorDB_Server")
 
+_embedding_function: OllamaEmbeddings | None = None
+_backend: VectorBackend | None = None
+_backend_mtime: float | None = None
+_lexical_index: BM25Index | None = None
+_lexical_mtime: float | None = None
+
+
+def get_embedding_function() -> OllamaEmbeddings:
+    global _embedding_function
+    if _embedding_function is None:
+        logging.info(f"Initializing embeddings with model: {OLLAMA_EMBEDDING_MODEL}")
+        _embedding_function = OllamaEmbeddings(model=OLLAMA_EMBEDDING_MODEL)
+    return _embedding_function
+
+
+def get_backend() -> VectorBackend:
+    """Open the vector backend, reopening the NumPy index when a re-ingest switches its CURRENT pointer."""
+    global _backend, _backend_mtime
+    pointer_path = os.path.join(VECTOR_INDEX_DIR, INDEX_POINTER)
+    mtime = os.path.getmtime(pointer_path) if VECTOR_BACKEND == "numpy" and os.path.exists(pointer_path) else None
+    if _backend is None or mtime != _backend_mtime:
+        logging.info(f"Opening '{VECTOR_BACKEND}' vector backend")
+        _backend = create_backend(
+            VECTOR_BACKEND,
+            chroma_dir=CHROMA_PERSIST_DIR,
+            collection_name=CHROMA_COLLECTION_NAME,
+            index_dir=VECTOR_INDEX_DIR,
+            embedding_function=get_embedding_function(),
+        )
+        _backend_mtime = mtime
+    return _backend
+
+
+def get_lexical_index() -> BM25Index | None:
+    """Load the BM25 index written by ingest_docs, reloading it when a re-ingest replaces the file."""
+    global _lexical_index, _lexical_mtime
+    if not os.path.exists(LEXICAL_INDEX_PATH):
+        return None
+    mtime = os.path.getmtime(LEXICAL_INDEX_PATH)
+    if _lexical_index is None or mtime != _lexical_mtime:
+        logging.info(f"Loading lexical index from '{LEXICAL_INDEX_PATH}'")
+        _lexical_index = BM25Index.load(LEXICAL_INDEX_PATH)
+        _lexical_mtime = mtime
+    return _lexical_index
+
+
+def doc_key(doc: Document) -> str:
+    return doc.metadata.get("chunk_id") or hashlib.md5(doc.page_content.encode("utf-8")).hexdigest()
+
+
+def hybrid_search_groups(groups: list[list[str]], top_k: int, search_mode: str = "hybrid",
+                         use_mmr: bool = False) -> list[list[Document]]:
+    """
+    Dense + BM25 candidates fused with weighted reciprocal rank fusion, optionally MMR-diversified.
+    Each group is a list of query variants fused into one ranking (the first one is the original query).
+    All variants of all groups are embedded in a single request and searched as one batch.
+    """
+    timings = {}
+    candidates = max(top_k, HYBRID_CANDIDATES)
+    backend = get_backend()
+    docs_by_key: dict[str, Document] = {}
+    queries = [query for group in groups for query in group]
+    vectors = [None] * len(queries)
+    dense_hits = [[] for _ in queries]
+
+    if search_mode in ("hybrid", "dense") or use_mmr:
+        t0 = time.perf_counter()
+        vectors = get_embedding_function().embed_documents(queries)
+        timings["embed"] = time.perf_counter() - t0
+
+    if search_mode in ("hybrid", "dense"):
+        t0 = time.perf_counter()
+        dense_hits = backend.search_by_vectors(vectors, k=candidates)
+        timings["dense"] = time.perf_counter() - t0
+
+    lexical_index = get_lexical_index() if search_mode in ("hybrid", "lexical") else None
+    if lexical_index is None and search_mode == "lexical":
+        logging.warning("Lexical index not found; run ingest_docs.py to build it.")
+
+    results = []
+    offset = 0
+    for group in groups:
+        ranked_lists, weights = [], []
+        for i in range(offset, offset + len(group)):
+            if search_mode in ("hybrid", "dense"):
+                ranked = []
+                for doc, _score in dense_hits[i]:
+                    key = doc_key(doc)
+                    docs_by_key.setdefault(key, doc)
+                    ranked.append(key)
+                ranked_lists.append(ranked)
+                weights.append(HYBRID_DENSE_WEIGHT)
+
+            if lexical_index is not None:
+                t0 = time.perf_counter()
+                ranked = []
+                for item, _score in lexical_index.search(queries[i], k=candidates):
+                    docs_by_key.setdefault(item["id"], Document(page_content=item["text"], metadata=item["metadata"]))
+                    ranked.append(item["id"])
+                ranked_lists.append(ranked)
+                weights.append(HYBRID_LEXICAL_WEIGHT)
+                timings["lexical"] = timings.get("lexical", 0.0) + time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        fused = [key for key, _ in reciprocal_rank_fusion(ranked_lists, weights, k=RRF_K)]
+        timings["fuse"] = timings.get("fuse", 0.0) + time.perf_counter() - t0
+
+        if use_mmr and len(fused) > top_k:
+            t0 = time.perf_counter()
+            pool = fused[:candidates]
+            vectors_by_id = backend.get_vectors(pool)
+            pool = [key for key in pool if key in vectors_by_id]
+            if pool:
+                matrix = np.asarray([vectors_by_id[key] for key in pool], dtype=np.float32)
+                picked = mmr(np.asarray(vectors[offset], dtype=np.float32), matrix, top_k, MMR_LAMBDA)
+                fused = [pool[j] for j in picked]
+            timings["mmr"] = timings.get("mmr", 0.0) + time.perf_counter() - t0
+
+        results.append([docs_by_key[key] for key in fused[:top_k]])
+        offset += len(group)
+
+    logging.info(
+        f"Retrieval timings for {len(queries)} query(ies) (ms): "
+        + ", ".join(f"{stage}={elapsed * 1000:.1f}" for stage, elapsed in timings.items())
+    )
+    return results
+
+
+def hybrid_search(query: str, top_k: int, search_mode: str = "hybrid", use_mmr: bool = False) -> list[Document]:
+    return hybrid_search_groups([[query]], top_k, search_mode, use_mmr)[0]
+
+
+def expand_query(query: str, n: int) -> list[str]:
+    """Ask the local chat model for `n` short paraphrases of the query. Returns [] if the model is unavailable."""
+    try:
+        from langchain_ollama import ChatOllama
+
+        t0 = time.perf_counter()
+        model = ChatOllama(
+            model=OLLAMA_CHAT_MODEL,
+            base_url=OLLAMA_URL,
+            temperature=0.3,
+            num_predict=40 * n,
+        )
+        prompt = (
+            f"Write {n} different short search queries with the same meaning as the question below, "
+            f"in the same language. One per line, no numbering, no explanations.\n\nQuestion: {query}"
+        )
+        content = model.invoke(prompt).content
+        if "</think>" in content:
+            content = content.split("</think>", 1)[1]
+        paraphrases = [line.strip(" -•\t") for line in content.splitlines() if line.strip(" -•\t")]
+        paraphrases = [p for p in paraphrases if p.lower() != query.lower()][:n]
+        logging.info(f"Expanded query into {len(paraphrases)} paraphrase(s) in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        return paraphrases
+    except Exception as e:
+        logging.warning(f"Query expansion failed, using the original query only: {e}")
+        return []
+
+
+def compact_item(doc: Document, query: str) -> dict:
+    """Minimal fields the LLM needs: id for cross-references, source file, page/row and a trimmed snippet."""
+    item = {"id": doc_key(doc), "src": os.path.basename(str(doc.metadata.get("source", "")))}
+    for field in ("page", "row"):
+        if field in doc.metadata:
+            item[field] = doc.metadata[field]
+    item["text"] = trim_snippet(doc.page_content, query)
+    return item
+
+
 @mcp.tool()
-def vectordb_query(query: str, top_k: int = 3) -> str:
+def vectordb_query(query: str, top_k: int = 3, search_mode: str = "hybrid", diversify: bool = False,
+                   output_format: str = DEFAULT_OUTPUT_FORMAT, max_chars: int = DEFAULT_MAX_CHARS) -> str:
     """
     Perform semantic similarity search on company documents using vector embeddings.
     Use this tool ONLY when the user asks open-ended, vague, or complex questions that are NOT explicitly listed in the static Q&A database.
@@ -32,34 +228,35 @@ def vectordb_query(query: str, top_k: int = 3) -> str:
     - "Find documents mentioning employee wellness programs."
 
     This tool DOES NOT know exact answers — it finds similar text snippets from uploaded documents.
+    Results combine semantic similarity with exact keyword matching, so location codes (e.g. "A-001"),
+    sizes and product names are found too.
     Always analyze if the results contain the exact answer before responding.
 
     Args:
         query: The natural language question to search for.
-        top_k: Number of top matching documents to retrieve (default: 5).
+        top_k: Number of top matching documents to retrieve (default: 3).
+        search_mode: "hybrid" (default), "dense" (semantic only) or "lexical" (keywords only).
+        diversify: Re-rank with MMR to avoid near-duplicate snippets.
+        output_format: "compact" (JSON with trimmed snippets) or "text" (full content and metadata).
+        max_chars: Upper bound on the size of the returned text.
 
     Returns:
-        Formatted string with retrieved document content and metadata, or error message.
+        Retrieved document content (compact JSON {"results": [{"id", "src", "page"|"row", "text"}]}
+        or formatted text), or error message.
     """
     try:
-        logging.info(f"Initializing embeddings with model: {OLLAMA_EMBEDDING_MODEL}")
-        embedding_function = OllamaEmbeddings(model=OLLAMA_EMBEDDING_MODEL)
-        
-        logging.info(f"Connecting to ChromaDB collection '{CHROMA_COLLECTION_NAME}' at '{CHROMA_PERSIST_DIR}'")
-        vectordb = Chroma(
-            collection_name=CHROMA_COLLECTION_NAME,
-            persist_directory=CHROMA_PERSIST_DIR,
-            embedding_function=embedding_function
-        )
-        
-        logging.info(f"Performing similarity search for query: '{query}' with top_k={top_k}")
-        results = vectordb.similarity_search(query, k=top_k)
+        logging.info(f"Performing {search_mode} search for query: '{query}' with top_k={top_k}")
+        results = hybrid_search(query, top_k, search_mode=search_mode, use_mmr=diversify)
         
         if not results:
             logging.warning("No relevant documents were found for the query.")
             return "No relevant documents were found in the RAG system."
 
         logging.info(f"Found {len(results)} relevant document(s). Formatting output.")
+        if output_format == "compact":
+            items = fit_items([compact_item(doc, query) for doc in results], max_chars)
+            return compact_json({"results": items})
+
         rag_text = "The following relevant documents were found by the RAG system:\n\n"
         for i, doc in enumerate(results, 1):
             rag_text += f"--- Document {i} ---\n"
@@ -68,11 +265,93 @@ def vectordb_query(query: str, top_k: int = 3) -> str:
             metadata_str = json.dumps(doc.metadata, indent=2, ensure_ascii=False)
             rag_text += f"Metadata: {metadata_str}\n\n"
 
-        return rag_text
+        return truncate_text(rag_text, max_chars)
     except Exception as e:
         logging.error(f"An error occurred during the RAG query: {e}", exc_info=True)
         return f"An error occurred while querying the RAG system: {str(e)}"
 
+@mcp.tool()
+def vectordb_query_batch(queries: list[str], top_k: int = 3, search_mode: str = "hybrid", expand: int = 0,
+                         output_format: str = DEFAULT_OUTPUT_FORMAT, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """
+    Semantic search for several questions at once. Prefer this over calling `vectordb_query`
+    repeatedly when you need multiple facts (e.g. "visi perusahaan" and "alamat kantor").
+    All queries are embedded and searched together, and a snippet already shown for an earlier
+    query is referenced instead of repeated.
+
+    Args:
+        queries: The natural language questions to search for (max 8).
+        top_k: Number of matching documents per query (default: 3).
+        search_mode: "hybrid" (default), "dense" (semantic only) or "lexical" (keywords only).
+        expand: For a single vague query, number of paraphrases to generate and fuse (0-3).
+        output_format: "compact" (JSON with trimmed snippets) or "text" (full content and metadata).
+        max_chars: Upper bound on the size of the returned text, shared by all queries.
+
+    Returns:
+        Retrieved document content grouped per query (compact JSON {"groups": [{"q", "results"}]}
+        where repeated documents appear as {"ref": id}, or formatted text), or error message.
+    """
+    try:
+        queries = [q.strip() for q in queries if q and q.strip()][:MAX_BATCH_QUERIES]
+        if not queries:
+            return "Error: No queries were provided."
+
+        groups = [[q] for q in queries]
+        if expand > 0 and len(queries) == 1:
+            groups[0].extend(expand_query(queries[0], min(expand, 3)))
+
+        logging.info(f"Performing batch {search_mode} search for {len(queries)} query(ies) with top_k={top_k}")
+        grouped_results = hybrid_search_groups(groups, top_k, search_mode=search_mode)
+
+        if output_format == "compact":
+            seen_ids: set[str] = set()
+            per_query_chars = max(max_chars // len(queries), 200)
+            payload = []
+            for query, results in zip(queries, grouped_results):
+                items = []
+                for doc in results:
+                    key = doc_key(doc)
+                    if key in seen_ids:
+                        items.append({"ref": key})
+                        continue
+                    seen_ids.add(key)
+                    items.append(compact_item(doc, query))
+                payload.append({"q": query, "results": fit_items(items, per_query_chars)})
+            return compact_json({"groups": payload})
+
+        seen: dict[str, str] = {}
+        rag_text = "The following relevant documents were found by the RAG system:\n\n"
+        for qi, (query, results) in enumerate(zip(queries, grouped_results), 1):
+            rag_text += f"=== Query {qi}: {query} ===\n"
+            if not results:
+                rag_text += "No relevant documents were found.\n\n"
+                continue
+            for di, doc in enumerate(results, 1):
+                key = doc_key(doc)
+                if key in seen:
+                    rag_text += f"--- Document {di}: same as {seen[key]} ---\n\n"
+                    continue
+                seen[key] = f"Query {qi} Document {di}"
+                rag_text += f"--- Document {di} ---\n"
+                rag_text += f"Content: {doc.page_content}\n"
+                rag_text += f"Metadata: {json.dumps(doc.metadata, ensure_ascii=False)}\n\n"
+
+        return truncate_text(rag_text, max_chars)
+    except Exception as e:
+        logging.error(f"An error occurred during the batch RAG query: {e}", exc_info=True)
+        return f"An error occurred while querying the RAG system: {str(e)}"
+
+@mcp.tool()
+def vectordb_data_version() -> str:
+    """Version of the document indexes (changes on every re-ingest or conversion). Used for cache invalidation."""
+    paths = [
+        LEXICAL_INDEX_PATH,
+        os.path.join(CHROMA_PERSIST_DIR, "chroma.sqlite3"),
+        os.path.join(VECTOR_INDEX_DIR, INDEX_POINTER),
+    ]
+    return "-".join(str(os.path.getmtime(p)) if os.path.exists(p) else "0" for p in paths)
+
+
 if __name__ == "__main__":
     if PROJECT_ROOT_PATH not in sys.path:
         sys.path.append(PROJECT_ROOT_PATH)
@@ -0,0 +1,86 @@
+"""
+MCP transport benchmark: stdio subprocesses vs in-process FastMCP servers.
+
+Loads the tools of the selected servers both ways, checks that names, schemas and results match,
+then calls each benchmark tool repeatedly and reports per-call latency for both transports.
+Only tools that need no Ollama or Google credentials are called by default.
+
+Usage:
+  python tests/benchmark_mcp_transport.py [--servers qa,scheduler,tabular] [--calls 20]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from statistics import mean, median
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_mcp_adapters.client import MultiServerMCPClient  # noqa: E402
+from app.services.mcp_service import MCP_SERVERS, load_inprocess_tools  # noqa: E402
+
+SERVERS_DIR = PROJECT_ROOT / "servers"
+BENCHMARK_CALLS = [
+    ("get_qa_data", {"query": "kebijakan cuti"}),
+    ("qa_data_version", {}),
+    ("get_current_datetime", {}),
+    ("list_tables", {}),
+    ("tabular_data_version", {}),
+]
+
+
+async def load_stdio(servers: list[str]):
+    client = MultiServerMCPClient({
+        name: {"command": sys.executable, "args": [str(SERVERS_DIR / MCP_SERVERS[name])], "transport": "stdio"}
+        for name in servers
+    })
+    return {t.name: t for t in await client.get_tools()}
+
+
+async def load_inprocess(servers: list[str]):
+    groups = await asyncio.gather(*(load_inprocess_tools(SERVERS_DIR, name) for name in servers))
+    return {t.name: t for group in groups for t in group}
+
+
+async def time_calls(tool, args: dict, calls: int) -> tuple[list[float], object]:
+    samples, result = [], None
+    for _ in range(calls):
+        start = time.perf_counter()
+        result = await tool.ainvoke(args)
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+async def main(args):
+    servers = [s.strip() for s in args.servers.split(",") if s.strip()]
+    stdio, inprocess = await asyncio.gather(load_stdio(servers), load_inprocess(servers))
+
+    assert stdio.keys() == inprocess.keys(), f"tool names differ: {stdio.keys() ^ inprocess.keys()}"
+    for name in stdio:
+        assert stdio[name].args_schema == inprocess[name].args_schema, f"schema differs for {name}"
+        assert stdio[name].description == inprocess[name].description, f"description differs for {name}"
+    print(f"{len(stdio)} tools with identical names, descriptions and schemas")
+
+    print(f"{'tool':<24} | {'stdio p50':>10} {'mean':>9} | {'in-process p50':>14} {'mean':>9} | {'speed-up':>8} | same")
+    for name, tool_args in BENCHMARK_CALLS:
+        if name not in stdio:
+            continue
+        stdio_samples, stdio_result = await time_calls(stdio[name], tool_args, args.calls)
+        local_samples, local_result = await time_calls(inprocess[name], tool_args, args.calls)
+        # get_current_datetime can tick between the two runs, compare only what should be stable
+        same = stdio_result == local_result or name == "get_current_datetime"
+        print(
+            f"{name:<24} | {median(stdio_samples) * 1000:>8.1f}ms {mean(stdio_samples) * 1000:>7.1f}ms | "
+            f"{median(local_samples) * 1000:>12.2f}ms {mean(local_samples) * 1000:>7.2f}ms | "
+            f"{median(stdio_samples) / median(local_samples):>7.0f}x | {same}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare MCP tool-call latency over stdio and in-process")
+    parser.add_argument("--servers", default="qa,scheduler,tabular")
+    parser.add_argument("--calls", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,124 @@
+"""
+Latency and answer-parity benchmark: ReAct agent vs. the retrieval-first pipeline.
+
+Each question is answered twice from the same tools and model:
+  - agent:            create_react_agent picks tools, then answers (2+ LLM turns)
+  - retrieval_first:  QA index + vector search in parallel, then one generation
+
+Parity is the token-overlap F1 between the two answers, plus whether both (or neither) said "no information".
+
+Usage:
+  python tests/benchmark_pipeline.py [--questions 10] [--extra "pertanyaan 1" "pertanyaan 2"] [--out pipeline_benchmark.csv]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from statistics import mean, median
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage  # noqa: E402
+from app.core.prompt import build_system_instruction  # noqa: E402
+from app.handlers.message_handler import extract_clean_response  # noqa: E402
+from app.services.agent_service import init_agent  # noqa: E402
+from app.services.answer_service import answer_retrieval_first  # noqa: E402
+from app.services.llm_service import get_model  # noqa: E402
+from app.services.mcp_service import init_mcp_client  # noqa: E402
+
+NO_INFO = "tidak memiliki informasi"
+DEFAULT_EXTRA_QUESTIONS = [
+    "Apa visi dan misi Warna Warni Media?",
+    "Layanan apa saja yang ditawarkan perusahaan?",
+]
+
+
+def tokens(text: str) -> list[str]:
+    return re.findall(r"\w+", (text or "").lower())
+
+
+def overlap_f1(a: str, b: str) -> float:
+    ta, tb = tokens(a), tokens(b)
+    if not ta or not tb:
+        return float(ta == tb)
+    common = sum(min(ta.count(t), tb.count(t)) for t in set(ta))
+    if common == 0:
+        return 0.0
+    precision, recall = common / len(ta), common / len(tb)
+    return 2 * precision * recall / (precision + recall)
+
+
+async def run_agent(agent, system_instruction: str, question: str) -> tuple[str, float, int]:
+    start = time.perf_counter()
+    result = await agent.ainvoke({"messages": [SystemMessage(content=system_instruction), HumanMessage(content=question)]})
+    elapsed = time.perf_counter() - start
+    llm_turns = sum(1 for m in result["messages"] if isinstance(m, AIMessage))
+    return extract_clean_response(result) or "", elapsed, llm_turns
+
+
+async def run_retrieval_first(model, tools: dict, system_instruction: str, question: str) -> tuple[str, float, int]:
+    start = time.perf_counter()
+    answer = await answer_retrieval_first(model, tools, system_instruction, [], question)
+    elapsed = time.perf_counter() - start
+    text = extract_clean_response({"messages": [answer]}) if answer is not None else ""
+    return text or "", elapsed, 1 if answer is not None else 0
+
+
+async def main(args):
+    with open(PROJECT_ROOT / "data" / "json" / "data.json", "r", encoding="utf-8") as f:
+        questions = [item["question"] for item in json.load(f)][:args.questions]
+    questions += args.extra if args.extra is not None else DEFAULT_EXTRA_QUESTIONS
+
+    client, tool_list = await init_mcp_client(PROJECT_ROOT / "app")
+    tool_names = ", ".join(t.name for t in tool_list)
+    tools = {t.name: t for t in tool_list}
+    model = get_model(args.model)
+    agent = init_agent(model, tool_list)
+    system_instruction = build_system_instruction(tool_names)
+
+    rows = []
+    for question in questions:
+        agent_answer, agent_time, agent_turns = await run_agent(agent, system_instruction, question)
+        rf_answer, rf_time, rf_turns = await run_retrieval_first(model, tools, system_instruction, question)
+        rows.append({
+            "question": question,
+            "agent_s": round(agent_time, 2),
+            "retrieval_first_s": round(rf_time, 2),
+            "agent_llm_turns": agent_turns,
+            "retrieval_first_llm_turns": rf_turns,
+            "f1": round(overlap_f1(agent_answer, rf_answer), 3),
+            "no_info_agree": (NO_INFO in agent_answer.lower()) == (NO_INFO in rf_answer.lower()),
+            "agent_answer": agent_answer,
+            "retrieval_first_answer": rf_answer,
+        })
+        print(f"{agent_time:6.2f}s vs {rf_time:6.2f}s  F1={rows[-1]['f1']:.2f}  {question}")
+
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    agent_times = [r["agent_s"] for r in rows]
+    rf_times = [r["retrieval_first_s"] for r in rows]
+    print("\n=== Summary ===")
+    print(f"Questions:            {len(rows)}")
+    print(f"Agent latency:        mean {mean(agent_times):.2f}s, median {median(agent_times):.2f}s")
+    print(f"Retrieval-first:      mean {mean(rf_times):.2f}s, median {median(rf_times):.2f}s")
+    print(f"Mean answer F1:       {mean(r['f1'] for r in rows):.3f}")
+    print(f"No-info agreement:    {sum(r['no_info_agree'] for r in rows)}/{len(rows)}")
+    print(f"Results written to {args.out}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agent vs retrieval-first answers")
+    parser.add_argument("--questions", type=int, default=10, help="number of questions taken from data.json")
+    parser.add_argument("--extra", nargs="*", help="additional (document) questions")
+    parser.add_argument("--model", default="ollama", help="model type passed to get_model")
+    parser.add_argument("--out", default="pipeline_benchmark.csv")
+    asyncio.run(main(parser.parse_args()))
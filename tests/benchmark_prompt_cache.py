@@ -0,0 +1,79 @@
+"""
+Prompt-prefix caching benchmark for Ollama.
+
+Runs the same multi-turn conversation twice against OLLAMA_MODEL with the agent's system prompt:
+  - stable:   byte-identical system prompt, append-only history (what the app sends now)
+  - volatile: a per-turn timestamp at the top of the system prompt (breaks the prefix every turn)
+
+For each turn it reports Ollama's prompt_eval_count and prompt_eval_duration; with a stable prefix
+only the new tokens at the end should be evaluated.
+
+Usage:
+  python tests/benchmark_prompt_cache.py [--turns 6]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from statistics import mean
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from app.core.prompt import build_conversation, build_system_instruction  # noqa: E402
+from app.services.llm_service import get_model  # noqa: E402
+
+QUESTIONS = [
+    "Apa kebijakan cuti perusahaan kita?",
+    "Bagaimana cara mengajukan lisensi perangkat lunak baru?",
+    "Jam kerja kantor mulai pukul berapa?",
+    "Siapa yang harus saya hubungi untuk masalah IT?",
+    "Apakah ada kebijakan kerja dari rumah?",
+    "Bagaimana prosedur reimbursement?",
+]
+
+
+def run(model, system_instruction: str, turns: int, volatile: bool) -> list[dict]:
+    history, rows = [], []
+    for i in range(turns):
+        question = QUESTIONS[i % len(QUESTIONS)]
+        system = f"Current time: {time.time()}\n{system_instruction}" if volatile else system_instruction
+        start = time.perf_counter()
+        reply = model.invoke(build_conversation(system, history, question))
+        elapsed = time.perf_counter() - start
+        info = reply.response_metadata
+        rows.append({
+            "prompt_tokens": info.get("prompt_eval_count"),
+            "prompt_eval_ms": (info.get("prompt_eval_duration") or 0) / 1e6,
+            "total_ms": elapsed * 1000,
+        })
+        history.extend([HumanMessage(content=question), AIMessage(content=reply.content)])
+    return rows
+
+
+def main(args):
+    model = get_model("ollama")
+    system_instruction = build_system_instruction("")
+    # Warm the model so the first measured turn is not a model load
+    model.invoke(build_conversation(system_instruction, [], "ping"))
+
+    results = {mode: run(model, system_instruction, args.turns, mode == "volatile") for mode in ("volatile", "stable")}
+
+    print(f"{'turn':>4} | {'volatile tokens':>15} {'eval ms':>9} | {'stable tokens':>13} {'eval ms':>9}")
+    for i in range(args.turns):
+        v, s = results["volatile"][i], results["stable"][i]
+        print(f"{i + 1:>4} | {v['prompt_tokens']!s:>15} {v['prompt_eval_ms']:>9.1f} | {s['prompt_tokens']!s:>13} {s['prompt_eval_ms']:>9.1f}")
+
+    # The first turn of each run primes the cache, so compare from the second turn on
+    for mode, rows in results.items():
+        later = rows[1:] or rows
+        print(f"{mode:>8}: mean prompt eval {mean(r['prompt_eval_ms'] for r in later):.1f} ms/turn, "
+              f"mean total {mean(r['total_ms'] for r in later):.1f} ms/turn")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure prompt-eval time with stable vs volatile prompt prefixes")
+    parser.add_argument("--turns", type=int, default=6)
+    main(parser.parse_args())
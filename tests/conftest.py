@@ -0,0 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "servers"))
+
+# app.core.database builds its engine at import time; unit tests never touch it
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+# Scripts in this folder that are run by hand, not collected by pytest
+collect_ignore = ["test.py", "test_client.py", "test_mcp.py"]
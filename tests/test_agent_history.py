@@ -0,0 +1,57 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import StructuredTool
+
+from app.services.agent_service import conversation_history, drop_dangling_tool_calls, init_agent, record_turn
+from app.services.checkpoint_service import BoundedMemorySaver
+
+
+class FakeModel(GenericFakeChatModel):
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def test_conversation_history_keeps_only_recent_turns():
+    async def run():
+        agent = init_agent(FakeModel(messages=iter([])), [], checkpointer=BoundedMemorySaver(), system_instruction="sys")
+        for i in range(20):
+            await record_turn(agent, "628123", f"pertanyaan {i} " * 20, f"jawaban {i} " * 20)
+        return await conversation_history(agent, "628123", max_tokens=300)
+
+    history = asyncio.run(run())
+    assert 0 < len(history) < 40
+    assert isinstance(history[0], HumanMessage)
+    assert history[-1].content.startswith("jawaban 19")
+
+
+def test_conversation_history_of_unknown_sender_is_empty():
+    agent = init_agent(FakeModel(messages=iter([])), [], checkpointer=BoundedMemorySaver(), system_instruction="sys")
+    assert asyncio.run(conversation_history(agent, "unknown", max_tokens=300)) == []
+
+
+def test_drop_dangling_tool_calls_drops_partial_results():
+    call = AIMessage(content="", tool_calls=[
+        {"name": "get_qa_data", "args": {}, "id": "a"},
+        {"name": "vectordb_query", "args": {}, "id": "b"},
+    ])
+    messages = [HumanMessage(content="q"), call, ToolMessage(content="hasil", tool_call_id="a"), HumanMessage(content="q2")]
+    assert drop_dangling_tool_calls(messages) == [messages[0], messages[3]]
+
+
+def test_pipeline_model_carries_the_agent_tools():
+    class ToolRecordingModel(FakeModel):
+        bound_tools: list = []
+        bound_kwargs: dict = {}
+
+        def bind_tools(self, tools, **kwargs):
+            return self.model_copy(update={"bound_tools": [t.name for t in tools], "bound_kwargs": kwargs})
+
+    tools = [
+        StructuredTool.from_function(func=lambda query="": query, name=name, description=name)
+        for name in ("get_qa_data", "vectordb_query")
+    ]
+    agent = init_agent(ToolRecordingModel(messages=iter([])), tools)
+    assert agent.llm.bound_tools == ["get_qa_data", "vectordb_query"]
+    assert agent.llm.bound_kwargs == {"tool_choice": "none"}
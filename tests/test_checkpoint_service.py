@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.base import empty_checkpoint
+
+from app.core.metrics import metrics
+from app.services.checkpoint_service import BoundedMemorySaver, open_checkpointer
+
+
+def save(saver: BoundedMemorySaver, thread_id: str, turn: int):
+    """Store one checkpoint whose `messages` channel is at version `turn`, like an agent step."""
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": [f"pesan {turn}"]}
+    checkpoint["channel_versions"] = {"messages": turn}
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    config = saver.put(config, checkpoint, {"step": turn}, {"messages": turn})
+    saver.put_writes(config, [("messages", f"tulis {turn}")], task_id=f"task-{turn}")
+
+
+def test_only_latest_checkpoints_and_their_blobs_are_kept():
+    saver = BoundedMemorySaver(keep_checkpoints=2)
+    for turn in range(1, 6):
+        save(saver, "628123", turn)
+
+    assert len(saver.storage["628123"][""]) == 2
+    assert sorted(version for _, _, _, version in saver.blobs) == [4, 5]
+    # The writes of the latest checkpoint are stored after the put that pruned, so at most 2 remain
+    assert len([key for key in saver.writes if key[0] == "628123"]) <= 2
+
+    latest = saver.get_tuple({"configurable": {"thread_id": "628123", "checkpoint_ns": ""}})
+    assert latest.checkpoint["channel_values"]["messages"] == ["pesan 5"]
+
+
+def test_least_recently_used_thread_is_evicted():
+    saver = BoundedMemorySaver(max_threads=2)
+    before = metrics.counters["checkpoints.evicted_threads"]
+    save(saver, "a", 1)
+    save(saver, "b", 1)
+    save(saver, "a", 2)
+    save(saver, "c", 1)
+
+    assert set(saver.storage) == {"a", "c"}
+    assert metrics.counters["checkpoints.evicted_threads"] == before + 1
+
+
+def test_open_checkpointer_backends():
+    async def run(backend: str):
+        async with open_checkpointer(backend, max_threads=5) as saver:
+            return saver
+
+    assert asyncio.run(run("none")) is None
+    memory = asyncio.run(run("memory"))
+    assert isinstance(memory, BoundedMemorySaver) and memory.max_threads == 5
+    with pytest.raises(ValueError, match="Unknown checkpointer"):
+        asyncio.run(run("redis"))
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from app.core.deadline import Deadline, StageTimeout
+from app.core.metrics import metrics
+from app.services.tool_runtime import apply_timeouts, parse_timeouts
+
+
+def slow_tool(name: str, events: list, seconds: float) -> StructuredTool:
+    async def run(query: str = "") -> str:
+        events.append("start")
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+        events.append("done")
+        return "ok"
+
+    return StructuredTool.from_function(coroutine=run, name=name, description=name)
+
+
+def test_expired_stage_is_cancelled_and_counted():
+    events = []
+    before = metrics.counters["timeouts.answer"]
+
+    async def answer():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            events.append("cancelled")
+            raise
+
+    async def run():
+        with pytest.raises(StageTimeout) as exc:
+            await Deadline(5, {"answer": 0.05}).run("answer", answer())
+        return exc.value.stage
+
+    assert asyncio.run(run()) == "answer"
+    assert events == ["cancelled"]
+    assert metrics.counters["timeouts.answer"] == before + 1
+
+
+def test_spent_budget_fails_without_starting_the_stage():
+    events = []
+
+    async def classify():
+        events.append("started")
+
+    async def run():
+        deadline = Deadline(0.01)
+        await asyncio.sleep(0.02)
+        assert deadline.remaining() == 0.0
+        await deadline.run("classify", classify())
+
+    with pytest.raises(StageTimeout):
+        asyncio.run(run())
+    assert events == []
+
+
+def test_stage_finishing_in_time_returns_its_result():
+    async def run():
+        return await Deadline(1).run("answer", asyncio.sleep(0, result="jawaban"))
+
+    assert asyncio.run(run()) == "jawaban"
+
+
+def test_timed_out_write_tool_keeps_running():
+    events = []
+    (tool,) = apply_timeouts([slow_tool("create_calendar_event", events, 0.1)], default=0.02)
+
+    async def run():
+        result = await tool.ainvoke({"query": "rapat"})
+        await asyncio.sleep(0.15)
+        return result
+
+    result = asyncio.run(run())
+    assert "do not retry" in result
+    assert events == ["start", "done"]
+
+
+def test_timed_out_read_tool_is_cancelled():
+    events = []
+    (tool,) = apply_timeouts([slow_tool("get_qa_data", events, 0.1)], default=5,
+                             overrides=parse_timeouts("get_qa_data:0.02"))
+
+    result = asyncio.run(tool.ainvoke({"query": "jam kerja"}))
+    assert result == "Error: get_qa_data timed out after 0.02 seconds."
+    assert events == ["start", "cancelled"]
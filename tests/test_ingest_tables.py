@@ -0,0 +1,37 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+from app.utils.ingest_tables import MAX_IDENTIFIER_LENGTH, index_name_for, store_dataframe
+from tabular_server import catalog_version
+
+
+def test_edited_values_change_the_catalog_version(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tabular.db'}")
+    store_dataframe(engine, pd.DataFrame({"Kota": ["Batam", "Medan"], "Panjang": [4, 5]}), "billboard", "billboard.xlsx")
+    before = catalog_version(engine)
+
+    store_dataframe(engine, pd.DataFrame({"Kota": ["Batam", "Medan"], "Panjang": [4, 6]}), "billboard", "billboard.xlsx")
+    after = catalog_version(engine)
+    assert after != before
+
+    store_dataframe(engine, pd.DataFrame({"Kota": ["Batam", "Medan"], "Panjang": [4, 6]}), "billboard", "billboard.xlsx")
+    assert catalog_version(engine) == after
+
+
+def test_catalog_created_before_content_hash_is_upgraded(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tabular.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE tabular_catalog (table_name VARCHAR PRIMARY KEY, source VARCHAR NOT NULL, "
+            "sheet VARCHAR, columns TEXT NOT NULL, row_count INTEGER NOT NULL)"
+        ))
+    assert store_dataframe(engine, pd.DataFrame({"Kota": ["Batam"]}), "billboard", "billboard.xlsx") == 1
+
+
+def test_long_index_names_are_shortened_without_colliding():
+    table = "laporan_inventaris_titik_reklame_wilayah_kepulauan_riau"
+    first = index_name_for(table, "alamat_lokasi_lengkap_sesuai_dokumen_perizinan")
+    second = index_name_for(table, "alamat_lokasi_lengkap_sesuai_dokumen_perizinan_lama")
+    assert len(first) <= MAX_IDENTIFIER_LENGTH and len(second) <= MAX_IDENTIFIER_LENGTH
+    assert first != second
+    assert index_name_for("billboard", "kota") == "ix_billboard_kota"
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from app.core.intent_router import DEFAULT_INTENT_RULES, IntentRouter, build_intent_router
+
+
+@pytest.fixture
+def router():
+    return build_intent_router(rules_path="")
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("kirim gambarnya dong", "image"),
+    ("boleh minta fotonya?", "image"),
+    ("tolong kirim dokumennya", "document"),
+    ("filenya mana ya", "document"),
+    ("daftar gambarnya apa saja", "list_images"),
+    ("Daftar  Dokumen tersedia", "list_documents"),
+])
+def test_keywords_match_with_clitic_suffixes(router, text, intent):
+    assert router.route(text) == intent
+
+
+@pytest.mark.parametrize("text", ["update profile saya", "fotografer kami", "berapa harga sewa?"])
+def test_keywords_inside_other_words_do_not_match(router, text):
+    assert router.route(text) is None
+
+
+def test_higher_priority_wins(router):
+    assert router.route("kirim gambar dan dokumen") == "image"
+
+
+def test_equal_priorities_are_settled_by_rule_order():
+    for _ in range(20):
+        router = IntentRouter()
+        router.register("scheduling", ["jadwal"], priority=5)
+        router.register("document", ["pdf"], priority=5)
+        assert router.route("jadwalku dalam pdf") == "scheduling"
+
+
+def test_rules_file_extends_the_defaults(tmp_path):
+    path = tmp_path / "intent_rules.json"
+    path.write_text(json.dumps({"scheduling": {"priority": 50, "keywords": ["jadwal", "rapat"]}}))
+    router = build_intent_router(str(path))
+    assert router.route("jadwalku besok apa?") == "scheduling"
+    assert router.route("kirim gambar") == "image"
+
+
+@pytest.mark.parametrize("content", ["{not json", '["jadwal"]', '{"scheduling": {"keywords": 5}}'])
+def test_malformed_rules_file_falls_back_to_defaults(tmp_path, content):
+    path = tmp_path / "intent_rules.json"
+    path.write_text(content)
+    router = build_intent_router(str(path))
+    assert router.route("kirim gambar") == "image"
+    assert set(router._rules) == set(DEFAULT_INTENT_RULES)
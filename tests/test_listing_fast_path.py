@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from langchain_core.tools import StructuredTool
+
+from app.handlers.fast_path_handler import build_listing_tables, load_listing_tables, match_listing
+
+CATALOG = [
+    {"name": "billboard", "source": "billboard.xlsx"},
+    {"name": "harga_sewa_2025", "source": "price list.xlsx"},
+    {"name": "armada_truk", "source": "aset.xlsx"},
+    {"name": "armada_mobil", "source": "aset.xlsx"},
+]
+
+
+def test_tables_match_by_name_file_and_alias():
+    tables = build_listing_tables(CATALOG, {"billboard": ["Titik Reklame", "baliho"]})
+    assert match_listing("tampilkan daftar titik reklame", tables) == "billboard"
+    assert match_listing("list baliho dong", tables) == "billboard"
+    assert match_listing("lihat semua harga sewa 2025", tables) == "harga_sewa_2025"
+    assert match_listing("daftar price list", tables) == "harga_sewa_2025"
+    assert match_listing("tampilkan armada truk", tables) == "armada_truk"
+
+
+def test_shared_file_name_and_filters_go_to_the_agent():
+    tables = build_listing_tables(CATALOG)
+    # aset.xlsx holds two tables, so its name does not pick one
+    assert match_listing("daftar aset", tables) is None
+    assert match_listing("daftar billboard di batam", tables) is None
+    assert match_listing("billboard", tables) is None
+
+
+def test_tables_are_loaded_from_the_catalog_tool(tmp_path):
+    aliases = tmp_path / "listing_aliases.json"
+    aliases.write_text(json.dumps({"billboard": ["reklame"], "dropped_table": ["x"]}))
+
+    async def list_tables() -> str:
+        return json.dumps({"tables": CATALOG[:1]})
+
+    tool = StructuredTool.from_function(coroutine=list_tables, name="list_tables", description="catalog")
+    tables = asyncio.run(load_listing_tables({"list_tables": tool}, str(aliases)))
+    assert tables == {"billboard": ("billboard", "reklame")}
+
+
+def test_missing_catalog_disables_listing():
+    async def broken() -> str:
+        raise RuntimeError("tabular server down")
+
+    tool = StructuredTool.from_function(coroutine=broken, name="list_tables", description="catalog")
+    assert asyncio.run(load_listing_tables({"list_tables": tool})) == {}
+    assert asyncio.run(load_listing_tables({})) == {}
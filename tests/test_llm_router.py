@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from app.services.llm_router import BackendStats, RouterChatModel
+
+
+class FakeBackend(BaseChatModel):
+    """Local stand-in for a provider: answers with its name after `delay` seconds, or raises."""
+
+    reply: str
+    delay: float = 0.0
+    fail: bool = False
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.reply} is down")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.reply))])
+
+
+def ask(router: RouterChatModel) -> str:
+    return asyncio.run(router.ainvoke([HumanMessage(content="hi")])).content
+
+
+def test_fails_over_to_next_backend():
+    primary, fallback = FakeBackend(reply="primary", fail=True), FakeBackend(reply="fallback")
+    router = RouterChatModel(backends={"primary": primary, "fallback": fallback})
+
+    assert ask(router) == "fallback"
+    assert router.stats()["primary"]["error_rate"] == 1.0
+
+
+def test_backend_in_cooldown_is_skipped():
+    primary, fallback = FakeBackend(reply="primary", fail=True), FakeBackend(reply="fallback")
+    router = RouterChatModel(backends={"primary": primary, "fallback": fallback})
+    router._stats["primary"] = BackendStats(failure_threshold=1, cooldown=0.1)
+
+    assert ask(router) == "fallback"
+    assert not router.stats()["primary"]["available"]
+    assert router.ranked_backends() == ["fallback"]
+
+    time.sleep(0.15)
+    assert "primary" in router.ranked_backends()
+
+
+def test_hedges_slow_backend_after_its_p95():
+    slow, fast = FakeBackend(reply="slow", delay=1.0), FakeBackend(reply="fast", delay=0.01)
+    router = RouterChatModel(backends={"slow": slow, "fast": fast}, hedge=True, hedge_min_delay=0.05)
+    for _ in range(5):
+        router._stats["slow"].record(0.02, ok=True)
+
+    assert router._hedge_delay("slow") == 0.05
+    start = time.perf_counter()
+    assert ask(router) == "fast"
+    assert time.perf_counter() - start < 0.5
+    assert slow.calls == 1 and fast.calls == 1
+
+
+def test_hedge_waits_half_the_timeout_without_samples():
+    router = RouterChatModel(backends={"a": FakeBackend(reply="a")}, timeout=8.0, hedge=True)
+
+    assert router._hedge_delay("a") == 4.0
+
+
+def test_untried_backends_do_not_outrank_measured_ones():
+    router = RouterChatModel(backends={"primary": FakeBackend(reply="primary"), "backup": FakeBackend(reply="backup")})
+
+    assert router.ranked_backends() == ["primary", "backup"]
+    assert ask(router) == "primary"
+    assert router.ranked_backends() == ["primary", "backup"]
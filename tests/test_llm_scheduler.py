@@ -0,0 +1,94 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.services.generation_profiles import GenerationProfile, generation_profile
+from app.services.llm_scheduler import EmbeddingBatcher, LLMScheduler, ScheduledChatModel
+
+
+def test_waiting_calls_are_admitted_by_priority_then_fifo():
+    scheduler = LLMScheduler(max_in_flight=1)
+    order = []
+
+    async def call(name: str, priority: int, hold: float = 0.0):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(call("running", 1, hold=0.05))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(call(name, priority))
+            for name, priority in [("long", 2), ("normal-a", 1), ("short", 0), ("normal-b", 1)]
+        ]
+        await asyncio.gather(first, *waiting)
+
+    asyncio.run(run())
+    assert order == ["running", "short", "normal-a", "normal-b", "long"]
+    assert scheduler.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    scheduler = LLMScheduler(max_in_flight=1)
+
+    async def run():
+        async def hold():
+            async with scheduler.slot():
+                await asyncio.sleep(0.02)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(holder, waiter, return_exceptions=True)
+        async with scheduler.slot():
+            pass
+
+    asyncio.run(run())
+    assert scheduler.in_flight == 0
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.batches = []
+
+    async def aembed_documents(self, texts):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        return [[float(len(t))] for t in texts]
+
+
+def test_concurrent_queries_share_one_batch():
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, window=0.01)
+
+    async def run():
+        return await asyncio.gather(*(batcher.aembed_query(t) for t in ["a", "bb", "ccc"]))
+
+    assert asyncio.run(run()) == [[1.0], [2.0], [3.0]]
+    assert embeddings.batches == [["a", "bb", "ccc"]]
+    assert not batcher._tasks
+
+
+def test_sync_calls_apply_the_generation_profile():
+    from langchain_ollama import ChatOllama
+
+    class RecordingOllama(ChatOllama):
+        seen: list = []
+
+        def invoke(self, input, config=None, *, stop=None, **kwargs):
+            self.seen.append(kwargs)
+            return AIMessage(content="ok")
+
+    inner = RecordingOllama(model="qwen3", num_ctx=4096)
+    model = ScheduledChatModel(inner=inner, scheduler=LLMScheduler())
+    token = generation_profile.set(GenerationProfile("short", max_tokens=150, think=False))
+    try:
+        assert model.invoke([HumanMessage(content="hi")]).content == "ok"
+    finally:
+        generation_profile.reset(token)
+    (kwargs,) = inner.seen
+    assert kwargs["options"]["num_predict"] == 150
+    assert kwargs["options"]["num_ctx"] == 4096
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+import pytest
+from langchain_core.tools import ToolException
+from mcp.server.fastmcp import FastMCP
+
+from app.services.mcp_service import inprocess_tool
+
+server = FastMCP(name="Test_Server")
+tool_threads = []
+
+
+@server.tool()
+def echo(text: str) -> str:
+    """Echo the text back."""
+    tool_threads.append(threading.get_ident())
+    return text.upper()
+
+
+@server.tool()
+def broken() -> str:
+    """Always fails."""
+    raise ValueError("sheet not found")
+
+
+def load_tools() -> dict:
+    return {info.name: inprocess_tool(server, info) for info in asyncio.run(server.list_tools())}
+
+
+def test_sync_tool_runs_off_the_event_loop():
+    tools = load_tools()
+
+    async def run():
+        return threading.get_ident(), await tools["echo"].ainvoke({"text": "halo"})
+
+    loop_thread, result = asyncio.run(run())
+    assert result == "HALO"
+    assert tool_threads[-1] != loop_thread
+    assert "inprocess" in tools["echo"].tags
+
+
+def test_tool_errors_raise_tool_exception():
+    tools = load_tools()
+    with pytest.raises(ToolException, match="sheet not found"):
+        asyncio.run(tools["broken"].ainvoke({}))
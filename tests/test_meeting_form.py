@@ -0,0 +1,39 @@
+from app.core.message import CREATE_MEETING_TEMPLATE
+from app.handlers.scheduling_handler import parse_meeting_form
+
+
+def fill(template: str, labels: dict[str, str]) -> str:
+    lines = []
+    for line in template.splitlines():
+        for label, value in labels.items():
+            if label in line:
+                line = line.rstrip() + " " + value
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def test_bilingual_form_with_only_indonesian_half_filled():
+    text = fill(CREATE_MEETING_TEMPLATE, {
+        "Judul Meeting:": "Rapat Anggaran",
+        "Tanggal & Waktu": "2025-09-18, 09:00 – 10:00 WIB",
+        "Email Peserta": "budi@example.com",
+    })
+
+    form = parse_meeting_form(text)
+
+    assert form["missing"] == []
+    assert form["summary"] == "Rapat Anggaran"
+    assert form["start"].startswith("2025-09-18T09:00")
+    assert form["attendees"] == ["budi@example.com"]
+
+
+def test_bilingual_form_with_only_english_half_filled():
+    text = fill(CREATE_MEETING_TEMPLATE, {
+        "Meeting Title:": "Budget Review",
+        "Date & Time": "2025-09-18, 13:00 - 14:00",
+    })
+
+    form = parse_meeting_form(text)
+
+    assert form["missing"] == []
+    assert form["summary"] == "Budget Review"
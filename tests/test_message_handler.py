@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.handlers import message_handler
+
+
+class FakeWhatsApp:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, recipient, text):
+        self.sent.append(text)
+
+
+class ColdWarmer:
+    """Warm-up that never finishes, so any wait on it would hold the message."""
+
+    def __init__(self):
+        self.ready = asyncio.Event()
+        self.waited = False
+
+    def touch(self):
+        self.waited = True
+
+
+def cold_state(monkeypatch, fast_reply):
+    async def fast_paths(state, sender_id, text):
+        return fast_reply
+
+    async def record_turn(*args):
+        pass
+
+    monkeypatch.setattr(message_handler, "handle_fast_paths", fast_paths)
+    monkeypatch.setattr(message_handler, "record_turn", record_turn)
+    return SimpleNamespace(
+        agent=SimpleNamespace(checkpointer=object()),
+        whatsapp_client=FakeWhatsApp(),
+        chat_histories={},
+        system_instruction="sys",
+        processing_message_ids=set(),
+        warmer=ColdWarmer(),
+        pending_meetings={},
+        tools={},
+        intent_classifier=None,
+        response_cache=None,
+    )
+
+
+def test_fast_path_reply_does_not_wait_for_warm_up(monkeypatch):
+    state = cold_state(monkeypatch, fast_reply="Jadwal dihapus.")
+    asyncio.run(asyncio.wait_for(
+        message_handler.process_message_background(state, "628123", "DELETE 1", "m1"), timeout=2
+    ))
+    assert state.warmer.waited is False
+    assert state.chat_histories == {}
+
+
+def test_greeting_does_not_wait_for_warm_up(monkeypatch):
+    state = cold_state(monkeypatch, fast_reply=None)
+    monkeypatch.setattr(message_handler.intent_router, "route", lambda text: "greeting")
+    asyncio.run(asyncio.wait_for(
+        message_handler.process_message_background(state, "628123", "halo", "m2"), timeout=2
+    ))
+    assert state.warmer.waited is False
+    assert state.whatsapp_client.sent == [message_handler.GREETING_TEMPLATE.strip()]
@@ -0,0 +1,26 @@
+import json
+
+import qa_server
+
+
+def test_english_question_against_indonesian_kb_returns_pairs():
+    result = qa_server.get_qa_data("What is our leave policy?")
+
+    assert result != qa_server.NO_INFO_MESSAGE
+    answers = [m["a"] for m in json.loads(result)["matches"]]
+    assert any("cuti" in a for a in answers)
+
+
+def test_matching_question_ranks_its_pair_first():
+    matches = json.loads(qa_server.get_qa_data("Apa kebijakan cuti perusahaan kita?"))["matches"]
+
+    assert matches[0]["q"] == "Apa kebijakan cuti perusahaan kita?"
+    assert matches[0]["score"] >= qa_server.QA_MIN_MATCH
+
+
+def test_empty_query_lists_whole_kb_untruncated():
+    items, _ = qa_server.load_kb()
+
+    result = qa_server.get_qa_data("", max_chars=200)
+
+    assert json.loads(result)["matches"] == items
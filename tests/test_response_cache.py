@@ -0,0 +1,39 @@
+import asyncio
+
+from app.core.metrics import metrics
+from app.services.embedding_service import CachedEmbeddings
+from app.services.response_cache import ResponseCache
+
+
+class FakeEmbeddings:
+    async def aembed_query(self, text):
+        return [1.0, float(len(text))]
+
+
+def test_saved_seconds_keep_counting_past_the_sample_window(monkeypatch):
+    monkeypatch.setattr(metrics, "timings", {})
+    monkeypatch.setattr(metrics, "max_samples", 5)
+    monkeypatch.setitem(metrics.counters, "response_cache.saved_seconds", 0)
+    cache = ResponseCache(CachedEmbeddings(FakeEmbeddings()))
+
+    async def run():
+        await cache.put("jam kerja kantor", "08.00-17.00", cost=2.0)
+        for _ in range(20):
+            await cache.get("jam kerja kantor")
+
+    asyncio.run(run())
+    assert cache.stats()["saved_seconds_total"] == 40.0
+
+
+def test_changed_tabular_db_drops_cached_answers(tmp_path):
+    tabular_db = tmp_path / "tabular.db"
+    tabular_db.write_bytes(b"v1")
+    cache = ResponseCache(CachedEmbeddings(FakeEmbeddings()), watch_paths=[str(tabular_db)])
+
+    async def run():
+        await cache.put("berapa titik reklame", "12 titik", cost=1.0)
+        assert await cache.get("berapa titik reklame") == "12 titik"
+        tabular_db.write_bytes(b"v2-longer")
+        return await cache.get("berapa titik reklame")
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,50 @@
+import numpy as np
+
+from retrieval.fusion import mmr, reciprocal_rank_fusion
+from retrieval.lexical import BM25Index, tokenize
+
+DOCUMENTS = [
+    {"id": "1", "text": "Harga sewa billboard di Batam per bulan", "metadata": {}},
+    {"id": "2", "text": "Jam kerja kantor Senin sampai Jumat", "metadata": {}},
+    {"id": "3", "text": "Billboard A-001 ukuran 4.5 x 8 meter di Medan", "metadata": {}},
+]
+
+
+def test_tokenize_splits_codes_and_drops_stopwords():
+    assert tokenize("Apa ukuran B-001?") == ["ukuran", "b-001", "b", "001"]
+
+
+def test_bm25_ranks_matching_documents():
+    index = BM25Index.build(DOCUMENTS)
+    assert [doc["id"] for doc, _ in index.search("billboard batam")] == ["1", "3"]
+    assert [doc["id"] for doc, _ in index.search("A 001")] == ["3"]
+    assert index.search("cuaca") == []
+
+
+def test_bm25_round_trips_through_json(tmp_path):
+    path = tmp_path / "bm25.json"
+    BM25Index.build(DOCUMENTS).save(str(path))
+    loaded = BM25Index.load(str(path))
+
+    original = BM25Index.build(DOCUMENTS).search("jam kerja kantor")
+    assert [(d["id"], round(s, 5)) for d, s in loaded.search("jam kerja kantor")] == \
+        [(d["id"], round(s, 5)) for d, s in original]
+
+
+def test_rrf_rewards_documents_ranked_by_both_lists():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "b", "d"]])
+    assert [doc_id for doc_id, _ in fused] == ["c", "b", "a", "d"]
+
+
+def test_rrf_weights_favor_a_list():
+    fused = reciprocal_rank_fusion([["a"], ["b"]], weights=[1.0, 2.0])
+    assert [doc_id for doc_id, _ in fused] == ["b", "a"]
+    assert fused[0][1] == 2.0 / 61
+
+
+def test_mmr_skips_near_duplicates():
+    query = np.array([1.0, 0.0])
+    candidates = np.array([[1.0, 0.1], [1.0, 0.11], [0.6, 0.8]])
+    assert mmr(query, candidates, k=2, lambda_mult=0.3) == [0, 2]
+    assert mmr(query, candidates, k=2, lambda_mult=1.0) == [0, 1]
+    assert mmr(query, np.empty((0, 2)), k=2) == []
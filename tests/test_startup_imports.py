@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_app_import_does_not_load_provider_sdks():
+    code = (
+        "import sys, app.core.startup, app.handlers.message_handler; "
+        "print(sorted(m for m in ('langchain_ollama', 'langchain_openai', 'langchain_groq', 'langchain_google_genai') "
+        "if m in sys.modules))"
+    )
+    env = {**os.environ, "DATABASE_URL": "sqlite://"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"
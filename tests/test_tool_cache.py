@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from langchain_core.tools import StructuredTool
+
+from app.services.tool_cache import ToolResultCache
+
+
+def counting_tool(name: str, calls: list, result: str = "ok", tags: list | None = None) -> StructuredTool:
+    async def run(query: str = "") -> str:
+        calls.append(query)
+        return result
+
+    return StructuredTool.from_function(coroutine=run, name=name, description=name, tags=tags)
+
+
+def test_hit_after_normalized_repeat():
+    calls = []
+    cache = ToolResultCache()
+    (tool,) = cache.apply([counting_tool("get_qa_data", calls)])
+
+    asyncio.run(tool.ainvoke({"query": "Jam  Kerja"}))
+    asyncio.run(tool.ainvoke({"query": "jam kerja"}))
+    assert calls == ["Jam  Kerja"]
+
+
+def test_entries_expire_after_ttl():
+    calls = []
+    cache = ToolResultCache(policies={"get_qa_data": {"ttl": 0.05}})
+    (tool,) = cache.apply([counting_tool("get_qa_data", calls)])
+
+    asyncio.run(tool.ainvoke({"query": "a"}))
+    time.sleep(0.06)
+    asyncio.run(tool.ainvoke({"query": "a"}))
+    assert len(calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    calls = []
+    cache = ToolResultCache(max_size=2)
+    (tool,) = cache.apply([counting_tool("get_qa_data", calls)])
+
+    for query in ["a", "b", "a", "c", "a", "b"]:
+        asyncio.run(tool.ainvoke({"query": query}))
+    # "b" was evicted by "c" (the least recently used at that point); "a" stayed cached
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_write_tools_and_errors_are_never_cached():
+    calls = []
+    cache = ToolResultCache(policies={"send_email": {"ttl": 900}, "get_qa_data": {"ttl": 900}})
+    email, qa = cache.apply([
+        counting_tool("send_email", calls),
+        counting_tool("get_qa_data", calls, result="Error: knowledge base missing"),
+    ])
+
+    for tool in (email, qa, email, qa):
+        asyncio.run(tool.ainvoke({"query": "x"}))
+    assert len(calls) == 4
+
+
+def test_changed_data_file_drops_that_servers_entries(tmp_path):
+    kb = tmp_path / "data.json"
+    kb.write_text("[]")
+    qa_calls, table_calls = [], []
+    cache = ToolResultCache(version_paths={"qa_data_version": [str(kb)]})
+    qa, tables = cache.apply([counting_tool("get_qa_data", qa_calls), counting_tool("list_tables", table_calls)])
+
+    async def run():
+        await cache.refresh_versions()
+        await qa.ainvoke({"query": "a"})
+        await tables.ainvoke({})
+        kb.write_text("[{}]")
+        kb.touch()
+        await cache.refresh_versions()
+        await qa.ainvoke({"query": "a"})
+        await tables.ainvoke({})
+
+    asyncio.run(run())
+    assert len(qa_calls) == 2
+    assert len(table_calls) == 1
+
+
+def test_only_inprocess_version_tools_are_polled():
+    stdio_calls, inprocess_calls = [], []
+    cache = ToolResultCache()
+    cache.apply([
+        counting_tool("qa_data_version", stdio_calls),
+        counting_tool("tabular_data_version", inprocess_calls, tags=["inprocess"]),
+    ])
+
+    asyncio.run(cache.refresh_versions())
+    assert stdio_calls == []
+    assert len(inprocess_calls) == 1
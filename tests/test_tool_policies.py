@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+from langchain_core.tools import StructuredTool
+
+from app.services.tool_policies import NO_INFO_MESSAGE, with_semantic_fallback
+
+
+def fixed_tool(name: str, output: str, calls: list) -> StructuredTool:
+    async def run(query: str = "") -> str:
+        calls.append(name)
+        return output
+
+    return StructuredTool.from_function(coroutine=run, name=name, description=name)
+
+
+def ask(qa_output: str, semantic_output: str) -> tuple[str, list]:
+    calls = []
+    tool = with_semantic_fallback(
+        fixed_tool("get_qa_data", qa_output, calls), fixed_tool("vectordb_query", semantic_output, calls), min_score=0.75
+    )
+    return asyncio.run(tool.ainvoke({"query": "what is the leave policy?"})), calls
+
+
+def test_confident_match_skips_semantic_search():
+    qa = json.dumps({"matches": [{"q": "cuti", "a": "12 hari", "score": 0.9}]})
+    result, calls = ask(qa, "semantic")
+    assert result == qa
+    assert calls == ["get_qa_data"]
+
+
+def test_low_confidence_payload_is_replaced_not_concatenated():
+    whole_kb = json.dumps({"matches": [{"q": f"pertanyaan {i}", "a": "x" * 150} for i in range(12)]})
+    result, _ = ask(whole_kb, "Content: cuti tahunan 12 hari")
+    assert "cuti tahunan" in result
+    assert "pertanyaan" not in result
+    assert len(result) < len(whole_kb)
+
+
+def test_precise_output_is_kept_when_semantic_search_finds_nothing():
+    result, calls = ask(NO_INFO_MESSAGE, "No relevant documents found.")
+    assert result == NO_INFO_MESSAGE
+    assert calls == ["get_qa_data", "vectordb_query"]
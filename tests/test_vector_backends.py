@@ -0,0 +1,46 @@
+import os
+import numpy as np
+import pytest
+
+from retrieval.backends import INDEX_POINTER, NumpyBackend, VectorBackend
+
+
+def write_index(index_dir, n: int, dtype: str, seed: int = 0):
+    vectors = np.random.default_rng(seed).normal(size=(n, 16)).astype(np.float32)
+    ids = [f"chunk-{i}" for i in range(n)]
+    documents = [{"text": f"dokumen {i}", "metadata": {"row": i}} for i in range(n)]
+    NumpyBackend.write(str(index_dir), ids, vectors, documents, dtype=dtype)
+    return vectors
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16", "int8"])
+def test_round_trip_keeps_vectors_and_ranking(tmp_path, dtype):
+    vectors = write_index(tmp_path, 50, dtype)
+    backend = NumpyBackend(str(tmp_path))
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    stored = backend.get_vectors(["chunk-7"])["chunk-7"]
+    assert np.allclose(stored, normalized[7], atol=0.02)
+
+    (doc, score), *_ = backend.search_by_vector(vectors[7].tolist(), k=3)
+    assert doc.page_content == "dokumen 7"
+    assert score == pytest.approx(1.0, abs=0.02)
+
+
+def test_rewrite_switches_builds_and_keeps_open_readers_consistent(tmp_path):
+    write_index(tmp_path, 10, "float16", seed=1)
+    old = NumpyBackend(str(tmp_path))
+
+    for seed in (2, 3, 4):
+        write_index(tmp_path, 20 + seed, "float16", seed=seed)
+    new = NumpyBackend(str(tmp_path))
+
+    assert new.build_dir != old.build_dir
+    assert new.matrix.shape[0] == len(new.documents) == 24
+    assert (tmp_path / INDEX_POINTER).read_text() == os.path.basename(new.build_dir)
+    assert len([p for p in tmp_path.iterdir() if p.name.startswith("build-")]) == 2
+
+
+def test_vector_backend_is_abstract():
+    with pytest.raises(TypeError):
+        VectorBackend()